@@ -0,0 +1,91 @@
+"""Compare encode time and output size of the WAV, MP3 and OGG output stages.
+
+Usage:
+    python benchmarks/bench_encoding.py [--minutes 10] [--chunk-seconds 100] [--workers 4]
+
+A synthetic speech-like signal (voiced harmonic bursts separated by pauses,
+22.05 kHz mono like pyttsx3 output) is split into chunk-sized WAV segments
+and pushed through AudioEncoder for every format and bitrate. Requires
+ffmpeg on PATH.
+"""
+import argparse
+import os
+import sys
+import time
+import wave
+from io import BytesIO
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from echoverse.encoding import BITRATES, OUTPUT_FORMATS, AudioEncoder, encoder_available  # noqa: E402
+
+FRAMERATE = 22050
+
+
+def speech_like(seconds, rng):
+    """Harmonic syllables of varying pitch with short gaps, plus a little noise"""
+    samples = np.zeros(int(seconds * FRAMERATE), dtype=np.float32)
+    position = 0
+    while position < len(samples):
+        length = int(rng.uniform(0.12, 0.35) * FRAMERATE)
+        t = np.arange(length) / FRAMERATE
+        pitch = rng.uniform(110, 220)
+        syllable = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        syllable *= np.hanning(length)
+        end = min(position + length, len(samples))
+        samples[position:end] = syllable[:end - position]
+        position = end + int(rng.uniform(0.03, 0.25) * FRAMERATE)
+    samples += rng.normal(0, 0.01, len(samples)).astype(np.float32)
+    return (np.clip(samples * 0.3, -1, 1) * 32767).astype('<i2').tobytes()
+
+
+def make_segments(minutes, chunk_seconds):
+    rng = np.random.default_rng(7)
+    segments = []
+    remaining = minutes * 60
+    while remaining > 0:
+        seconds = min(chunk_seconds, remaining)
+        output = BytesIO()
+        with wave.open(output, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(FRAMERATE)
+            writer.writeframes(speech_like(seconds, rng))
+        segments.append(output.getvalue())
+        remaining -= seconds
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=10)
+    parser.add_argument("--chunk-seconds", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bitrates", nargs="+", default=list(BITRATES))
+    args = parser.parse_args()
+
+    if not encoder_available():
+        sys.exit("ffmpeg and pydub are required for this benchmark")
+
+    segments = make_segments(args.minutes, args.chunk_seconds)
+    wav_bytes = sum(len(segment) for segment in segments)
+    print(f"{args.minutes} min of audio in {len(segments)} chunks, {wav_bytes / 1e6:.1f} MB as WAV")
+    print(f"{'format':<8} {'bitrate':>8} {'encode':>9} {'size':>10} {'ratio':>7}")
+
+    encoder = AudioEncoder(args.workers)
+    try:
+        for audio_format in OUTPUT_FORMATS:
+            for bitrate in (args.bitrates if audio_format != "wav" else ["-"]):
+                start = time.perf_counter()
+                data = encoder.encode(segments, "wav", audio_format, None if bitrate == "-" else bitrate)
+                elapsed = time.perf_counter() - start
+                print(f"{audio_format:<8} {bitrate:>8} {elapsed:8.2f}s {len(data) / 1e6:8.2f} MB "
+                      f"{wav_bytes / len(data):6.1f}x")
+    finally:
+        encoder.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure pyttsx3 latency with per-call init versus the warm engine pool.
+
+Usage:
+    python benchmarks/bench_engine_pool.py [--requests 20]
+
+Reports first-request latency and per-request latency (mean, p50, max) for a
+short sentence rendered repeatedly with each approach.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from echoverse.engine_pool import Pyttsx3EnginePool  # noqa: E402
+from echoverse.engines import configure_pyttsx3_engine, render_pyttsx3  # noqa: E402
+
+VOICES = [
+    {"gender": "female", "accent": "American", "rate": 180, "voice_id": 0},
+    {"gender": "male", "accent": "American", "rate": 170, "voice_id": 1},
+]
+SENTENCE = "The quick brown fox jumps over the lazy dog."
+
+
+def per_call(voice_config):
+    """The original path: new driver and a full voice scan every time"""
+    import pyttsx3
+    engine = pyttsx3.Engine()
+    configure_pyttsx3_engine(engine, voice_config)
+    render_pyttsx3(engine, SENTENCE)
+
+
+def report(label, latencies):
+    print(f"{label:<10} first {latencies[0] * 1000:8.1f} ms | "
+          f"mean {statistics.mean(latencies[1:]) * 1000:8.1f} ms | "
+          f"p50 {statistics.median(latencies[1:]) * 1000:8.1f} ms | "
+          f"max {max(latencies[1:]) * 1000:8.1f} ms")
+
+
+def measure(func, requests):
+    latencies = []
+    for index in range(requests):
+        start = time.perf_counter()
+        func(VOICES[index % len(VOICES)])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    report("per-call", measure(per_call, args.requests))
+
+    pool = Pyttsx3EnginePool()
+
+    def pooled(voice_config):
+        with pool.engine(voice_config) as engine:
+            render_pyttsx3(engine, SENTENCE)
+
+    report("pooled", measure(pooled, args.requests))
+
+    warm_pool = Pyttsx3EnginePool()
+    warm_pool.warm(VOICES)
+
+    def warmed(voice_config):
+        with warm_pool.engine(voice_config) as engine:
+            render_pyttsx3(engine, SENTENCE)
+
+    report("pre-warmed", measure(warmed, args.requests))
+    print(f"pool stats: {pool.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure cold import time of the echoverse modules and check that heavy imports stay deferred.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--max-ms 150] [--modules echoverse.tts ...]
+
+Each module is imported in a fresh interpreter under python -X importtime and
+the median cumulative time is reported. The run fails (exit status 1) when a
+module exceeds --max-ms or pulls in one of DEFERRED at import, so it can gate
+CI against startup regressions. Timings exclude interpreter startup.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+MODULES = [
+    "echoverse.cli",
+    "echoverse.tts",
+    "echoverse.llm",
+    "echoverse.pipeline",
+    "echoverse.batch",
+    "echoverse.service",
+    "echoverse.client",
+]
+
+# Imported on first use only; none of these may load when a module is imported
+DEFERRED = ["pyttsx3", "gtts", "pygame", "pydub", "numpy", "requests", "concurrent.futures.process", "multiprocessing",
+            "http.server"]
+
+_PROBE = "import sys; import {module}; print(','.join(name for name in {deferred!r} if name in sys.modules))"
+
+
+def import_once(module):
+    """Return (cumulative microseconds, eagerly imported deferred modules) for one cold import"""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, deferred=DEFERRED)],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{process.stderr[-2000:]}")
+    cumulative = None
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1])
+    eager = [name for name in process.stdout.strip().split(",") if name]
+    return cumulative, eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=150.0, help="fail above this median (default: %(default)s)")
+    args = parser.parse_args()
+
+    # The first import compiles bytecode; keep it out of the measurements
+    for module in args.modules:
+        import_once(module)
+
+    failures = []
+    print(f"{'module':<22} {'median':>9} {'max':>9}  eager imports")
+    for module in args.modules:
+        times = []
+        eager = []
+        for _ in range(args.repeat):
+            cumulative, eager = import_once(module)
+            times.append(cumulative / 1000)
+        median = statistics.median(times)
+        print(f"{module:<22} {median:>7.1f}ms {max(times):>7.1f}ms  {', '.join(eager) or '-'}")
+        if median > args.max_ms:
+            failures.append(f"{module} takes {median:.1f}ms to import (limit {args.max_ms:.0f}ms)")
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)} eagerly")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Benchmark concurrent chunk dispatch against the local mock LLM endpoint.
+
+Usage:
+    python benchmarks/bench_llm_dispatch.py [--latency 0.05] [--failure-rate 0.05] [--concurrency 1 4 16]
+
+Starts echoverse.mock_llm_server in-process, rewrites a multi-chunk document
+through WatsonxHTTPBackend at several concurrency limits and reports
+throughput plus p50/p95/p99 per-request latency (retries included). The
+rewrite cache is disabled, so every chunk of every run reaches the server.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from bench_synthesis import load_corpus  # noqa: E402
+from echoverse.llm import WatsonxLLM  # noqa: E402
+from echoverse.llm_backends import WatsonxHTTPBackend  # noqa: E402
+from echoverse.rewrite_cache import RewriteCache  # noqa: E402
+from echoverse.mock_llm_server import start_mock_server  # noqa: E402
+
+
+class TimedBackend(WatsonxHTTPBackend):
+    """Records the latency of every request attempt"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def generate(self, request):
+        start = time.perf_counter()
+        try:
+            return super().generate(request)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=20, help="corpus size")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate)
+    text = load_corpus(args.repeat)
+    print(f"Document: {len(text)} chars; mock latency {args.latency * 1000:.0f} ms, "
+          f"failure rate {args.failure_rate:.0%}")
+    print(f"{'concurrency':>11} {'chunks/s':>9} {'total':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+
+    for concurrency in args.concurrency:
+        backend = TimedBackend(server.url, pool_size=concurrency)
+        # An LRU of size zero forgets every rewrite, so earlier runs cannot answer for this one
+        llm = WatsonxLLM(backend, concurrency=concurrency, cache=RewriteCache(max_entries=0))
+        start = time.perf_counter()
+        result = llm.rewrite_text(text, "Suspenseful")
+        elapsed = time.perf_counter() - start
+        chunks = result.count("\n\n") + 1
+        latencies = backend.latencies
+        print(f"{concurrency:>11} {chunks / elapsed:>9.1f} {elapsed:>7.2f}s "
+              f"{percentile(latencies, 0.5) * 1000:>6.0f}ms {percentile(latencies, 0.95) * 1000:>6.0f}ms "
+              f"{percentile(latencies, 0.99) * 1000:>6.0f}ms")
+        llm.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Measure peak RSS of assembling a long audiobook, legacy versus in-memory path.
+
+Usage:
+    python benchmarks/bench_memory.py [--minutes 60] [--chunk-seconds 100]
+
+Each variant runs in its own subprocess so peak RSS (ru_maxrss) is not shared.
+Synthetic 22.05 kHz mono PCM segments stand in for engine output; the report
+shows the peak added on top of holding the segments themselves.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+import wave
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from echoverse.audio import merge_wav, wav_duration  # noqa: E402
+
+FRAMERATE = 22050
+
+
+def legacy_merge_wav(segments):
+    """The wave-module merge this replaced: copies every frame buffer several times"""
+    params = None
+    frames = []
+    for segment in segments:
+        with wave.open(BytesIO(segment), 'rb') as reader:
+            if params is None:
+                params = reader.getparams()
+            frames.append(reader.readframes(reader.getnframes()))
+
+    output = BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setparams(params)
+        writer.writeframes(b''.join(frames))
+    return output.getvalue()
+
+
+def legacy_wav_duration(data):
+    with wave.open(BytesIO(data), 'rb') as reader:
+        return reader.getnframes() / float(reader.getframerate())
+
+
+VARIANTS = {
+    "legacy": (legacy_merge_wav, legacy_wav_duration),
+    "in-memory": (merge_wav, wav_duration),
+}
+
+
+def make_segments(minutes, chunk_seconds):
+    segments = []
+    remaining = minutes * 60
+    while remaining > 0:
+        seconds = min(chunk_seconds, remaining)
+        output = BytesIO()
+        with wave.open(output, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(FRAMERATE)
+            writer.writeframes(os.urandom(seconds * FRAMERATE * 2))
+        segments.append(output.getvalue())
+        remaining -= seconds
+    return segments
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_variant(name, minutes, chunk_seconds):
+    merge, duration = VARIANTS[name]
+    segments = make_segments(minutes, chunk_seconds)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    audio = merge(segments)
+    seconds = duration(audio)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {len(audio) / 1e6:8.1f} MB audio ({seconds / 60:.0f} min) | "
+          f"merge {elapsed * 1000:7.1f} ms | peak RSS {peak_rss_mb():7.1f} MB "
+          f"(+{peak_rss_mb() - baseline:.1f} MB over segments)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--chunk-seconds", type=int, default=100)
+    parser.add_argument("--variant", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.minutes, args.chunk_seconds)
+        return
+
+    for name in VARIANTS:
+        subprocess.run([sys.executable, __file__, "--variant", name,
+                        "--minutes", str(args.minutes), "--chunk-seconds", str(args.chunk_seconds)],
+                       check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Benchmark the rewrite and synthesis stages over generated corpora.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--styles story technical speech] [--sizes 1KB 10KB 100KB 1MB 10MB]
+        [--stages rewrite synthesize] [--tts fake|real] [--repeat 5] [--json results.json]
+        [--profile cprofile|pyinstrument] [--profile-dir profiles]
+
+Rewrites are timed per tone with SimulatedWatsonxLLM and synthesis per
+engine with RealTTSEngine. With --tts fake (the default) the stand-ins in
+benchmarks/fake_tts/ replace pyttsx3 and gTTS. They render deterministic
+audio, so the numbers are comparable across CI runs. --fake-rtf adds render
+time per second of audio.
+
+Each case reports p50/p95 latency, throughput and the peak of Python
+allocations in this process (tracemalloc, one extra run; pool workers are
+not included). Synthesis also reports the real-time factor: render time
+divided by audio duration. Synthesis is limited to --max-synth-size
+because its audio grows with the text. Caches are bypassed unless
+--cache warm. --json writes all cases plus run metadata for trend
+tracking. --profile writes one profile per case of the orchestrating
+thread.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, os.pardir)
+sys.path.insert(0, ROOT)
+
+from corpus import STYLES, format_size, generate, parse_size  # noqa: E402
+
+FAKE_TTS_DIR = os.path.join(BENCH_DIR, "fake_tts")
+STAGES = ("rewrite", "synthesize")
+TONES = ("Neutral", "Suspenseful", "Inspiring")
+ENGINES = ("pyttsx3", "gtts")
+VOICE = "Lisa"
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+class Profiler:
+    """Optional per-case profile of the orchestrating thread"""
+
+    def __init__(self, kind, directory):
+        self.kind = kind
+        self.directory = directory
+        if kind == "pyinstrument":
+            import pyinstrument  # noqa: F401
+        os.makedirs(directory, exist_ok=True)
+
+    def run(self, name, func):
+        if self.kind == "cprofile":
+            import cProfile
+            profile = cProfile.Profile()
+            profile.runcall(func)
+            profile.dump_stats(os.path.join(self.directory, f"{name}.prof"))
+        else:
+            from pyinstrument import Profiler as Sampler
+            sampler = Sampler()
+            sampler.start()
+            try:
+                func()
+            finally:
+                sampler.stop()
+            with open(os.path.join(self.directory, f"{name}.html"), 'w', encoding="utf-8") as handle:
+                handle.write(sampler.output_html())
+
+
+def measure(func, repeat, warmup):
+    """Return (latencies, peak traced bytes, last result) of running func"""
+    for _ in range(warmup):
+        func()
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return latencies, peak, result
+
+
+def summarize(stage, style, size, text, variant, latencies, peak):
+    p50 = statistics.median(latencies)
+    return {
+        "stage": stage,
+        "style": style,
+        "size": size,
+        "chars": len(text),
+        "variant": variant,
+        "repeat": len(latencies),
+        "latency_p50": p50,
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_mean": statistics.fmean(latencies),
+        "throughput_chars_per_s": len(text) / p50 if p50 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_rewrite(args, style, size, text):
+    from echoverse.llm import SimulatedWatsonxLLM
+    from echoverse.rewrite_cache import RewriteCache
+
+    llm = SimulatedWatsonxLLM(simulated_latency=args.llm_latency)
+    if args.cache == "cold":
+        # An LRU of size zero forgets every rewrite, so each run calls the backend
+        llm.cache = RewriteCache(max_entries=0)
+    try:
+        for tone in args.tones:
+            latencies, peak, _ = measure(lambda: llm.rewrite_text(text, tone), args.repeat, args.warmup)
+            yield summarize("rewrite", style, size, text, tone, latencies, peak), lambda: llm.rewrite_text(text, tone)
+    finally:
+        llm.close()
+
+
+def bench_synthesize(args, style, size, text, engines):
+    from echoverse.audio import audio_duration
+    from echoverse.cache import SynthesisCache
+    from echoverse.tts import RealTTSEngine
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # max_bytes=0 evicts every entry as soon as it is written
+        cache = SynthesisCache(cache_dir, max_bytes=0 if args.cache == "cold" else None)
+        tts = RealTTSEngine(workers=args.workers, cache=cache)
+        try:
+            for engine in engines:
+                tts.available_engines = [engine]
+                latencies, peak, audio = measure(lambda: tts.synthesize(text, VOICE), args.repeat, args.warmup)
+                case = summarize("synthesize", style, size, text, engine, latencies, peak)
+                seconds = audio_duration(audio["data"], audio["format"])
+                case.update({
+                    "audio_seconds": seconds,
+                    "audio_bytes": audio["size"],
+                    "real_time_factor": case["latency_p50"] / seconds if seconds else None,
+                })
+                yield case, lambda: tts.synthesize(text, VOICE)
+        finally:
+            tts.close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=ROOT,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_case(case):
+    rtf = case.get("real_time_factor")
+    print(
+        f"{case['stage']:<11} {case['style']:<10} {format_size(case['size']):>6} {case['variant']:<12} "
+        f"{case['latency_p50'] * 1000:>10.1f} {case['latency_p95'] * 1000:>10.1f} "
+        f"{case['throughput_chars_per_s'] or 0:>12.0f} {case['peak_memory_bytes'] / 1e6:>9.1f} "
+        f"{'' if rtf is None else f'{rtf:.3g}':>8}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--styles", nargs="+", choices=STYLES, default=list(STYLES))
+    parser.add_argument("--sizes", nargs="+", type=parse_size,
+                        default=[parse_size(size) for size in ("1KB", "10KB", "100KB", "1MB", "10MB")])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--tones", nargs="+", choices=TONES, default=list(TONES))
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--tts", choices=["fake", "real"], default="fake",
+                        help="deterministic stand-in engines or the installed ones (default: %(default)s)")
+    parser.add_argument("--fake-rtf", type=float, default=0.0, help="fake render seconds per audio second")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="simulated seconds per rewrite request")
+    parser.add_argument("--max-synth-size", type=parse_size, default=parse_size("100KB"),
+                        help="largest size to synthesize (default: 100KB)")
+    parser.add_argument("--workers", type=int, default=None, help="synthesis workers (default: CPU count)")
+    parser.add_argument("--cache", choices=["cold", "warm"], default="cold")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"])
+    parser.add_argument("--profile-dir", default="profiles")
+    args = parser.parse_args()
+
+    if args.tts == "fake":
+        # Must precede the first echoverse.tts import, which probes for the engines
+        sys.path.insert(0, FAKE_TTS_DIR)
+        os.environ["ECHOVERSE_FAKE_TTS_RTF"] = str(args.fake_rtf)
+    try:
+        profiler = Profiler(args.profile, args.profile_dir) if args.profile else None
+    except ImportError:
+        parser.error("--profile pyinstrument requires the pyinstrument package")
+
+    from echoverse.tts import GTTS_AVAILABLE, PYTTSX3_AVAILABLE
+    installed = {"pyttsx3": PYTTSX3_AVAILABLE, "gtts": GTTS_AVAILABLE}
+    engines = [engine for engine in args.engines if installed[engine]]
+    if "synthesize" in args.stages and not engines:
+        parser.error("none of the requested TTS engines is installed; use --tts fake")
+
+    print(f"{'stage':<11} {'style':<10} {'size':>6} {'variant':<12} {'p50 ms':>10} {'p95 ms':>10} "
+          f"{'chars/s':>12} {'peak MB':>9} {'RTF':>8}")
+    results = []
+    for style in args.styles:
+        for size in args.sizes:
+            text = generate(style, size, args.seed)
+            cases = []
+            if "rewrite" in args.stages:
+                cases.append(bench_rewrite(args, style, size, text))
+            if "synthesize" in args.stages and size <= args.max_synth_size:
+                cases.append(bench_synthesize(args, style, size, text, engines))
+            for stage_cases in cases:
+                for case, func in stage_cases:
+                    results.append(case)
+                    print_case(case)
+                    if profiler:
+                        profiler.run(f"{case['stage']}-{style}-{format_size(size)}-{case['variant']}", func)
+
+    if args.json_path:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+                "args": {key: value for key, value in vars(args).items() if key != "json_path"},
+            },
+            "results": results,
+        }
+        with open(args.json_path, 'w', encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Wrote {len(results)} results to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Benchmark the NumPy post-processing stage on generated speech-like PCM.
+
+Usage:
+    python benchmarks/bench_postprocess.py [--minutes 1 10 60] [--chunk-seconds 8] [--rate 22050]
+        [--configs normalize resample-16k resample-44k] [--json results.json]
+
+Each stream is made of --chunk-seconds chunks of tones with a syllable-rate
+envelope, random loudness and silent gaps, as chunked synthesis produces
+them. Chunks are generated on the fly and fed to PostProcessor one at a
+time, so the stream never exists in memory as a whole. Each case reports
+the audio seconds processed, wall time, how many times faster than real
+time that is, and the tracemalloc peak, which should stay flat as the
+stream gets longer. Everything runs on the calling thread.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, os.pardir)
+sys.path.insert(0, ROOT)
+
+from echoverse.postprocess import PostProcessor, to_pcm  # noqa: E402
+
+CONFIGS = {
+    "normalize": {},
+    "no-trim": {"trim": False},
+    "crossfade": {"pause": 0.0},
+    "resample-16k": {"target_rate": 16000},
+    "resample-44k": {"target_rate": 44100},
+}
+
+
+def speech_chunk(rng, rate, seconds):
+    """16-bit mono PCM of a tone with a syllable envelope, random level and leading/trailing silence"""
+    length = int(rate * seconds)
+    t = np.arange(length, dtype=np.float32) / rate
+    pitch = rng.uniform(90, 250)
+    voice = sum(np.sin(2 * np.pi * pitch * harmonic * t) / harmonic for harmonic in (1, 2, 3))
+    envelope = np.clip(np.sin(2 * np.pi * rng.uniform(3, 6) * t), 0, None)
+    samples = voice * envelope * rng.uniform(0.02, 0.6)
+    lead, trail = (int(rate * gap) for gap in rng.uniform(0.05, 0.4, 2))
+    samples[:lead] = 0
+    samples[length - trail:] = 0
+    return to_pcm(samples[:, None], 2)
+
+
+def run(rate, minutes, chunk_seconds, options, seed):
+    """Return (audio seconds in, processing seconds, output bytes) for one stream"""
+    rng = np.random.default_rng(seed)
+    processor = PostProcessor((1, 2, rate), **options)
+    chunks = max(1, round(minutes * 60 / chunk_seconds))
+    elapsed = 0.0
+    output = 0
+    for _ in range(chunks):
+        pcm = speech_chunk(rng, rate, chunk_seconds)
+        start = time.perf_counter()
+        output += len(processor.process(pcm))
+        elapsed += time.perf_counter() - start
+    start = time.perf_counter()
+    output += len(processor.flush())
+    elapsed += time.perf_counter() - start
+    return chunks * chunk_seconds, elapsed, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", nargs="+", type=float, default=[1.0, 10.0, 60.0],
+                        help="stream lengths in minutes of audio")
+    parser.add_argument("--chunk-seconds", type=float, default=8.0)
+    parser.add_argument("--rate", type=int, default=22050, help="source sample rate (default: %(default)s)")
+    parser.add_argument("--configs", nargs="+", choices=CONFIGS, default=list(CONFIGS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write results to this file")
+    args = parser.parse_args()
+
+    print(f"{'config':<14} {'audio s':>9} {'wall s':>9} {'x realtime':>11} {'peak MB':>9}")
+    results = []
+    for config in args.configs:
+        for minutes in args.minutes:
+            seconds, elapsed, output = run(args.rate, minutes, args.chunk_seconds, CONFIGS[config], args.seed)
+            # A second pass under tracemalloc, so tracing does not inflate the timing
+            tracemalloc.start()
+            try:
+                run(args.rate, minutes, args.chunk_seconds, CONFIGS[config], args.seed)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            case = {
+                "config": config,
+                "options": CONFIGS[config],
+                "audio_seconds": seconds,
+                "wall_seconds": elapsed,
+                "times_real_time": seconds / elapsed if elapsed else None,
+                "output_bytes": output,
+                "peak_memory_bytes": peak,
+            }
+            results.append(case)
+            print(f"{config:<14} {seconds:>9.0f} {elapsed:>9.3f} {case['times_real_time'] or 0:>11.0f} "
+                  f"{peak / 1e6:>9.2f}", flush=True)
+
+    if args.json_path:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "args": {key: value for key, value in vars(args).items() if key != "json_path"},
+            },
+            "results": results,
+        }
+        with open(args.json_path, 'w', encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Wrote {len(results)} results to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
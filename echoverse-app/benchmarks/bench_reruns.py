@@ -0,0 +1,128 @@
+"""Measure server time and payload of Streamlit reruns with a book-sized text loaded.
+
+Usage:
+    python benchmarks/bench_reruns.py [--chars 2000000] [--repeat 5] [--app echoverse_app.py]
+
+The app runs under streamlit.testing's AppTest with the original and a
+rewritten text already in session state. Each interaction is repeated and
+the median script run time and the total size of the messages the run sends
+to the browser are reported. Pass --app with an older copy of the app to
+compare before and after.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.scriptrunner.script_runner import ScriptRunner  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+PARAGRAPH = (
+    "The lighthouse keeper climbed the spiral stairs as the storm rolled in from the west, "
+    "counting each step the way his father had taught him. Below, the harbour lights flickered "
+    "and went out one by one."
+)
+
+samples = []
+script_times = []
+bytecode = {}
+
+
+def shared_bytecode(get_bytecode):
+    """A server compiles the script once; AppTest would recompile it on every run"""
+    def wrapper(self, script_path):
+        if script_path not in bytecode:
+            bytecode[script_path] = get_bytecode(self, script_path)
+        return bytecode[script_path]
+    return wrapper
+
+
+def timed_script(run_script):
+    """Wrap ScriptRunner._run_script to time the script alone, without AppTest's polling"""
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return run_script(self, *args, **kwargs)
+        finally:
+            script_times.append(time.perf_counter() - start)
+    return wrapper
+
+
+def measured_run(run):
+    """Wrap LocalScriptRunner.run to record script time and bytes of forward messages"""
+    def wrapper(self, *args, **kwargs):
+        script_times.clear()
+        tree = run(self, *args, **kwargs)
+        samples.append((sum(script_times), sum(message.ByteSize() for message in self.forward_msgs())))
+        return tree
+    return wrapper
+
+
+def make_text(chars):
+    paragraphs = []
+    size = 0
+    while size < chars:
+        paragraphs.append(f"{len(paragraphs) + 1}. {PARAGRAPH}")
+        size += len(paragraphs[-1]) + 2
+    return "\n\n".join(paragraphs)
+
+
+def widget(widgets, label):
+    """The widget whose label starts with label; positions shift as the sidebar grows"""
+    return next(item for item in widgets if item.label.startswith(label))
+
+
+def interactions(at):
+    """Name and action of each measured interaction"""
+    def change_voice():
+        voice = "Michael" if at.session_state.selected_voice == "Lisa" else "Lisa"
+        widget(at.sidebar.selectbox, "Choose the narrator voice").select(voice).run()
+
+    def toggle_streaming():
+        checkbox = widget(at.sidebar.checkbox, "Stream audio while generating")
+        checkbox.set_value(not checkbox.value).run()
+
+    return [
+        ("plain rerun", lambda: at.run()),
+        ("change voice", change_voice),
+        ("toggle streaming", toggle_streaming),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chars", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--app", default=os.path.join(ROOT, "echoverse_app.py"))
+    args = parser.parse_args()
+
+    ScriptCache.get_bytecode = shared_bytecode(ScriptCache.get_bytecode)
+    ScriptRunner._run_script = timed_script(ScriptRunner._run_script)
+    LocalScriptRunner.run = measured_run(LocalScriptRunner.run)
+    text = make_text(args.chars)
+
+    at = AppTest.from_file(os.path.abspath(args.app), default_timeout=120)
+    at.run()
+    at.session_state.original_text = text
+    at.session_state.rewritten_text = text.replace("storm", "tempest")
+    at.run()
+
+    print(f"{args.app}: {len(text):,} characters loaded")
+    print(f"{'interaction':<18} {'server time':>12} {'payload':>12}")
+    for name, action in interactions(at):
+        samples.clear()
+        for _ in range(args.repeat):
+            action()
+        median_time = statistics.median(elapsed for elapsed, _ in samples)
+        median_bytes = statistics.median(size for _, size in samples)
+        print(f"{name:<18} {median_time * 1000:>10.1f}ms {median_bytes / 1024:>10.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
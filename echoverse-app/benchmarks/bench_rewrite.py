@@ -0,0 +1,100 @@
+"""Compare the table-driven rewrite engine with the original per-sentence loops.
+
+Usage:
+    python benchmarks/bench_rewrite.py [--megabytes 4]
+
+Builds a multi-megabyte document from test_samples/, times each tone with
+the original SimulatedWatsonxLLM methods (reproduced below) and with
+ToneRewriter, and reports peak traced memory of the streaming mode.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from bench_synthesis import load_corpus  # noqa: E402
+from echoverse.rewrite import ToneRewriter  # noqa: E402
+
+
+def legacy_neutral(text):
+    sentences = text.split('.')
+    rewritten = []
+    for sentence in sentences:
+        if sentence.strip():
+            sentence = sentence.strip()
+            if not sentence.endswith(('.', '!', '?')):
+                sentence += '.'
+            rewritten.append(f"It is important to note that {sentence.lower()}" if len(sentence) > 10 else sentence)
+    return ' '.join(rewritten)
+
+
+def legacy_suspenseful(text):
+    sentences = text.split('.')
+    rewritten = []
+    suspense_words = ["suddenly", "mysteriously", "unexpectedly", "ominously", "silently"]
+    for i, sentence in enumerate(sentences):
+        if sentence.strip():
+            sentence = sentence.strip()
+            if i % 2 == 0 and len(sentence) > 10:
+                suspense_word = suspense_words[i % len(suspense_words)]
+                sentence = f"{suspense_word.capitalize()}, {sentence.lower()}"
+            sentence += "..." if not sentence.endswith(('.', '!', '?')) else ""
+            rewritten.append(sentence)
+    return ' '.join(rewritten)
+
+
+def legacy_inspiring(text):
+    sentences = text.split('.')
+    rewritten = []
+    inspiring_phrases = ["remarkably", "brilliantly", "powerfully", "magnificently", "extraordinarily"]
+    for i, sentence in enumerate(sentences):
+        if sentence.strip():
+            sentence = sentence.strip()
+            if len(sentence) > 10:
+                inspiring_word = inspiring_phrases[i % len(inspiring_phrases)]
+                sentence = f"This {inspiring_word} demonstrates that {sentence.lower()}"
+            sentence += "!" if not sentence.endswith(('.', '!', '?')) else ""
+            rewritten.append(sentence)
+    return ' '.join(rewritten)
+
+
+LEGACY = {"Neutral": legacy_neutral, "Suspenseful": legacy_suspenseful, "Inspiring": legacy_inspiring}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4)
+    args = parser.parse_args()
+
+    sample = load_corpus(1)
+    text = load_corpus(max(1, int(args.megabytes * 1024 * 1024 / len(sample))))
+    megabytes = len(text) / (1024 * 1024)
+    rewriter = ToneRewriter()
+    print(f"Document: {megabytes:.1f} MB")
+    print(f"{'tone':<12} {'legacy':>9} {'engine':>9} {'MB/s':>8}")
+
+    for tone, legacy in LEGACY.items():
+        start = time.perf_counter()
+        legacy(text)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rewriter.rewrite(text, tone)
+        engine_seconds = time.perf_counter() - start
+        print(f"{tone:<12} {legacy_seconds:>8.2f}s {engine_seconds:>8.2f}s {megabytes / engine_seconds:>8.1f}")
+
+    paragraphs = text.split("\n\n")
+    del text
+    tracemalloc.start()
+    for _ in rewriter.rewrite_stream(iter(paragraphs), "Suspenseful"):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"streaming peak traced memory: {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
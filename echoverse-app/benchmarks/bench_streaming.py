@@ -0,0 +1,48 @@
+"""Measure time-to-first-audio of the streaming pipeline across document sizes.
+
+Usage:
+    python benchmarks/bench_streaming.py [--engine pyttsx3] [--sizes 1 10 50] [--cache cold|off]
+
+Each size is a repeat count of the test_samples/ corpus. Time to first audio
+should stay roughly flat while total time grows with the document. The
+pipeline looks chunks up in an empty synthesis cache, as the app does for
+new text, unless --cache off.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from bench_synthesis import VOICE, load_corpus  # noqa: E402
+from echoverse.cache import SynthesisCache  # noqa: E402
+from echoverse.pipeline import SynthesisPipeline  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", default="pyttsx3", choices=["pyttsx3", "gtts"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", choices=["cold", "off"], default="cold")
+    args = parser.parse_args()
+
+    print(f"{'chars':>10} {'chunks':>7} {'first audio':>12} {'total':>9}")
+    for repeat in args.sizes:
+        text = load_corpus(repeat)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = SynthesisCache(cache_dir) if args.cache == "cold" else None
+            with SynthesisPipeline(args.engine, workers=args.workers, cache=cache) as pipeline:
+                start = time.perf_counter()
+                first = None
+                for index, total, _, _ in pipeline.stream(text, VOICE):
+                    if first is None:
+                        first = time.perf_counter() - start
+                elapsed = time.perf_counter() - start
+        print(f"{len(text):>10} {total:>7} {first:>11.2f}s {elapsed:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the chunked synthesis pipeline against the single-call path.
+
+Usage:
+    python benchmarks/bench_synthesis.py [--engine pyttsx3] [--workers 1 2 4] [--repeat 20]
+
+The input is built by repeating the files under test_samples/ so the same
+text is used for every configuration. Reports characters per second.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from echoverse.chunking import DEFAULT_MAX_CHARS  # noqa: E402
+from echoverse.engines import configure_pyttsx3_engine, render_gtts, render_pyttsx3  # noqa: E402
+from echoverse.pipeline import SynthesisPipeline  # noqa: E402
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "test_samples")
+VOICE = {"gender": "female", "accent": "American", "rate": 180, "voice_id": 0}
+
+
+def load_corpus(repeat):
+    """Join the sample texts into one long document"""
+    paragraphs = []
+    for name in sorted(os.listdir(SAMPLES_DIR)):
+        with open(os.path.join(SAMPLES_DIR, name), encoding="utf-8") as handle:
+            paragraphs.append(handle.read().strip())
+    return "\n\n".join(paragraphs * repeat)
+
+
+def single_call(engine, text):
+    """The pre-pipeline path: one backend call for the whole text"""
+    if engine == "pyttsx3":
+        import pyttsx3
+        tts = pyttsx3.init()
+        configure_pyttsx3_engine(tts, VOICE)
+        return render_pyttsx3(tts, text)
+    return render_gtts(text, VOICE)
+
+
+def timed(label, func, chars):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s {chars / elapsed:10.0f} chars/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", default="pyttsx3", choices=["pyttsx3", "gtts"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS)
+    args = parser.parse_args()
+
+    text = load_corpus(args.repeat)
+    print(f"Corpus: {len(text)} characters, engine: {args.engine}")
+
+    baseline = timed("single call", lambda: single_call(args.engine, text), len(text))
+    for workers in args.workers:
+        with SynthesisPipeline(args.engine, workers=workers, max_chars=args.max_chars) as pipeline:
+            elapsed = timed(f"pipeline ({workers} workers)",
+                            lambda: pipeline.synthesize(text, VOICE), len(text))
+        print(f"{'':<28} speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Deterministic generated corpora for the benchmarks.
+
+Three styles mirror the samples in test_samples/: "story" (chapters, dialogue,
+long descriptive sentences), "technical" (sections, lists, abbreviations and
+numbers that stress sentence splitting) and "speech" (short sentences,
+questions and exclamations). The same style, size and seed always produce
+the same text.
+
+Usage:
+    python benchmarks/corpus.py story 10KB > story.txt
+"""
+import argparse
+import random
+import re
+import sys
+
+STYLES = ("story", "technical", "speech")
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 * 1024}
+
+NAMES = ["Mara", "Elias", "Noor", "Tobias", "Ines", "Ravi", "Lena", "Okafor"]
+PLACES = ["the harbour", "the old mill", "the lighthouse", "the market square", "the station", "the orchard"]
+OBJECTS = ["a brass key", "the torn map", "a folded letter", "the lantern", "a silver compass", "the ledger"]
+MOODS = ["quietly", "at last", "without a word", "as the rain began", "before anyone noticed", "once more"]
+VERBS = ["walked toward", "searched", "remembered", "circled back to", "waited by", "hurried past"]
+SAYINGS = [
+    "We can't stay here much longer",
+    "Did you hear that?",
+    "I told you it would come to this",
+    "Look, the light is on again",
+    "Nobody leaves until we find it",
+    "Are you sure this is the way?",
+]
+
+COMPONENTS = ["the scheduler", "the cache layer", "the API gateway", "the worker pool", "the index", "the parser"]
+ACTIONS = ["reduces", "doubles", "bounds", "amortizes", "serializes", "batches"]
+METRICS = ["p95 latency", "memory use", "throughput", "cold start time", "error rate", "queue depth"]
+QUALIFIERS = ["e.g. under sustained load", "i.e. per request", "approx. 3.5x on average", "vs. the v1.2 baseline",
+              "at 10,000 req/s", "within 0.25 s"]
+
+OPENERS = ["Today", "Right now", "Every single morning", "This year", "Together", "From this moment"]
+CALLS = ["we choose courage", "you decide who you become", "we build something that lasts",
+         "we stand up again", "you take the first step", "we refuse to give up"]
+QUESTIONS = ["What are you waiting for?", "Who will you be tomorrow?", "Why not now?", "Why not you?",
+             "What would you do if you could not fail?"]
+EXCLAMATIONS = ["Believe it!", "Keep going!", "This is your moment!", "Never stop!", "Rise up!"]
+
+
+def parse_size(value):
+    """'10KB' -> 10240; plain numbers are characters"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KM]?B)?\s*', value.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {value}")
+    return int(float(match.group(1)) * _UNITS[match.group(2) or ""])
+
+
+def format_size(size):
+    for unit in ("MB", "KB"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _story_paragraph(rng):
+    sentences = []
+    for _ in range(rng.randint(3, 6)):
+        if rng.random() < 0.3:
+            speaker = rng.choice(NAMES)
+            saying = rng.choice(SAYINGS)
+            ending = "" if saying.endswith("?") else ","
+            sentences.append(f'"{saying}{ending}" {speaker} said {rng.choice(MOODS)}.')
+        else:
+            sentences.append(
+                f"{rng.choice(NAMES)} {rng.choice(VERBS)} {rng.choice(PLACES)} with "
+                f"{rng.choice(OBJECTS)} {rng.choice(MOODS)}."
+            )
+    return " ".join(sentences)
+
+
+def _technical_paragraph(rng):
+    if rng.random() < 0.2:
+        return "\n".join(
+            f"- {rng.choice(COMPONENTS).capitalize()} {rng.choice(ACTIONS)} {rng.choice(METRICS)}."
+            for _ in range(rng.randint(2, 4))
+        )
+    return " ".join(
+        f"{rng.choice(COMPONENTS).capitalize()} {rng.choice(ACTIONS)} {rng.choice(METRICS)} "
+        f"({rng.choice(QUALIFIERS)}) by {rng.randint(2, 95)}%."
+        for _ in range(rng.randint(2, 5))
+    )
+
+
+def _speech_paragraph(rng):
+    sentences = []
+    for _ in range(rng.randint(3, 7)):
+        roll = rng.random()
+        if roll < 0.25:
+            sentences.append(rng.choice(QUESTIONS))
+        elif roll < 0.45:
+            sentences.append(rng.choice(EXCLAMATIONS))
+        else:
+            sentences.append(f"{rng.choice(OPENERS)}, {rng.choice(CALLS)}.")
+    return " ".join(sentences)
+
+
+_PARAGRAPHS = {"story": _story_paragraph, "technical": _technical_paragraph, "speech": _speech_paragraph}
+_HEADINGS = {"story": "Chapter {number}", "technical": "## Section {number}", "speech": None}
+_PARAGRAPHS_PER_HEADING = 20
+
+
+def generate(style, size, seed=0):
+    """A text of about size characters in the given style"""
+    if style not in STYLES:
+        raise ValueError(f"Unknown corpus style: {style}")
+    rng = random.Random(f"{style}:{seed}")
+    heading = _HEADINGS[style]
+    parts = []
+    length = 0
+    count = 0
+    while length < size:
+        if heading and count % _PARAGRAPHS_PER_HEADING == 0:
+            parts.append(heading.format(number=count // _PARAGRAPHS_PER_HEADING + 1))
+            length += len(parts[-1]) + 2
+        parts.append(_PARAGRAPHS[style](rng))
+        length += len(parts[-1]) + 2
+        count += 1
+    return "\n\n".join(parts)[:size].rstrip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("style", choices=STYLES)
+    parser.add_argument("size", nargs="?", type=parse_size, default=parse_size("10KB"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.stdout.write(generate(args.style, args.size, args.seed) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
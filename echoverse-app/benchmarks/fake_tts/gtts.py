@@ -0,0 +1,29 @@
+"""Deterministic stand-in for gTTS, used by bench_pipeline.py --tts fake.
+
+Writes valid MPEG-2 Layer III frame headers (24 kHz, 32 kbps, mono, like
+gTTS output) over silent frame bodies, sized for a fixed speaking rate.
+ECHOVERSE_FAKE_TTS_RTF adds render time in proportion to the audio produced.
+"""
+import os
+import time
+
+WORDS_PER_MINUTE = 165
+FRAME_SECONDS = 576 / 24000
+# MPEG-2 Layer III, no CRC, 32 kbps, 24 kHz, mono: 72 * 32000 / 24000 = 96 bytes per frame
+_FRAME = b"\xff\xf3\x44\xc4" + bytes(92)
+
+
+class gTTS:
+    def __init__(self, text, lang="en", slow=False, tld="com", **kwargs):
+        self.text = text
+        self.lang = lang
+        self.slow = slow
+
+    def write_to_fp(self, fp):
+        seconds = len(self.text.split()) * 60.0 / WORDS_PER_MINUTE
+        time.sleep(seconds * float(os.environ.get("ECHOVERSE_FAKE_TTS_RTF", "0")))
+        fp.write(_FRAME * max(1, round(seconds / FRAME_SECONDS)))
+
+    def save(self, savefile):
+        with open(savefile, 'wb') as handle:
+            self.write_to_fp(handle)
@@ -0,0 +1,73 @@
+"""Deterministic stand-in for pyttsx3, used by bench_pipeline.py --tts fake.
+
+bench_pipeline.py puts this directory ahead of site-packages on sys.path, so
+`import pyttsx3` loads this module in the benchmark and in its pool workers.
+Rendered audio is a quiet fixed waveform whose length follows the voice rate
+(words per minute), so durations, sizes and real-time factors reproduce
+exactly. ECHOVERSE_FAKE_TTS_RTF adds render time in proportion to the audio
+produced (default 0: measure pipeline overhead only) and
+ECHOVERSE_FAKE_TTS_FRAMERATE sets the sample rate of the 8-bit mono output.
+"""
+import os
+import time
+import wave
+
+DEFAULT_FRAMERATE = 8000
+_PATTERN = bytes(120 + index % 16 for index in range(4096))
+
+
+class Voice:
+    def __init__(self, voice_id, name):
+        self.id = voice_id
+        self.name = name
+
+
+def _render_seconds(seconds):
+    time.sleep(seconds * float(os.environ.get("ECHOVERSE_FAKE_TTS_RTF", "0")))
+
+
+def _pcm(frames):
+    repeats, remainder = divmod(frames, len(_PATTERN))
+    return _PATTERN * repeats + _PATTERN[:remainder]
+
+
+class Engine:
+    def __init__(self, driverName=None, debug=False):
+        self._properties = {
+            "rate": 200,
+            "volume": 1.0,
+            "voice": "fake-female",
+            "voices": [Voice("fake-female", "Fake Female"), Voice("fake-male", "Fake Male")],
+        }
+        self._queue = []
+
+    def getProperty(self, name):
+        return self._properties[name]
+
+    def setProperty(self, name, value):
+        self._properties[name] = value
+
+    def say(self, text, name=None):
+        pass
+
+    def save_to_file(self, text, filename, name=None):
+        self._queue.append((text, filename))
+
+    def runAndWait(self):
+        framerate = int(os.environ.get("ECHOVERSE_FAKE_TTS_FRAMERATE", DEFAULT_FRAMERATE))
+        queue, self._queue = self._queue, []
+        for text, filename in queue:
+            seconds = len(text.split()) * 60.0 / self._properties["rate"]
+            _render_seconds(seconds)
+            with wave.open(filename, 'wb') as writer:
+                writer.setnchannels(1)
+                writer.setsampwidth(1)
+                writer.setframerate(framerate)
+                writer.writeframes(_pcm(int(seconds * framerate)))
+
+    def stop(self):
+        self._queue = []
+
+
+def init(driverName=None, debug=False):
+    return Engine(driverName, debug)
@@ -0,0 +1,84 @@
+"""Load-test the job service with concurrent submissions.
+
+Usage:
+    echoverse serve --workers 4 --max-queued 50 &
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8765 --jobs 200 --clients 16
+
+Each client thread submits rewrite (or synthesize) jobs, retrying after a
+short pause when the service answers 429, then waits for completion.
+Reports completed jobs per second, rejected submissions and p50/p95
+end-to-end latency.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from bench_synthesis import load_corpus  # noqa: E402
+from echoverse.client import JobClient, ServiceBusyError  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--kind", choices=["rewrite", "synthesize"], default="rewrite")
+    parser.add_argument("--repeat", type=int, default=1, help="corpus size per job")
+    args = parser.parse_args()
+
+    text = load_corpus(args.repeat)
+    latencies = []
+    rejected = [0]
+    failed = [0]
+    lock = threading.Lock()
+    remaining = iter(range(args.jobs))
+
+    def client_loop():
+        client = JobClient(args.url)
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            while True:
+                try:
+                    params = {"tone": "Suspenseful"} if args.kind == "rewrite" else {"voice": "Lisa"}
+                    job_id = client.submit(args.kind, text=text, **params)
+                    break
+                except ServiceBusyError:
+                    with lock:
+                        rejected[0] += 1
+                    time.sleep(0.05)
+            try:
+                client.wait(job_id, poll_interval=0.02)
+            except Exception:
+                with lock:
+                    failed[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client_loop) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} {args.kind} jobs completed in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.1f} jobs/s) with {args.clients} clients")
+    print(f"rejected submissions (429): {rejected[0]}, failed jobs: {failed[0]}")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"latency p50 {statistics.median(latencies) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Disk-backed store for finished audiobooks.
+
+Synthesized audio is written to disk once and sessions keep only a small
+handle (the result metadata plus an artifact id). Playback and downloads
+read the file from disk, either through a memory map served with HTTP range
+requests by ArtifactServer or from its path when the player or a download
+asks for it, so a session never pins a whole book in the Streamlit process. Old artifacts are garbage collected by age and
+total size.
+"""
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+from .audio import MIME_TYPES
+from .metrics import span
+
+DEFAULT_ARTIFACT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "echoverse", "artifacts")
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+SEND_BLOCK = 256 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id TEXT PRIMARY KEY,
+    session TEXT,
+    format TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_session ON artifacts (session);
+"""
+
+
+class ArtifactNotFound(LookupError):
+    """The artifact expired, was collected or never existed"""
+
+
+def estimate_size(value):
+    """Approximate bytes held by a (nested) session state value"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+@contextmanager
+def map_file(path):
+    """Read-only memory map of a file; empty files yield an empty bytes object"""
+    with open(path, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+class ArtifactStore:
+    """Audio files on disk indexed by SQLite, collected by TTL and total size"""
+
+    def __init__(self, directory=None, ttl=None, max_bytes=None):
+        self.directory = directory or os.environ.get("ECHOVERSE_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+        if ttl is None:
+            ttl = float(os.environ.get("ECHOVERSE_ARTIFACT_TTL", DEFAULT_TTL))
+        if max_bytes is None:
+            max_mb = os.environ.get("ECHOVERSE_ARTIFACT_MAX_MB")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=30)
+
+    def _path(self, artifact_id, audio_format):
+        return os.path.join(self.directory, f"{artifact_id}.{audio_format}")
+
+    def put(self, result, session=None):
+        """Write a synthesis result to disk and return it as a handle without the audio bytes"""
+        artifact_id = uuid.uuid4().hex
+        path = self._path(artifact_id, result["format"])
+        temp_path = f"{path}.tmp"
+        with span("store"), open(temp_path, 'wb') as handle:
+            handle.write(result["data"])
+        os.replace(temp_path, path)
+        return self._register(artifact_id, result, len(result["data"]), session)
+
+    def put_file(self, source_path, result, session=None):
+        """Move an already written file into the store; result carries its metadata and format"""
+        artifact_id = uuid.uuid4().hex
+        path = self._path(artifact_id, result["format"])
+        shutil.move(source_path, path)
+        return self._register(artifact_id, result, os.path.getsize(path), session)
+
+    def _register(self, artifact_id, result, size, session):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO artifacts (id, session, format, size, created, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (artifact_id, session, result["format"], size, now, now),
+            )
+        self.collect()
+
+        handle = {key: value for key, value in result.items() if key != "data"}
+        handle["artifact"] = artifact_id
+        return handle
+
+    def lookup(self, artifact_id):
+        """Return (path, format, size) for an artifact and mark it as recently used"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT format, size FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+            if row is None:
+                raise ArtifactNotFound(artifact_id)
+            conn.execute("UPDATE artifacts SET last_access = ? WHERE id = ?", (time.time(), artifact_id))
+        path = self._path(artifact_id, row[0])
+        if not os.path.exists(path):
+            raise ArtifactNotFound(artifact_id)
+        return path, row[0], row[1]
+
+    def exists(self, handle):
+        """Whether a handle still refers to a stored artifact"""
+        try:
+            self.lookup(handle["artifact"])
+        except ArtifactNotFound:
+            return False
+        return True
+
+    def open(self, artifact_id):
+        """Memory-map an artifact read-only for the duration of the block"""
+        return map_file(self.lookup(artifact_id)[0])
+
+    def path(self, handle):
+        """File path of a handle, for players that read the file themselves"""
+        return self.lookup(handle["artifact"])[0]
+
+    def read(self, handle):
+        """Full audio bytes of a handle, for consumers that need an in-memory buffer"""
+        with self.open(handle["artifact"]) as mapped:
+            return mapped[:]
+
+    def collect(self, now=None):
+        """Delete artifacts idle longer than the TTL, then the oldest until under max_bytes"""
+        now = time.time() if now is None else now
+        removed = 0
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute("SELECT id, format, size, last_access FROM artifacts ORDER BY last_access").fetchall()
+            total = sum(row[2] for row in rows)
+            for artifact_id, audio_format, size, last_access in rows:
+                if last_access >= now - self.ttl and total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(self._path(artifact_id, audio_format))
+                except FileNotFoundError:
+                    pass
+                conn.execute("DELETE FROM artifacts WHERE id = ?", (artifact_id,))
+                total -= size
+                removed += 1
+
+        workspaces = os.path.join(self.directory, "workspaces")
+        if os.path.isdir(workspaces):
+            for name in os.listdir(workspaces):
+                path = os.path.join(workspaces, name)
+                if os.path.getmtime(path) < now - self.ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+        return removed
+
+    def workspace(self, session):
+        """Per-session working directory for multi-file outputs, collected after the same TTL"""
+        path = os.path.join(self.directory, "workspaces", session)
+        os.makedirs(path, exist_ok=True)
+        os.utime(path)
+        return path
+
+    def session_usage(self, session):
+        """Return (artifacts, bytes on disk) owned by a session"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts WHERE session = ?", (session,)
+            ).fetchone()
+
+    def stats(self):
+        """Return stored artifacts, bytes and limits"""
+        with closing(self._connect()) as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "ttl": self.ttl}
+
+
+class ArtifactServer(ThreadingHTTPServer):
+    """Serves artifacts over HTTP with byte-range support straight from the memory map"""
+
+    daemon_threads = True
+
+    def __init__(self, store, address, public_url=None):
+        super().__init__(address, _ArtifactHandler)
+        self.store = store
+        host, port = self.server_address[:2]
+        if host in ("0.0.0.0", "127.0.0.1"):
+            host = "localhost"
+        self.public_url = (public_url or f"http://{host}:{port}").rstrip("/")
+
+    def url(self, handle, filename=None):
+        """Player URL for a handle, or a download URL when a filename is given"""
+        url = f"{self.public_url}/artifacts/{handle['artifact']}"
+        return f"{url}?download={quote(filename)}" if filename else url
+
+
+_RANGE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+class _ArtifactHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_error(self, status, extra_headers=()):
+        self.send_response(status)
+        for name, value in extra_headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _byte_range(self, size):
+        """Resolve the Range header to (start, end) inclusive, None for the whole file, or False if invalid"""
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        match = _RANGE.match(header.strip())
+        if not match or not any(match.groups()):
+            return None
+        first, last = match.groups()
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            return False
+        return start, end
+
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+
+    def do_GET(self, send_body=True):
+        parts = urlsplit(self.path)
+        segments = parts.path.strip("/").split("/")
+        if len(segments) != 2 or segments[0] != "artifacts":
+            self._send_error(404)
+            return
+
+        try:
+            path, audio_format, _ = self.server.store.lookup(segments[1])
+            with map_file(path) as mapped:
+                size = len(mapped)
+                byte_range = self._byte_range(size)
+                if byte_range is False:
+                    self._send_error(416, [("Content-Range", f"bytes */{size}")])
+                    return
+                start, end = byte_range or (0, size - 1)
+
+                self.send_response(206 if byte_range else 200)
+                self.send_header("Content-Type", MIME_TYPES.get(audio_format, "application/octet-stream"))
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(end - start + 1 if size else 0))
+                if byte_range:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                filename = parse_qs(parts.query).get("download")
+                if filename:
+                    self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(filename[0])}")
+                self.end_headers()
+
+                if send_body and size:
+                    with memoryview(mapped) as view:
+                        for offset in range(start, end + 1, SEND_BLOCK):
+                            self.wfile.write(view[offset:min(offset + SEND_BLOCK, end + 1)])
+        except (ArtifactNotFound, FileNotFoundError):
+            self._send_error(404)
+        except (BrokenPipeError, ConnectionResetError):
+            # Players routinely abort a response once they have buffered enough
+            pass
+
+
+_shared_store = None
+_shared_server = None
+_shared_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """Process-wide artifact store; ECHOVERSE_ARTIFACT_DIR overrides the location"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ArtifactStore()
+        return _shared_store
+
+
+def get_artifact_server():
+    """Process-wide range server for the shared store, or None unless it is enabled.
+
+    The server is off by default: browsers reach it directly, which only
+    works when they can connect to the app's host. ECHOVERSE_ARTIFACT_SERVER=1
+    or an ECHOVERSE_ARTIFACT_URL turns it on. ECHOVERSE_ARTIFACT_HOST/PORT
+    choose the bind address (default an ephemeral port on 127.0.0.1) and
+    ECHOVERSE_ARTIFACT_URL the address browsers use when the app runs
+    behind a proxy or on another host.
+    """
+    global _shared_server
+    default = "1" if os.environ.get("ECHOVERSE_ARTIFACT_URL") else "0"
+    if os.environ.get("ECHOVERSE_ARTIFACT_SERVER", default).lower() in ("0", "false", "off", "no"):
+        return None
+    store = get_artifact_store()
+    with _shared_lock:
+        if _shared_server is None:
+            address = (os.environ.get("ECHOVERSE_ARTIFACT_HOST", "127.0.0.1"),
+                       int(os.environ.get("ECHOVERSE_ARTIFACT_PORT", 0)))
+            _shared_server = ArtifactServer(store, address, os.environ.get("ECHOVERSE_ARTIFACT_URL"))
+            threading.Thread(target=_shared_server.serve_forever, daemon=True).start()
+        return _shared_server
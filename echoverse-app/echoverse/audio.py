@@ -0,0 +1,174 @@
+"""Helpers for working with synthesized audio buffers.
+
+WAV handling works on memoryviews of the PCM payload instead of going
+through wave.readframes, so merging segments costs one allocation for the
+final file and no intermediate copies.
+"""
+import struct
+
+MIME_TYPES = {'wav': 'audio/wav', 'mp3': 'audio/mpeg', 'ogg': 'audio/ogg', 'zip': 'application/zip'}
+
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# MPEG audio layer III tables, indexed by the header's version bits
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_BITRATES[0] = _MP3_BITRATES[2]
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def parse_wav(data):
+    """Return ((nchannels, sampwidth, framerate), memoryview of the PCM data)"""
+    view = memoryview(data)
+    if len(view) < 12 or view[:4] != b'RIFF' or view[8:12] != b'WAVE':
+        raise ValueError("Not a WAV file")
+
+    offset = 12
+    params = None
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        size = struct.unpack_from('<I', view, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b'fmt ':
+            nchannels, framerate = struct.unpack_from('<xxHI', view, body)
+            bits = struct.unpack_from('<H', view, body + 14)[0]
+            params = (nchannels, bits // 8, framerate)
+        elif chunk_id == b'data':
+            if params is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            # Streaming writers may leave the size at 0 or 0xFFFFFFFF
+            end = len(view) if size in (0, 0xFFFFFFFF) else min(body + size, len(view))
+            return params, view[body:end]
+        offset = body + size + (size & 1)
+    raise ValueError("WAV file has no data chunk")
+
+
+def wav_header(nchannels, sampwidth, framerate, data_size):
+    """Canonical 44-byte PCM WAV header"""
+    return _WAV_HEADER.pack(
+        b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, nchannels, framerate,
+        framerate * nchannels * sampwidth, nchannels * sampwidth, sampwidth * 8, b'data', data_size,
+    )
+
+
+def wav_duration(data):
+    """Return the duration in seconds of a WAV byte string"""
+    (nchannels, sampwidth, framerate), pcm = parse_wav(data)
+    return len(pcm) / float(nchannels * sampwidth * framerate)
+
+
+def wav_silence(params, seconds):
+    """WAV byte string of seconds of silence with (nchannels, sampwidth, framerate) params"""
+    nchannels, sampwidth, framerate = params
+    # 8-bit PCM is unsigned, so its silence is the midpoint rather than zero
+    sample = b'\x80' if sampwidth == 1 else bytes(sampwidth)
+    pcm = sample * (round(seconds * framerate) * nchannels)
+    return wav_header(nchannels, sampwidth, framerate, len(pcm)) + pcm
+
+
+def _mp3_frames(data):
+    """Yield (header, frame size, samples, sample rate) of each layer III frame"""
+    view = memoryview(data)
+    offset = 0
+    while offset + 4 <= len(view):
+        if view[offset:offset + 3] == b'ID3' and offset + 10 <= len(view):
+            # ID3v2 tag; the size is stored as four 7-bit bytes
+            size = 0
+            for byte in view[offset + 6:offset + 10]:
+                size = (size << 7) | (byte & 0x7F)
+            offset += 10 + size
+            continue
+        header = struct.unpack_from('>I', view, offset)[0]
+        version = (header >> 19) & 3
+        bitrate_index = (header >> 12) & 15
+        rate_index = (header >> 10) & 3
+        if (header >> 21) != 0x7FF or version == 1 or ((header >> 17) & 3) != 1 \
+                or bitrate_index in (0, 15) or rate_index == 3:
+            offset += 1  # Not a layer III frame header; resynchronize
+            continue
+        bitrate = _MP3_BITRATES[version][bitrate_index] * 1000
+        rate = _MP3_SAMPLE_RATES[version][rate_index]
+        samples = 1152 if version == 3 else 576
+        size = samples // 8 * bitrate // rate + ((header >> 9) & 1)
+        yield header, size, samples, rate
+        offset += size
+
+
+def mp3_duration(data):
+    """Return the duration in seconds of an MP3 byte string by walking its frames"""
+    return sum(samples / rate for _, _, samples, rate in _mp3_frames(data))
+
+
+def mp3_silence(reference, seconds):
+    """MP3 byte string of seconds of silence in the stream format of reference's first frame"""
+    for header, size, samples, rate in _mp3_frames(reference):
+        # No CRC and no padding byte; all-zero side information decodes as silence
+        size -= (header >> 9) & 1
+        header = (header | 0x10000) & ~0x200
+        frame = struct.pack('>I', header) + bytes(size - 4)
+        return frame * round(seconds * rate / samples)
+    raise ValueError("No MP3 frames to match")
+
+
+def ogg_duration(data):
+    """Return the duration in seconds of an Ogg Opus or Vorbis byte string from its granule positions"""
+    view = memoryview(data)
+    streams = {}
+    offset = 0
+    while offset + 27 <= len(view):
+        if view[offset:offset + 4] != b'OggS':
+            raise ValueError("Not an Ogg stream")
+        granule, serial = struct.unpack_from('<qI', view, offset + 6)
+        segments = view[offset + 26]
+        body = offset + 27 + segments
+        size = sum(view[offset + 27:body])
+        stream = streams.setdefault(serial, {"rate": None, "skip": 0, "granule": 0})
+        if stream["rate"] is None:
+            packet = view[body:body + size]
+            if packet[:8] == b'OpusHead':
+                stream["rate"] = 48000
+                stream["skip"] = struct.unpack_from('<H', packet, 10)[0]
+            elif packet[:7] == b'\x01vorbis':
+                stream["rate"] = struct.unpack_from('<I', packet, 12)[0]
+        if granule > stream["granule"]:
+            stream["granule"] = granule
+        offset = body + size
+    return sum(max(stream["granule"] - stream["skip"], 0) / stream["rate"]
+               for stream in streams.values() if stream["rate"])
+
+
+def audio_duration(data, audio_format):
+    """Measured duration of WAV, MP3 or OGG audio bytes"""
+    if audio_format == "wav":
+        return wav_duration(data)
+    if audio_format == "mp3":
+        return mp3_duration(data)
+    if audio_format == "ogg":
+        return ogg_duration(data)
+    raise ValueError(f"Unsupported audio format: {audio_format}")
+
+
+def merge_wav(segments):
+    """Concatenate WAV byte strings, in order, into a single valid WAV file"""
+    params = None
+    payloads = []
+    for segment in segments:
+        segment_params, pcm = parse_wav(segment)
+        if params is None:
+            params = segment_params
+        elif segment_params != params:
+            raise ValueError("Cannot merge WAV segments with different channel, width or rate settings")
+        payloads.append(pcm)
+
+    if params is None:
+        raise ValueError("No WAV segments to merge")
+
+    header = wav_header(*params, sum(len(pcm) for pcm in payloads))
+    return b''.join([header] + payloads)
+
+
+def merge_mp3(segments):
+    """Concatenate MP3 byte strings; MP3 frames are self-delimiting"""
+    return b''.join(segments)
@@ -0,0 +1,218 @@
+"""Headless batch conversion of manuscript files into audiobooks.
+
+Every input file is rewritten in the requested tone, synthesized and written
+to the output directory as ``<name>.<wav|mp3|ogg>`` plus a ``<name>.json``
+manifest. A file whose manifest matches the current source, tone and voice
+is skipped, so an interrupted run can simply be started again. Inputs that
+share a name keep their directories below the common one, so ``a/ch1.txt``
+and ``b/ch1.txt`` are written as ``a/ch1`` and ``b/ch1``. With chapters
+enabled the audio is a ``<name>.zip`` chapter bundle, and chapters whose
+text did not change reuse their audio from ``<name>.chapters/``, a name no
+other input's outputs can take.
+"""
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from .ingest import SUPPORTED_EXTENSIONS, read_document
+from .llm import create_llm
+from .packager import ChapterPackager
+from .tts import RealTTSEngine
+
+
+def find_inputs(patterns):
+    """Expand directories and glob patterns into a sorted list of manuscript files"""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.update(path for path in glob.glob(os.path.join(pattern, "*"))
+                         if os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS)
+        else:
+            paths.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def output_stems(sources):
+    """Map each source to its output name: the file stem, or its path below the
+    common directory of the sources sharing that stem"""
+    groups = {}
+    for source in sources:
+        groups.setdefault(os.path.splitext(os.path.basename(source))[0], []).append(source)
+    stems = {}
+    for stem, group in groups.items():
+        if len(group) == 1:
+            stems[group[0]] = stem
+            continue
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(source)) for source in group])
+        relative = {source: os.path.relpath(os.path.abspath(source), root) for source in group}
+        names = [os.path.splitext(path)[0] for path in relative.values()]
+        for source, path in relative.items():
+            name, extension = os.path.splitext(path)
+            # ch1.txt and ch1.md in one directory keep their extensions apart
+            stems[source] = name if names.count(name) == 1 else f"{name}-{extension.lstrip('.')}"
+    return stems
+
+
+def _manifest_path(output_dir, stem):
+    return os.path.join(output_dir, f"{stem}.json")
+
+
+def _finished_manifest(manifest_path, source_hash, tone, voice, audio_format=None, chapters=False):
+    """Return the manifest of a previous run for this exact input, if its audio exists"""
+    try:
+        with open(manifest_path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get("source_sha256"), manifest.get("tone"), manifest.get("voice")) != (source_hash, tone, voice):
+        return None
+    if audio_format and manifest.get("format") != audio_format:
+        return None
+    if bool(manifest.get("chapters")) != chapters:
+        return None
+    audio_path = os.path.join(os.path.dirname(manifest_path), manifest.get("audio_file", ""))
+    return manifest if os.path.isfile(audio_path) else None
+
+
+def _write_atomic(path, data, mode='wb'):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, mode) as handle:
+        handle.write(data)
+    os.replace(temp_path, path)
+
+
+class BatchConverter:
+    """Runs rewrite and synthesis for many files through a bounded worker pool"""
+
+    def __init__(self, output_dir, tone="Neutral", voice="Lisa", jobs=2, workers=None, llm=None, tts=None,
+                 audio_format=None, bitrate=None, chapters=False):
+        self.output_dir = output_dir
+        self.tone = tone
+        self.voice = voice
+        self.audio_format = audio_format
+        self.bitrate = bitrate
+        self.chapters = chapters
+        self.jobs = jobs
+        self.llm = llm or create_llm()
+        # Every file goes through the shared process pool so files render in parallel
+        self.tts = tts or RealTTSEngine(workers=workers, inline_max_chars=0)
+        if voice not in self.tts.voices:
+            raise ValueError(f"Unknown voice: {voice}")
+
+    def convert_file(self, source, stem=None):
+        """Convert one file, returning its manifest and whether it was skipped.
+        
+        stem names the outputs, below the output directory; it defaults to
+        the file's own stem.
+        """
+        stem = stem or os.path.splitext(os.path.basename(source))[0]
+        digest = hashlib.sha256()
+        with open(source, 'rb') as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b''):
+                digest.update(block)
+        source_hash = digest.hexdigest()
+        manifest_path = _manifest_path(self.output_dir, stem)
+
+        finished = _finished_manifest(manifest_path, source_hash, self.tone, self.voice, self.audio_format, self.chapters)
+        if finished is not None:
+            return finished, True
+
+        with open(source, 'rb') as handle:
+            text = read_document(source, handle)
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        if self.chapters:
+            manifest = self._package_chapters(source, stem, text, source_hash)
+            _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+            return manifest, False
+
+        start = time.perf_counter()
+        rewritten = self.llm.rewrite_text(text, self.tone)
+        rewrite_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        audio = self.tts.synthesize(rewritten, self.voice, audio_format=self.audio_format, bitrate=self.bitrate)
+        synthesize_seconds = time.perf_counter() - start
+
+        audio_file = f"{os.path.basename(stem)}.{audio['format']}"
+        _write_atomic(os.path.join(os.path.dirname(manifest_path), audio_file), audio['data'])
+
+        manifest = {
+            "source": os.path.abspath(source),
+            "source_sha256": source_hash,
+            "tone": self.tone,
+            "voice": self.voice,
+            "engine": audio['engine'],
+            "format": audio['format'],
+            "audio_file": audio_file,
+            "size": audio['size'],
+            "duration": audio['duration'],
+            "chars_in": len(text),
+            "rewrite_seconds": round(rewrite_seconds, 3),
+            "synthesize_seconds": round(synthesize_seconds, 3),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        # The manifest is written last: its presence marks the file as finished
+        _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+        return manifest, False
+
+    def _package_chapters(self, source, stem, text, source_hash):
+        """Synthesize a file chapter by chapter into <stem>.chapters/ and bundle it as <stem>.zip"""
+        packager = ChapterPackager(
+            self.llm, self.tts, os.path.join(self.output_dir, f"{stem}.chapters"), tone=self.tone, voice=self.voice,
+            audio_format=self.audio_format, bitrate=self.bitrate,
+        )
+        start = time.perf_counter()
+        result = packager.package(text, title=os.path.basename(stem), path=os.path.join(self.output_dir, f"{stem}.zip"))
+        return {
+            "source": os.path.abspath(source),
+            "source_sha256": source_hash,
+            "tone": self.tone,
+            "voice": self.voice,
+            "format": packager.audio_format,
+            "audio_file": f"{os.path.basename(stem)}.zip",
+            "chapters": result["chapters"],
+            "chapters_reused": result["skipped"],
+            "size": result["size"],
+            "duration": result["duration"],
+            "chars_in": len(text),
+            "synthesize_seconds": round(time.perf_counter() - start, 3),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def run(self, sources, log=print):
+        """Convert every source and return aggregate statistics"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stems = output_stems(sources)
+        stats = {"converted": 0, "skipped": 0, "failed": 0, "audio_seconds": 0.0}
+        start = time.perf_counter()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                futures = {executor.submit(self.convert_file, source, stems[source]): source for source in sources}
+                for future in as_completed(futures):
+                    source = futures[future]
+                    try:
+                        manifest, skipped = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        log(f"FAILED  {source}: {e}")
+                        continue
+                    if skipped:
+                        stats["skipped"] += 1
+                        log(f"skipped {source} (already converted)")
+                    else:
+                        stats["converted"] += 1
+                        stats["audio_seconds"] += manifest["duration"]
+                        log(f"done    {source} -> {manifest['audio_file']} ({manifest['duration']:.1f}s audio)")
+        finally:
+            self.tts.close()
+
+        elapsed = time.perf_counter() - start
+        stats["wall_seconds"] = elapsed
+        stats["files_per_minute"] = stats["converted"] / elapsed * 60 if elapsed else 0.0
+        stats["audio_seconds_per_wall_second"] = stats["audio_seconds"] / elapsed if elapsed else 0.0
+        return stats
@@ -0,0 +1,187 @@
+"""Persistent, content-addressed cache of synthesized audio.
+
+Entries are keyed by a hash of the normalized text together with the voice
+profile, engine and output format, so an unchanged chunk is never rendered
+twice. The cache is bounded in size and evicts least recently used entries.
+
+Command line usage:
+    python -m echoverse.cache stats
+    python -m echoverse.cache clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import closing
+
+from .metrics import increment
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "echoverse", "audio")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+
+def normalize_text(text):
+    """Collapse whitespace so formatting-only edits map to the same entry"""
+    return ' '.join(text.split())
+
+
+def cache_key(text, voice_config, engine, audio_format):
+    """Content hash of everything that influences the rendered audio"""
+    payload = json.dumps({
+        "text": normalize_text(text),
+        "voice": voice_config,
+        "engine": engine,
+        "format": audio_format,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SynthesisCache:
+    """Size-bounded LRU cache of audio bytes stored on disk"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get("ECHOVERSE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_mb = os.environ.get("ECHOVERSE_CACHE_MAX_MB")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(os.path.join(self.directory, "index.sqlite"), timeout=30)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _bump(self, conn, name, amount=1):
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key):
+        """Return cached audio bytes for key, or None on a miss"""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys):
+        """Return cached audio bytes or None for each key, updating the index in one transaction"""
+        found = []
+        for key in keys:
+            try:
+                with open(self._path(key), 'rb') as handle:
+                    found.append(handle.read())
+            except FileNotFoundError:
+                found.append(None)
+
+        hits = [key for key, data in zip(keys, found) if data is not None]
+        misses = [key for key, data in zip(keys, found) if data is None]
+        with closing(self._connect()) as conn, conn:
+            if misses:
+                conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in misses])
+                self._bump(conn, "misses", len(misses))
+            if hits:
+                now = time.time()
+                conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?", [(now, key) for key in hits])
+                self._bump(conn, "hits", len(hits))
+        if hits:
+            increment("cache_lookups", len(hits), cache="audio", result="hit")
+        if misses:
+            increment("cache_lookups", len(misses), cache="audio", result="miss")
+        return found
+
+    def put(self, key, data):
+        """Store audio bytes for key and evict old entries if over budget"""
+        self.put_many([(key, data)])
+
+    def put_many(self, items):
+        """Store (key, audio bytes) pairs, indexing them in one transaction"""
+        for key, data in items:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # A unique temp file per write, so threads storing the same key do not share one
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)",
+                [(key, len(data), now) for key, data in items],
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._bump(conn, "evictions", evicted)
+
+    def stats(self):
+        """Return hits, misses, evictions, stored entries and bytes"""
+        with closing(self._connect()) as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        counters.update({"entries": entries, "bytes": size, "max_bytes": self.max_bytes})
+        return counters
+
+    def clear(self):
+        """Remove every cached entry and reset the counters"""
+        with closing(self._connect()) as conn, conn:
+            for (key,) in conn.execute("SELECT key FROM entries").fetchall():
+                try:
+                    os.unlink(self._path(key))
+                except FileNotFoundError:
+                    pass
+            conn.execute("DELETE FROM entries")
+            conn.execute("UPDATE counters SET value = 0")
+
+
+def main(argv=None):
+    """Inspect or clear the synthesis cache from the command line"""
+    parser = argparse.ArgumentParser(prog="python -m echoverse.cache", description="Manage the EchoVerse synthesis cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--dir", dest="directory", help="cache directory (default: %(default)s)", default=None)
+    args = parser.parse_args(argv)
+
+    cache = SynthesisCache(args.directory)
+    if args.command == "clear":
+        cache.clear()
+        print(f"Cleared synthesis cache at {cache.directory}")
+    else:
+        for name, value in cache.stats().items():
+            print(f"{name:>10}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Chapter detection for manuscripts.
+
+A chapter starts at a heading (a Markdown heading, "Chapter 12", "PART IV:
+The Return", "Prologue" and similar on the first line of a paragraph) or
+after a run of three or more blank lines. Detection works on the original text, before
+tone rewriting, so headings are still recognisable.
+"""
+import re
+from collections import namedtuple
+
+from .chunking import split_paragraphs
+
+Chapter = namedtuple("Chapter", ["index", "title", "text"])
+
+MAX_HEADING_CHARS = 80
+
+_NUMBER_WORDS = (
+    "one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|"
+    "fifteen|sixteen|seventeen|eighteen|nineteen|twenty|first|second|third|fourth|fifth|last|final"
+)
+# A title after a named heading is a few words without sentence punctuation, either
+# after a separator ("Act I, Scene 2", "Part 2: the return") or capitalised
+# ("Chapter 1 The Storm"), so prose such as "Part one of the plan was simple."
+# is not taken for a heading
+_TITLE_WORDS = r"[^\s.!?]*(?:[ \t]+[^\s.!?]+){0,7}(?=[^\w.!?]*$)"
+_HEADING = re.compile(
+    r'^(?:#{1,6}\s*(?P<markdown>.+?)\s*#*'
+    r'|(?P<named>(?i:(?:chapter|part|book|act)[ \t]+(?:\d+|[ivxlcdm]+|%s)'
+    r'|prologue|epilogue|preface|foreword|introduction|afterword|interlude)\b'
+    r'(?:[ \t]*[,:.\-\u2013\u2014][ \t]*[^\s.!?]%s|[ \t]+[A-Z0-9]%s)?)\W*)$'
+    % (_NUMBER_WORDS, _TITLE_WORDS, _TITLE_WORDS),
+)
+_SECTION_BREAK = re.compile(r'\n[ \t]*\n(?:[ \t]*\n){2,}')
+
+
+def heading_title(line):
+    """Return the title if a line is a chapter heading, else None"""
+    line = line.strip()
+    if len(line) > MAX_HEADING_CHARS:
+        return None
+    match = _HEADING.match(line)
+    if match is None:
+        return None
+    return (match.group("markdown") or match.group("named")).strip().rstrip('.:')
+
+
+def split_heading(paragraph):
+    """Return (title, remaining text) when a paragraph starts with a heading line, else (None, paragraph)"""
+    first, _, rest = paragraph.partition('\n')
+    title = heading_title(first)
+    if title is None:
+        return None, paragraph
+    return title, rest.strip()
+
+
+def detect_chapters(text):
+    """Split a manuscript into Chapters; text without any markers is one chapter"""
+    chapters = []
+    title = None
+    paragraphs = []
+
+    def finish():
+        if paragraphs or title:
+            chapters.append(Chapter(len(chapters), title, "\n\n".join(paragraphs)))
+
+    for section in _SECTION_BREAK.split(text):
+        for paragraph in split_paragraphs(section):
+            heading, rest = split_heading(paragraph)
+            if heading is None:
+                paragraphs.append(paragraph)
+                continue
+            finish()
+            title, paragraphs = heading, [rest] if rest else []
+        # A long run of blank lines closes the current chapter
+        finish()
+        title, paragraphs = None, []
+
+    # Headings with nothing under them are folded into the next chapter's title
+    merged = []
+    for chapter in chapters:
+        if merged and not merged[-1].text:
+            previous = merged.pop()
+            title = f"{previous.title}: {chapter.title}" if chapter.title else previous.title
+            chapter = chapter._replace(title=title)
+        merged.append(chapter)
+    return [Chapter(index, chapter.title or f"Part {index + 1}", chapter.text)
+            for index, chapter in enumerate(merged)]
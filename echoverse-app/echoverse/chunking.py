@@ -0,0 +1,149 @@
+"""Split long texts into bounded chunks at paragraph and sentence boundaries"""
+import re
+from itertools import product
+
+DEFAULT_MAX_CHARS = 1500
+DEFAULT_PAGE_CHARS = 20000
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+ABBREVIATIONS = frozenset((
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "fig", "approx", "inc", "ltd", "dept", "mt", "jan", "feb", "apr", "jun",
+    "jul", "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k",
+))
+# A sentence ends at ! or ?, or at a period that does not close an abbreviation
+# or a single-letter initial, followed by optional closing quotes and
+# whitespace. Decimals never match because whitespace must follow. The regex
+# only finds candidate ends; the word before a period is then looked up in
+# ABBREVIATIONS, for the few bodies that end in a word of up to two characters
+# or in the last three characters of a longer abbreviation.
+_SENTENCE_END = re.compile(r'([.!?][.!?]*["\')\]]*)(\s+)')
+_TAIL = max(len(word) for word in ABBREVIATIONS) + 1
+_LAST_WORD = re.compile(r'[\w.]*\Z')
+_ABBREVIATION_SUFFIXES = frozenset(
+    ''.join(case) for word in ABBREVIATIONS if len(word) > 2
+    for case in product(*({char, char.upper()} for char in word[-3:]))
+)
+_TRAILING_PUNCTUATION = '.!?"\')]'
+
+
+def split_paragraphs(text):
+    """Split text into non-empty paragraphs separated by blank lines"""
+    return [p.strip() for p in _PARAGRAPH_BREAK.split(text) if p.strip()]
+
+
+def _closes_abbreviation(text):
+    """Whether a period after text closes an abbreviation or a single-letter initial"""
+    token = _LAST_WORD.search(text[-_TAIL:]).group().lower()
+    while token:
+        if token in ABBREVIATIONS or (len(token) == 1 and token.isalpha()):
+            return True
+        token = token.partition('.')[2]  # "x.mr" ends in the word "mr"
+    return False
+
+
+def split_sentence_parts(paragraph):
+    """Return parallel lists of sentence bodies and their terminal punctuation"""
+    pieces = _SENTENCE_END.split(paragraph.strip())
+    bodies = pieces[0::3]
+    endings = pieces[1::3]
+    # Bodies that may end in an abbreviation, checked back to front so that
+    # merging a body into the one before it leaves earlier indexes valid
+    suspects = [index for index, (body, ending) in enumerate(zip(bodies, endings)) if ending[0] == '.' and (
+        body[-3:] in _ABBREVIATION_SUFFIXES or not body[-3:-2].isalnum() or not body[-2:-1].isalnum())]
+    for index in reversed(suspects):
+        ending = endings[index]
+        if not _closes_abbreviation(bodies[index]):
+            continue
+        if ending[1:2] in ('.', '!', '?'):
+            # "etc.." still ends the sentence at its second period
+            bodies[index] += '.'
+            endings[index] = ending[1:]
+        else:
+            bodies[index:index + 2] = [bodies[index] + ending + pieces[3 * index + 2] + bodies[index + 1]]
+            del endings[index]
+    last = bodies[-1]
+    body = last.rstrip(_TRAILING_PUNCTUATION)
+    if not last:
+        bodies.pop()
+    else:
+        bodies[-1] = body
+        endings.append(last[len(body):])
+    return bodies, endings
+
+
+def iter_sentences(paragraph):
+    """Yield the sentences of a paragraph"""
+    bodies, endings = split_sentence_parts(paragraph)
+    for body, ending in zip(bodies, endings):
+        yield body + ending
+
+
+def split_sentences(paragraph):
+    """Split a paragraph into sentences"""
+    return list(iter_sentences(paragraph))
+
+
+def _split_long_piece(piece, max_chars):
+    """Hard-split a single oversized sentence at whitespace"""
+    words = piece.split()
+    current = []
+    size = 0
+    for word in words:
+        if current and size + len(word) + 1 > max_chars:
+            yield ' '.join(current)
+            current = []
+            size = 0
+        current.append(word)
+        size += len(word) + 1
+    if current:
+        yield ' '.join(current)
+
+
+def iter_chunks(paragraphs, max_chars=DEFAULT_MAX_CHARS):
+    """Yield chunks of at most max_chars from an iterable of paragraphs.
+
+    Chunks never span paragraphs, so an edit to one paragraph leaves the
+    chunk boundaries of every other paragraph unchanged.
+    """
+    for paragraph in paragraphs:
+        if len(paragraph) <= max_chars:
+            yield paragraph
+            continue
+
+        current = []
+        size = 0
+        for sentence in split_sentences(paragraph):
+            pieces = [sentence] if len(sentence) <= max_chars else _split_long_piece(sentence, max_chars)
+            for piece in pieces:
+                if current and size + len(piece) + 1 > max_chars:
+                    yield ' '.join(current)
+                    current = []
+                    size = 0
+                current.append(piece)
+                size += len(piece) + 1
+        if current:
+            yield ' '.join(current)
+
+
+def chunk_text(text, max_chars=DEFAULT_MAX_CHARS):
+    """Split text into a list of synthesis-sized chunks"""
+    return list(iter_chunks(split_paragraphs(text), max_chars))
+
+
+def page_bounds(text, page_chars=DEFAULT_PAGE_CHARS):
+    """(start, end) offsets of display pages of at most page_chars, broken at paragraphs or words"""
+    bounds = []
+    start = 0
+    while len(text) - start > page_chars:
+        limit = start + page_chars
+        end = text.rfind('\n\n', start + 1, limit)
+        if end <= start:
+            end = text.rfind(' ', start + 1, limit)
+        if end <= start:
+            end = limit
+        bounds.append((start, end))
+        start = end
+    bounds.append((start, len(text)))
+    return bounds
@@ -0,0 +1,122 @@
+"""Command line entry point for EchoVerse.
+
+    echoverse [ui]                     launch the Streamlit interface
+    echoverse batch INPUT... -o OUT    convert manuscripts without the UI
+    echoverse serve [--port 8765]      run the local job service
+    echoverse cache stats|clear        manage the synthesis cache
+
+Only the subcommand that runs is imported, so batch jobs never load Streamlit.
+"""
+import argparse
+import importlib.util
+import subprocess
+import sys
+
+from .metrics import configure_logging
+
+TONES = ["Neutral", "Suspenseful", "Inspiring"]
+VOICES = ["Lisa", "Michael", "Allison"]
+FORMATS = ["wav", "mp3", "ogg"]
+
+
+def _run_ui(args):
+    """Start the Streamlit app in a child process"""
+    spec = importlib.util.find_spec("echoverse_app")
+    if spec is None or spec.origin is None:
+        print("echoverse_app.py not found; run from the project directory", file=sys.stderr)
+        return 1
+    return subprocess.call([sys.executable, "-m", "streamlit", "run", spec.origin, *args.streamlit_args])
+
+
+def _run_batch(args):
+    """Convert a set of files and print throughput"""
+    from .batch import BatchConverter, find_inputs
+
+    sources = find_inputs(args.inputs)
+    if not sources:
+        print("No input manuscripts found", file=sys.stderr)
+        return 1
+
+    converter = BatchConverter(
+        args.output, tone=args.tone, voice=args.voice, jobs=args.jobs, workers=args.workers,
+        audio_format=args.format, bitrate=args.bitrate, chapters=args.chapters
+    )
+    print(f"Converting {len(sources)} file(s) with {args.tone} tone and {args.voice} voice")
+    stats = converter.run(sources)
+
+    print(
+        f"\n{stats['converted']} converted, {stats['skipped']} skipped, {stats['failed']} failed "
+        f"in {stats['wall_seconds']:.1f}s"
+    )
+    print(
+        f"Throughput: {stats['files_per_minute']:.1f} files/min, "
+        f"{stats['audio_seconds_per_wall_second']:.2f} audio-seconds per wall-second"
+    )
+    return 1 if stats["failed"] else 0
+
+
+def _run_serve(args):
+    """Run the asyncio job service until interrupted"""
+    import asyncio
+    from .service import serve
+
+    try:
+        asyncio.run(serve(args.host, args.port, data_dir=args.data_dir,
+                          workers=args.workers, max_queued=args.max_queued))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _run_cache(args):
+    from .cache import main as cache_main
+    return cache_main([args.command] + (["--dir", args.directory] if args.directory else []))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="echoverse", description="AI-Powered Audiobook Creation Tool")
+    subparsers = parser.add_subparsers(dest="subcommand")
+
+    ui = subparsers.add_parser("ui", help="launch the Streamlit interface (default)")
+    ui.add_argument("streamlit_args", nargs=argparse.REMAINDER, help="extra arguments for streamlit run")
+    ui.set_defaults(func=_run_ui)
+
+    batch = subparsers.add_parser("batch", help="convert a directory or glob of .txt/.md/.docx/.epub files")
+    batch.add_argument("inputs", nargs="+", help="input directories or glob patterns")
+    batch.add_argument("-o", "--output", default="echoverse_output", help="output directory (default: %(default)s)")
+    batch.add_argument("--tone", choices=TONES, default="Neutral")
+    batch.add_argument("--voice", choices=VOICES, default="Lisa")
+    batch.add_argument("--jobs", type=int, default=2, help="files processed concurrently (default: %(default)s)")
+    batch.add_argument("--workers", type=int, default=None, help="synthesis worker processes (default: CPU count)")
+    batch.add_argument("--format", choices=FORMATS, default=None, help="output format (default: the engine's own)")
+    batch.add_argument("--bitrate", default=None, help="bitrate for mp3/ogg output, e.g. 64k (default: 48k)")
+    batch.add_argument("--chapters", action="store_true",
+                       help="detect chapters and write a ZIP with one audio file per chapter and an index")
+    batch.set_defaults(func=_run_batch)
+
+    serve = subparsers.add_parser("serve", help="run the local rewrite/synthesis job service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=2, help="jobs run concurrently (default: %(default)s)")
+    serve.add_argument("--max-queued", type=int, default=100, help="reject submissions beyond this (default: %(default)s)")
+    serve.add_argument("--data-dir", default=None, help="queue database and results directory")
+    serve.set_defaults(func=_run_serve)
+
+    cache = subparsers.add_parser("cache", help="inspect or clear the synthesis cache")
+    cache.add_argument("command", choices=["stats", "clear"])
+    cache.add_argument("--dir", dest="directory", default=None)
+    cache.set_defaults(func=_run_cache)
+    return parser
+
+
+def main(argv=None):
+    """Entry point for the ``echoverse`` console script"""
+    args = build_parser().parse_args(argv)
+    configure_logging()
+    if args.subcommand is None:
+        args = build_parser().parse_args(["ui"])
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""HTTP client for the local job service"""
+import time
+
+from .progress import report_progress
+
+
+class ServiceBusyError(RuntimeError):
+    """The service rejected a job because its queue is full"""
+
+
+class JobFailedError(RuntimeError):
+    """A job finished as failed or cancelled"""
+
+
+class JobClient:
+    """Submits jobs to an EchoVerse job service and polls them to completion"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        import requests  # Deferred so importing the UI does not pay for it without a service
+        self.session = requests.Session()
+
+    def _url(self, *parts):
+        return '/'.join([self.base_url, *parts])
+
+    def submit(self, kind, **params):
+        """Queue a job and return its id"""
+        response = self.session.post(self._url("jobs"), json={"kind": kind, **params}, timeout=self.timeout)
+        if response.status_code == 429:
+            raise ServiceBusyError(response.json()["error"])
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def status(self, job_id):
+        response = self.session.get(self._url("jobs", job_id), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def cancel(self, job_id):
+        """Cancel a job; returns False if it had already finished"""
+        response = self.session.delete(self._url("jobs", job_id), timeout=self.timeout)
+        return response.status_code == 200
+
+    def wait(self, job_id, poll_interval=0.25, progress=None, stage="job"):
+        """Poll until the job finishes, forwarding progress, and return its final status"""
+        while True:
+            status = self.status(job_id)
+            if status["total"]:
+                report_progress(progress, stage, status["completed"], status["total"])
+            if status["status"] in ("done", "failed", "cancelled"):
+                if status["status"] != "done":
+                    raise JobFailedError(status["error"] or f"Job {status['status']}")
+                return status
+            time.sleep(poll_interval)
+
+    def result(self, job_id):
+        """Fetch a finished job's result: JSON for rewrites, raw bytes for audio"""
+        response = self.session.get(self._url("jobs", job_id, "result"), timeout=self.timeout)
+        response.raise_for_status()
+        if response.headers.get("Content-Type", "").startswith("application/json"):
+            return response.json()
+        return response.content
+
+    def rewrite(self, text, tone, progress=None):
+        """Run a rewrite job and return the rewritten text"""
+        job_id = self.submit("rewrite", text=text, tone=tone)
+        self.wait(job_id, progress=progress, stage="rewrite")
+        return self.result(job_id)["text"]
+
+    def synthesize(self, text, voice, audio_format=None, progress=None, bitrate=None):
+        """Run a synthesis job and return the same result dictionary as RealTTSEngine"""
+        job_id = self.submit("synthesize", text=text, voice=voice, format=audio_format, bitrate=bitrate)
+        status = self.wait(job_id, progress=progress, stage="synthesize")
+        audio = dict(status["result"])
+        audio["data"] = self.result(job_id)
+        return audio
+
+    def synthesize_dialogue(self, text, narrator, cast=None, audio_format=None, progress=None, bitrate=None,
+                            tone=None):
+        """Run a multi-voice synthesis job and return the same result dictionary as RealTTSEngine.
+
+        With a tone, the service rewrites each voiced segment of text in that tone.
+        """
+        job_id = self.submit("synthesize", text=text, voice=narrator, dialogue=True, cast=cast or {},
+                             tone=tone, format=audio_format, bitrate=bitrate)
+        status = self.wait(job_id, progress=progress, stage="synthesize")
+        audio = dict(status["result"])
+        audio["data"] = self.result(job_id)
+        return audio
@@ -0,0 +1,152 @@
+"""Dialogue segmentation for multi-voice narration.
+
+Text is split into narration, read by the narrator, and speech, read in the
+speaker's voice. Speech is quoted ("..." or “...”) or a line tagged with its
+speaker ("MARA: Get down!"). Quoted speech belongs to the name next to a
+speech verb around it ("Run," Mara said / Elias asked, "Where?"), or to the
+last speaker named in the same paragraph; speech nobody is named for gets
+the first voice other than the narrator's. Speakers missing from the cast
+are given the other voices in turn, in order of first appearance.
+"""
+import re
+from collections import Counter, namedtuple
+
+from .chunking import split_paragraphs
+
+Segment = namedtuple("Segment", ["voice", "text", "new_paragraph"])
+
+SPEECH_VERBS = (
+    "said", "says", "asked", "asks", "replied", "answered", "whispered", "shouted", "called", "cried",
+    "muttered", "murmured", "added", "continued", "snapped", "yelled", "told", "explained", "insisted",
+)
+PRONOUNS = ("he", "she", "they", "i", "we", "you", "it")
+
+_VERBS = "|".join(SPEECH_VERBS)
+_NAME = r"[A-Z][\w'-]*"
+_QUOTE = re.compile(r'"[^"]+"|“[^”]+”')
+_ATTRIBUTION_AFTER = re.compile(r"[\s,]*(?:(?P<name>%s)\s+(?:%s)|(?:%s)\s+(?P<inverted>%s))\b" % (
+    _NAME, _VERBS, _VERBS, _NAME))
+_ATTRIBUTION_BEFORE = re.compile(r"(?:(?P<name>%s)\s+(?:%s)|(?:%s)\s+(?P<inverted>%s))\b[^.!?]*$" % (
+    _NAME, _VERBS, _VERBS, _NAME))
+# A tag is up to three capitalized words and a colon at the start of a line
+_TAG = re.compile(r"^\s*(?P<speaker>[A-Z][\w'.-]*(?: [A-Z][\w'.-]*){0,2})\s*:\s*(?P<speech>\S.*)$")
+_WORD = re.compile(r"\w")
+
+
+def parse_cast(spec, voices):
+    """Parse "Mara=Allison, Elias=Michael" into a speaker to voice mapping"""
+    names = {voice.casefold(): voice for voice in voices}
+    cast = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        speaker, separator, voice = entry.partition("=")
+        if not separator or not speaker.strip():
+            raise ValueError(f"Expected Speaker=Voice, got: {entry.strip()}")
+        if voice.strip().casefold() not in names:
+            raise ValueError(f"Unknown voice for {speaker.strip()}: {voice.strip()}")
+        cast[speaker.strip()] = names[voice.strip().casefold()]
+    return cast
+
+
+class _Casting:
+    """Voice of each speaker; speakers not cast are given the spare voices in turn"""
+
+    def __init__(self, narrator, voices, cast):
+        self.narrator = narrator
+        self.cast = {name.casefold(): voice for name, voice in (cast or {}).items()}
+        self.spare = [voice for voice in voices if voice != narrator] or [narrator]
+        self.assigned = 0
+
+    def is_cast(self, speaker):
+        return speaker.casefold() in self.cast
+
+    def voice(self, speaker):
+        if speaker is None:
+            return self.spare[0]
+        key = speaker.casefold()
+        if key not in self.cast:
+            self.cast[key] = self.spare[self.assigned % len(self.spare)]
+            self.assigned += 1
+        return self.cast[key]
+
+
+def _attributed(match):
+    if match is None:
+        return None
+    name = match.group("name") or match.group("inverted")
+    return None if name.casefold() in PRONOUNS else name
+
+
+def _quoted_pieces(block, casting, speaker):
+    """Yield (voice, text) pieces of untagged text; returns the paragraph's last named speaker"""
+    quotes = list(_QUOTE.finditer(block))
+    position = 0
+    for index, quote in enumerate(quotes):
+        before = block[position:quote.start()]
+        after = block[quote.end():quotes[index + 1].start() if index + 1 < len(quotes) else len(block)]
+        named = _attributed(_ATTRIBUTION_AFTER.match(after)) or _attributed(_ATTRIBUTION_BEFORE.search(before))
+        speaker = named or speaker
+        yield casting.narrator, before
+        yield casting.voice(speaker), quote.group()
+        position = quote.end()
+    yield casting.narrator, block[position:]
+    return speaker
+
+
+def _paragraph_pieces(paragraph, casting, tags):
+    """Yield the (voice, text) pieces of one paragraph in reading order"""
+    speaker = None
+    block = []
+    for line in paragraph.splitlines():
+        match = _TAG.match(line)
+        if match and (match.group("speaker") in tags or casting.is_cast(match.group("speaker"))):
+            if block:
+                speaker = yield from _quoted_pieces("\n".join(block), casting, speaker)
+                block = []
+            speaker = match.group("speaker")
+            yield casting.voice(speaker), match.group("speech")
+        else:
+            block.append(line)
+    if block:
+        yield from _quoted_pieces("\n".join(block), casting, speaker)
+
+
+def split_dialogue(text, narrator, voices, cast=None):
+    """Split text into voiced Segments in reading order.
+
+    voices are the voices available to speakers and cast maps speaker names
+    to voices ahead of them. Neighbouring pieces with the same voice are
+    merged; new_paragraph marks segments that open a paragraph.
+    """
+    paragraphs = split_paragraphs(text)
+    # A tag counts when it is in capitals or recurs; one-off "Note:" lines stay narration
+    counts = Counter(match.group("speaker") for paragraph in paragraphs for line in paragraph.splitlines()
+                     for match in [_TAG.match(line)] if match)
+    tags = {speaker for speaker, count in counts.items() if count > 1 or (speaker.isupper() and len(speaker) > 1)}
+    casting = _Casting(narrator, voices, cast)
+
+    segments = []
+    voice = None
+    parts = []
+    opens_paragraph = False
+
+    def finish():
+        if parts:
+            segments.append(Segment(voice, "".join(parts), opens_paragraph))
+
+    for paragraph in paragraphs:
+        new_paragraph = True
+        for piece_voice, piece in _paragraph_pieces(paragraph, casting, tags):
+            piece = piece.strip()
+            if not _WORD.search(piece):
+                continue
+            if piece_voice == voice:
+                parts.append("\n\n" if new_paragraph else " ")
+            else:
+                finish()
+                voice, parts, opens_paragraph = piece_voice, [], new_paragraph
+            parts.append(piece)
+            new_paragraph = False
+    finish()
+    return segments
@@ -0,0 +1,144 @@
+"""Output encoding stage: transcode synthesized chunks to WAV, MP3 or OGG.
+
+Each chunk is encoded on its own, in parallel, and the compressed chunks are
+joined without decoding them again: MP3 frames are self-delimiting and are
+simply appended, while Ogg chunks are remuxed into one logical stream with
+ffmpeg's concat demuxer and stream copy, so players see a single file with
+the right duration. OGG output is Opus in an Ogg container. Encoding is
+built on pydub and needs an ffmpeg (or avconv) binary.
+"""
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from .audio import merge_mp3, merge_wav
+from .engines import scratch_dir
+from .metrics import span
+from .pipeline import default_workers
+from .progress import report_progress
+
+OUTPUT_FORMATS = ("wav", "mp3", "ogg")
+BITRATES = ("32k", "48k", "64k", "96k", "128k")
+DEFAULT_BITRATE = "48k"
+
+# Per-chunk headers would otherwise repeat inside the joined stream: the Xing
+# frame of each chunk makes players report the first chunk's duration. OGG
+# uses Opus, which accepts any of BITRATES at the 22.05 kHz engines produce
+# (libvorbis refuses bitrates above ~80k at that rate).
+_EXPORT_OPTIONS = {
+    "mp3": {"codec": "libmp3lame", "parameters": ["-write_xing", "0", "-id3v2_version", "0"]},
+    "ogg": {"codec": "libopus", "parameters": []},
+    "wav": {"codec": None, "parameters": []},
+}
+
+
+class EncodingError(RuntimeError):
+    """Raised when audio could not be encoded to the requested format"""
+
+
+def encoder_available():
+    """Whether pydub and an ffmpeg binary are installed"""
+    if not (shutil.which("ffmpeg") or shutil.which("avconv")):
+        return False
+    # pydub itself is imported only when something is encoded
+    return importlib.util.find_spec("pydub") is not None
+
+
+def encode_segment(data, source_format, audio_format, bitrate=DEFAULT_BITRATE):
+    """Transcode one chunk of audio bytes to audio_format"""
+    from pydub import AudioSegment
+
+    options = _EXPORT_OPTIONS[audio_format]
+    segment = AudioSegment.from_file(BytesIO(data), format=source_format)
+    output = BytesIO()
+    segment.export(
+        output, format=audio_format, codec=options["codec"],
+        bitrate=None if audio_format == "wav" else bitrate, parameters=options["parameters"],
+    )
+    return output.getvalue()
+
+
+def _concat_ogg(segments):
+    """Remux Ogg chunks into a single stream with packet copy, no re-encoding"""
+    from pydub.utils import get_encoder_name
+
+    with tempfile.TemporaryDirectory(dir=scratch_dir()) as directory:
+        listing = []
+        for index, data in enumerate(segments):
+            path = os.path.join(directory, f"{index:06d}.ogg")
+            with open(path, 'wb') as handle:
+                handle.write(data)
+            listing.append(f"file '{path}'\n")
+        list_path = os.path.join(directory, "chunks.txt")
+        with open(list_path, 'w') as handle:
+            handle.writelines(listing)
+
+        process = subprocess.run(
+            [get_encoder_name(), "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path,
+             "-c", "copy", "-f", "ogg", "pipe:1"],
+            capture_output=True,
+        )
+    if process.returncode != 0:
+        raise EncodingError(f"Could not join OGG chunks: {process.stderr.decode(errors='replace').strip()}")
+    return process.stdout
+
+
+def join_segments(segments, audio_format):
+    """Concatenate encoded chunks of one format without re-encoding"""
+    if audio_format == "wav":
+        return merge_wav(segments)
+    if audio_format == "ogg" and len(segments) > 1:
+        return _concat_ogg(segments)
+    return merge_mp3(segments)
+
+
+class AudioEncoder:
+    """Encodes chunks in parallel; the work runs in ffmpeg subprocesses, so threads suffice"""
+
+    def __init__(self, workers=None):
+        self.workers = workers or default_workers()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def encode(self, segments, source_format, audio_format, bitrate=None, progress=None):
+        """Encode chunks and return the joined file in audio_format"""
+        if audio_format not in OUTPUT_FORMATS:
+            raise EncodingError(f"Unsupported output format: {audio_format}")
+        if audio_format == source_format:
+            return join_segments(segments, audio_format)
+        if not encoder_available():
+            raise EncodingError(f"Encoding to {audio_format} requires pydub and ffmpeg")
+
+        bitrate = bitrate or DEFAULT_BITRATE
+        try:
+            with span("encode", format=audio_format):
+                if len(segments) == 1:
+                    encoded = [encode_segment(segments[0], source_format, audio_format, bitrate)]
+                else:
+                    futures = [self._get_executor().submit(encode_segment, data, source_format, audio_format,
+                                                           bitrate) for data in segments]
+                    encoded = []
+                    for future in futures:
+                        encoded.append(future.result())
+                        report_progress(progress, "encode", len(encoded), len(futures))
+        except Exception as e:
+            raise EncodingError(f"Could not encode audio to {audio_format}: {e}") from e
+        return join_segments(encoded, audio_format)
+
+    def close(self):
+        """Shut down the encoder pool"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
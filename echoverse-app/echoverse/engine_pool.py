@@ -0,0 +1,163 @@
+"""Pool of warm pyttsx3 drivers shared across synthesis requests.
+
+Creating a driver and scanning the system voice list costs hundreds of
+milliseconds on espeak, so drivers are created once, the system voice id for
+each voice profile is resolved once, and drivers are handed out again and
+again. A driver is health-checked on every checkin and recycled after
+max_jobs renders so long-running processes do not accumulate driver state.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from .engines import apply_pyttsx3_profile, resolve_pyttsx3_voice_id
+from .metrics import get_metrics, span
+
+DEFAULT_MAX_ENGINES = 1
+DEFAULT_MAX_JOBS = 200
+
+
+def profile_key(voice_config):
+    """Hashable identity of a voice profile"""
+    return tuple(sorted(voice_config.items()))
+
+
+def _default_factory():
+    import pyttsx3
+    # pyttsx3.init() returns a shared cached driver; the pool needs its own
+    return pyttsx3.Engine()
+
+
+class PooledEngine:
+    """A driver checked out of the pool together with its bookkeeping"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.profile = None
+        self.jobs = 0
+
+
+class Pyttsx3EnginePool:
+    """Thread-safe checkout/checkin pool of prepared pyttsx3 drivers"""
+
+    def __init__(self, max_engines=DEFAULT_MAX_ENGINES, max_jobs=DEFAULT_MAX_JOBS, factory=None):
+        self.max_engines = max_engines
+        self.max_jobs = max_jobs
+        self._factory = factory or _default_factory
+        self._condition = threading.Condition()
+        self._idle = []
+        self._total = 0
+        self._voice_ids = {}
+        self.stats = {"created": 0, "recycled": 0, "checkouts": 0}
+
+    def _voice_id(self, driver, voice_config):
+        """Resolve the system voice for a profile once and remember it"""
+        key = profile_key(voice_config)
+        if key not in self._voice_ids:
+            self._voice_ids[key] = resolve_pyttsx3_voice_id(driver, voice_config)
+        return self._voice_ids[key]
+
+    def _prepare(self, pooled, voice_config):
+        key = profile_key(voice_config)
+        if pooled.profile != key:
+            with self._condition:
+                voice_id = self._voice_id(pooled.driver, voice_config)
+            apply_pyttsx3_profile(pooled.driver, voice_config, voice_id)
+            pooled.profile = key
+
+    def checkout(self, voice_config, timeout=None):
+        """Take a driver prepared for voice_config, creating one if allowed"""
+        key = profile_key(voice_config)
+        start = time.perf_counter()
+        with self._condition:
+            while True:
+                if self._idle:
+                    # Prefer a driver that already carries this profile
+                    for index, pooled in enumerate(self._idle):
+                        if pooled.profile == key:
+                            break
+                    else:
+                        index = len(self._idle) - 1
+                    pooled = self._idle.pop(index)
+                    break
+                if self._total < self.max_engines:
+                    self._total += 1
+                    pooled = None
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("Timed out waiting for a pyttsx3 engine")
+            self.stats["checkouts"] += 1
+        get_metrics().observe("queue_wait", time.perf_counter() - start, pool="pyttsx3")
+
+        if pooled is None:
+            try:
+                with span("init", component="pyttsx3_driver"):
+                    pooled = PooledEngine(self._factory())
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self.stats["created"] += 1
+
+        try:
+            self._prepare(pooled, voice_config)
+        except Exception:
+            self.checkin(pooled, healthy=False)
+            raise
+        return pooled
+
+    def _is_healthy(self, pooled):
+        try:
+            pooled.driver.getProperty('rate')
+            return True
+        except Exception:
+            return False
+
+    def checkin(self, pooled, healthy=True):
+        """Return a driver; broken or worn-out drivers are discarded"""
+        pooled.jobs += 1
+        keep = healthy and pooled.jobs < self.max_jobs and self._is_healthy(pooled)
+        if not keep:
+            try:
+                pooled.driver.stop()
+            except Exception:
+                pass
+        with self._condition:
+            if keep:
+                self._idle.append(pooled)
+            else:
+                self._total -= 1
+                self.stats["recycled"] += 1
+            self._condition.notify()
+
+    @contextmanager
+    def engine(self, voice_config, timeout=None):
+        """Context manager yielding a prepared driver for one render"""
+        pooled = self.checkout(voice_config, timeout)
+        healthy = False
+        try:
+            yield pooled.driver
+            healthy = True
+        finally:
+            self.checkin(pooled, healthy)
+
+    def warm(self, voice_configs):
+        """Create a driver and resolve the voice id of every profile up front"""
+        for voice_config in voice_configs:
+            pooled = self.checkout(voice_config)
+            self.checkin(pooled)
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_engine_pool():
+    """Process-wide pool shared by every RealTTSEngine in this process"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = Pyttsx3EnginePool()
+        return _shared_pool
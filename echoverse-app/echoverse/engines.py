@@ -0,0 +1,100 @@
+"""Backend-specific rendering of a single piece of text to audio bytes"""
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+
+from .metrics import span
+
+MALE_VOICE_HINTS = ('male', 'david', 'mark')
+FEMALE_VOICE_HINTS = ('female', 'zira', 'hazel')
+
+# pyttsx3 can only render to a path; keep those files on tmpfs when available
+SCRATCH_ROOTS = ('/dev/shm',)
+
+_scratch_lock = threading.Lock()
+_scratch_dir = None
+
+
+def resolve_pyttsx3_voice_id(engine, voice_config):
+    """Find the system voice id best matching a voice profile, or None"""
+    voices = engine.getProperty('voices')
+    if not voices:
+        return None
+    hints = MALE_VOICE_HINTS if voice_config['gender'] == 'male' else FEMALE_VOICE_HINTS
+    for voice in voices:
+        name = voice.name.lower()
+        if any(hint in name for hint in hints):
+            return voice.id
+    return None
+
+
+def apply_pyttsx3_profile(engine, voice_config, voice_id):
+    """Apply rate and an already resolved system voice to an engine"""
+    engine.setProperty('rate', voice_config['rate'])
+    if voice_id is not None:
+        engine.setProperty('voice', voice_id)
+
+
+def configure_pyttsx3_engine(engine, voice_config):
+    """Apply rate and the best matching system voice for a voice profile"""
+    apply_pyttsx3_profile(engine, voice_config, resolve_pyttsx3_voice_id(engine, voice_config))
+
+
+def scratch_dir():
+    """Per-process scratch directory for engine output, on tmpfs when possible"""
+    global _scratch_dir
+    with _scratch_lock:
+        if _scratch_dir is None:
+            roots = [root for root in SCRATCH_ROOTS if os.access(root, os.W_OK)]
+            _scratch_dir = tempfile.mkdtemp(prefix='echoverse-', dir=roots[0] if roots else None)
+            atexit.register(shutil.rmtree, _scratch_dir, True)
+        return _scratch_dir
+
+
+def _scratch_path(suffix):
+    """Reusable per-thread scratch file path; each thread renders one file at a time"""
+    return os.path.join(scratch_dir(), '%d-%d%s' % (os.getpid(), threading.get_ident(), suffix))
+
+
+def render_pyttsx3(engine, text):
+    """Render text with an already configured pyttsx3 engine and return WAV bytes"""
+    return render_pyttsx3_batch(engine, [text])[0]
+
+
+def render_pyttsx3_batch(engine, texts):
+    """Render several texts in one run of the engine's event loop and return their WAV bytes"""
+    paths = [_scratch_path('-%d.wav' % index) for index in range(len(texts))]
+    try:
+        with span("render", engine="pyttsx3"):
+            for text, path in zip(texts, paths):
+                engine.save_to_file(text, path)
+            engine.runAndWait()
+        audio = []
+        with span("read"):
+            for path in paths:
+                with open(path, 'rb') as audio_file:
+                    audio.append(audio_file.read())
+        return audio
+    finally:
+        for path in paths:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def gtts_lang(voice_config):
+    """Map a voice profile accent to a gTTS language code"""
+    return 'en-uk' if voice_config['accent'] == 'British' else 'en-us'
+
+
+def render_gtts(text, voice_config):
+    """Render text with Google Text-to-Speech and return MP3 bytes"""
+    from gtts import gTTS
+
+    with span("render", engine="gtts"):
+        tts = gTTS(text=text, lang=gtts_lang(voice_config), slow=False)
+        buffer = BytesIO()
+        tts.write_to_fp(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,295 @@
+"""Streaming ingestion of uploaded manuscripts.
+
+Every reader takes a binary file object and yields normalized paragraphs
+(runs of whitespace collapsed to single spaces; plain text and Markdown keep
+the line breaks inside a paragraph) while reading it in fixed size blocks, so a large upload is never held as raw bytes and decoded text
+at the same time. The paragraphs can go straight into chunking.iter_chunks
+or be joined once for display; a paragraph after a long run of blank lines
+is a SectionStart so section breaks survive normalization.
+
+Plain text encodings are detected from a prefix sample: a byte order mark,
+then strict UTF-8, then charset_normalizer when it is installed, and finally
+cp1252, which decodes any byte sequence. Markdown is reduced to its prose;
+DOCX and EPUB text is extracted with zipfile and incremental XML/HTML
+parsing, without third-party parsers.
+"""
+import codecs
+import os
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+READ_BLOCK = 64 * 1024
+SAMPLE_BYTES = 64 * 1024
+FALLBACK_ENCODING = "cp1252"
+CHAOS_TOLERANCE = 0.02
+SECTION_BREAK_LINES = 3
+SUPPORTED_EXTENSIONS = (".txt", ".md", ".markdown", ".docx", ".epub")
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(sample):
+    """Best guess at the text encoding of a prefix of a file"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # Not final: the sample may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return FALLBACK_ENCODING
+    matches = list(from_bytes(sample))
+    if not matches:
+        return FALLBACK_ENCODING
+    # Single-byte Western encodings often decode a sample equally well; among
+    # near-ties prefer cp1252, by far the most common for English manuscripts
+    best = matches[0]
+    for match in matches:
+        if match.chaos <= best.chaos + CHAOS_TOLERANCE and FALLBACK_ENCODING in match.could_be_from_charset:
+            return FALLBACK_ENCODING
+    return best.encoding
+
+
+def iter_decoded(stream, encoding=None):
+    """Yield decoded text blocks from a binary stream, detecting the encoding from the first block"""
+    block = stream.read(SAMPLE_BYTES)
+    encoding = encoding or detect_encoding(block)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while block:
+        text = decoder.decode(block)
+        if text:
+            yield text
+        block = stream.read(READ_BLOCK)
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def iter_lines(blocks):
+    """Re-split decoded text blocks into lines without joining the blocks"""
+    pending = ""
+    for block in blocks:
+        lines = (pending + block).splitlines(keepends=True)
+        # An unterminated last line, or a \r that may be half of \r\n, waits for the next block
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        for line in lines:
+            yield line.rstrip("\r\n")
+    if pending:
+        yield pending.rstrip("\r\n")
+
+
+class SectionStart(str):
+    """A paragraph that follows a run of blank lines long enough to mark a section break"""
+
+    __slots__ = ()
+
+
+def _paragraph(lines, blank_run):
+    text = "\n".join(lines)
+    return SectionStart(text) if blank_run >= SECTION_BREAK_LINES else text
+
+
+def _paragraphs_from_lines(lines):
+    """Group lines into paragraphs at blank lines, collapsing whitespace within each line"""
+    kept = []
+    blank_run = 0
+    preceding_blanks = 0
+    for line in lines:
+        # Line breaks stay: dialogue speaker tags and verse depend on them
+        parts = line.split()
+        if parts:
+            if not kept:
+                preceding_blanks = blank_run
+            kept.append(" ".join(parts))
+            blank_run = 0
+        else:
+            if kept:
+                yield _paragraph(kept, preceding_blanks)
+                kept = []
+            blank_run += 1
+    if kept:
+        yield _paragraph(kept, preceding_blanks)
+
+
+def iter_text_paragraphs(stream, encoding=None):
+    """Paragraphs of a plain text file"""
+    return _paragraphs_from_lines(iter_lines(iter_decoded(stream, encoding)))
+
+
+_MD_HEADING = re.compile(r'^\s{0,3}#{1,6}\s+(.*?)\s*#*\s*$')
+_MD_FENCE = re.compile(r'^\s{0,3}(```|~~~)')
+_MD_QUOTE = re.compile(r'^\s{0,3}(?:>\s?)+')
+_MD_LIST_ITEM = re.compile(r'^\s*(?:[-*+]|\d+[.)])\s+')
+_MD_RULE = re.compile(r'^\s{0,3}([-*_])(\s*\1){2,}\s*$')
+_MD_INLINE = (
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), ''),
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'<[^>]+>'), ''),
+    (re.compile(r'(\*\*|__|\*|_|`|~~)(?=\S)(.+?)(?<=\S)\1'), r'\2'),
+)
+
+
+def _markdown_prose(lines):
+    """Strip Markdown syntax line by line; empty lines separate paragraphs"""
+    in_fence = False
+    for line in lines:
+        if _MD_FENCE.match(line):
+            in_fence = not in_fence
+            yield ""
+            continue
+        if in_fence or _MD_RULE.match(line):
+            yield ""
+            continue
+        heading = _MD_HEADING.match(line)
+        if heading:
+            # Headings stand alone so chapter detection sees them as headings
+            yield ""
+            line = heading.group(1)
+        else:
+            line = _MD_QUOTE.sub("", line, count=1)
+            item = _MD_LIST_ITEM.match(line)
+            if item:
+                # Each list item is read as its own paragraph
+                yield ""
+                line = line[item.end():]
+        for pattern, replacement in _MD_INLINE:
+            line = pattern.sub(replacement, line)
+        yield line
+        if heading:
+            yield ""
+
+
+def iter_markdown_paragraphs(stream, encoding=None):
+    """Paragraphs of a Markdown file reduced to readable prose; code blocks are skipped"""
+    return _paragraphs_from_lines(_markdown_prose(iter_lines(iter_decoded(stream, encoding))))
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def iter_docx_paragraphs(stream):
+    """Paragraphs of a Word document, parsed incrementally from word/document.xml"""
+    with zipfile.ZipFile(stream) as archive, archive.open("word/document.xml") as document:
+        parts = []
+        for event, element in ET.iterparse(document, events=("start", "end")):
+            if event == "start":
+                continue
+            if element.tag == f"{_W}t" and element.text:
+                parts.append(element.text)
+            elif element.tag in (f"{_W}tab", f"{_W}br"):
+                parts.append(" ")
+            elif element.tag == f"{_W}p":
+                paragraph = " ".join("".join(parts).split())
+                parts = []
+                element.clear()
+                if paragraph:
+                    yield paragraph
+
+
+_BLOCK_TAGS = {"p", "div", "br", "li", "blockquote", "section", "article", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+_SKIP_TAGS = {"script", "style", "head", "title"}
+
+
+class _HTMLParagraphs(HTMLParser):
+    """Collects paragraphs from XHTML fed in blocks; block-level tags end a paragraph"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self._words = []
+        self._skip = 0
+
+    def _flush(self):
+        if self._words:
+            self.paragraphs.append(" ".join(self._words))
+            self._words = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._words.extend(data.split())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _epub_spine(archive):
+    """Content document paths of an EPUB in reading order"""
+    container = ET.fromstring(archive.read("META-INF/container.xml"))
+    rootfile = next(element for element in container.iter() if element.tag.endswith("rootfile"))
+    opf_path = rootfile.get("full-path")
+    package = ET.fromstring(archive.read(opf_path))
+    base = posixpath.dirname(opf_path)
+    items = {element.get("id"): element.get("href")
+             for element in package.iter() if element.tag.endswith("}item")}
+    return [posixpath.normpath(posixpath.join(base, unquote(items[element.get("idref")])))
+            for element in package.iter() if element.tag.endswith("}itemref") and element.get("idref") in items]
+
+
+def iter_epub_paragraphs(stream):
+    """Paragraphs of an EPUB, one spine document at a time"""
+    with zipfile.ZipFile(stream) as archive:
+        for path in _epub_spine(archive):
+            parser = _HTMLParagraphs()
+            with archive.open(path) as document:
+                for text in iter_decoded(document, "utf-8"):
+                    parser.feed(text)
+                    yield from parser.paragraphs
+                    parser.paragraphs = []
+            parser.close()
+            yield from parser.paragraphs
+
+
+def iter_paragraphs(name, stream, encoding=None):
+    """Stream the paragraphs of a document, choosing the reader by file extension"""
+    extension = os.path.splitext(name)[1].lower()
+    if extension in (".md", ".markdown"):
+        return iter_markdown_paragraphs(stream, encoding)
+    if extension == ".docx":
+        return iter_docx_paragraphs(stream)
+    if extension == ".epub":
+        return iter_epub_paragraphs(stream)
+    if extension in (".txt", ""):
+        return iter_text_paragraphs(stream, encoding)
+    raise ValueError(f"Unsupported file type: {extension} (expected one of {', '.join(SUPPORTED_EXTENSIONS)})")
+
+
+def read_document(name, stream, encoding=None):
+    """The whole document as paragraphs separated by blank lines, built in one join.
+
+    Section breaks are kept as a longer run of blank lines so chapter
+    detection still sees them.
+    """
+    parts = []
+    for paragraph in iter_paragraphs(name, stream, encoding):
+        if parts:
+            parts.append("\n\n\n\n" if isinstance(paragraph, SectionStart) else "\n\n")
+        parts.append(paragraph)
+    return "".join(parts)
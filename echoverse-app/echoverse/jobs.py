@@ -0,0 +1,118 @@
+"""SQLite-backed job queue shared by the job service and its workers"""
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+
+class JobStore:
+    """Persistent job records; every call uses its own short-lived connection"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _row_to_job(self, row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def create(self, kind, params):
+        """Insert a queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(params), QUEUED, time.time()),
+            )
+        return job_id
+
+    def get(self, job_id):
+        with closing(self._connect()) as conn:
+            return self._row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def count(self, status):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def claim(self):
+        """Atomically move the oldest queued job to running and return it"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, time.time(), row["id"])
+            )
+        job = self._row_to_job(row)
+        job["status"] = RUNNING
+        return job
+
+    def update_progress(self, job_id, completed, total):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE jobs SET completed = ?, total = ? WHERE id = ?", (completed, total, job_id))
+
+    def _finish(self, job_id, status, error=None, result=None):
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ?, result = ? WHERE id = ? AND status IN (?, ?)",
+                (status, time.time(), error, json.dumps(result) if result is not None else None,
+                 job_id, QUEUED, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, result):
+        return self._finish(job_id, DONE, result=result)
+
+    def fail(self, job_id, error):
+        return self._finish(job_id, FAILED, error=error)
+
+    def cancel(self, job_id):
+        """Mark an unfinished job cancelled; False if it already finished"""
+        return self._finish(job_id, CANCELLED)
+
+    def requeue_running(self):
+        """Return jobs left running by a crashed service to the queue"""
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+            ).rowcount
@@ -0,0 +1,127 @@
+"""Tone-adaptive text rewriting"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .chunking import DEFAULT_MAX_CHARS, chunk_text
+from .llm_backends import DEFAULT_MODEL_ID, RewriteRequest, SimulatedBackend, WatsonxHTTPBackend, call_with_retry
+from .metrics import increment, span
+from .progress import report_progress
+from .rewrite_cache import get_rewrite_cache, rewrite_key
+
+DEFAULT_CONCURRENCY = 4
+
+TONE_PROMPTS = {
+    "Neutral": "Rewrite the following text in a clear, balanced, and informative tone. Maintain all factual information while making it easy to understand:",
+    "Suspenseful": "Rewrite the following text to create tension, mystery, and intrigue. Use dramatic language and pacing while preserving the original meaning:",
+    "Inspiring": "Rewrite the following text in an uplifting, motivational tone that energizes and encourages the reader. Maintain the core message while making it inspiring:"
+}
+
+
+class WatsonxLLM:
+    """Tone-adaptive rewriting that dispatches chunk prompts to an LLM backend"""
+    
+    def __init__(self, backend, concurrency=DEFAULT_CONCURRENCY, max_retries=4, max_chars=DEFAULT_MAX_CHARS, cache=None):
+        self.tone_prompts = dict(TONE_PROMPTS)
+        self.backend = backend
+        self.concurrency = concurrency  # Maximum requests in flight per rewrite
+        self.max_retries = max_retries
+        self.max_chars = max_chars  # Chunks stay well inside the model context window
+        self.cache = cache if cache is not None else get_rewrite_cache()
+    
+    def build_prompt(self, tone, chunk):
+        """Prompt for a single chunk: the tone instruction followed by the text"""
+        return f"{self.tone_prompts[tone]}\n\n{chunk}"
+    
+    def _cache_key(self, tone, chunk):
+        return rewrite_key(chunk, tone, f"{self.backend.cache_namespace}\0{self.tone_prompts[tone]}")
+    
+    def cached_rewrite(self, original_text, tone):
+        """Return the rewrite if every chunk is already cached, else None; never calls the backend"""
+        if tone not in self.tone_prompts:
+            return original_text
+        rewritten = []
+        for chunk in chunk_text(original_text, self.max_chars):
+            value = self.cache.get(self._cache_key(tone, chunk), record=False)
+            if value is None:
+                return None
+            rewritten.append(value)
+        return '\n\n'.join(rewritten)
+    
+    def _generate(self, request):
+        with span("llm_request"):
+            return call_with_retry(self.backend.generate, request, max_retries=self.max_retries)
+    
+    def rewrite_text(self, original_text, tone, progress=None):
+        """Rewrite text chunk by chunk, dispatching chunks concurrently and keeping their order"""
+        if tone not in self.tone_prompts:
+            return original_text
+        
+        with span("rewrite", tone=tone):
+            rewritten = self._rewrite_chunks(original_text, tone, progress)
+        increment("chars_in", len(original_text), stage="rewrite")
+        return rewritten
+    
+    def _rewrite_chunks(self, original_text, tone, progress):
+        chunks = chunk_text(original_text, self.max_chars)
+        rewritten = [None] * len(chunks)
+        keys = [self._cache_key(tone, chunk) for chunk in chunks]
+        
+        # Only chunks that changed since they were last rewritten reach the backend
+        pending = []
+        for index, chunk in enumerate(chunks):
+            rewritten[index] = self.cache.get(keys[index])
+            if rewritten[index] is None:
+                pending.append((index, RewriteRequest(tone, chunk, self.build_prompt(tone, chunk))))
+        completed = len(chunks) - len(pending)
+        if completed:
+            report_progress(progress, "rewrite", completed, len(chunks))
+        
+        def finish(index, text):
+            rewritten[index] = text
+            self.cache.put(keys[index], text)
+        
+        if self.concurrency <= 1 or len(pending) <= 1:
+            for index, request in pending:
+                finish(index, self._generate(request))
+                completed += 1
+                report_progress(progress, "rewrite", completed, len(chunks))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending))) as executor:
+                futures = {executor.submit(self._generate, request): index for index, request in pending}
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+                    completed += 1
+                    report_progress(progress, "rewrite", completed, len(chunks))
+        return '\n\n'.join(rewritten)
+    
+    def close(self):
+        self.backend.close()
+
+
+# Simulated IBM Watson services (replace with actual IBM Watson API calls)
+class SimulatedWatsonxLLM(WatsonxLLM):
+    """Simulates IBM Watsonx Granite LLM for tone-adaptive text rewriting"""
+    
+    def __init__(self, simulated_latency=None, concurrency=DEFAULT_CONCURRENCY):
+        # Seconds of artificial API latency per chunk request, for demos only (off by default)
+        if simulated_latency is None:
+            simulated_latency = float(os.environ.get("ECHOVERSE_SIMULATED_LATENCY", "0"))
+        self.simulated_latency = simulated_latency
+        super().__init__(SimulatedBackend(simulated_latency), concurrency=concurrency)
+
+
+def create_llm():
+    """Build the configured LLM: a real watsonx endpoint if ECHOVERSE_LLM_URL is set, else the simulator"""
+    url = os.environ.get("ECHOVERSE_LLM_URL")
+    concurrency = int(os.environ.get("ECHOVERSE_LLM_CONCURRENCY", DEFAULT_CONCURRENCY))
+    if not url:
+        return SimulatedWatsonxLLM(concurrency=concurrency)
+    
+    backend = WatsonxHTTPBackend(
+        url,
+        token=os.environ.get("ECHOVERSE_LLM_TOKEN"),
+        model_id=os.environ.get("ECHOVERSE_LLM_MODEL", DEFAULT_MODEL_ID),
+        project_id=os.environ.get("ECHOVERSE_LLM_PROJECT_ID"),
+        pool_size=concurrency
+    )
+    return WatsonxLLM(backend, concurrency=concurrency)
@@ -0,0 +1,111 @@
+"""Pluggable LLM backends that rewrite one chunk per request.
+
+A backend receives a RewriteRequest (tone, chunk text and the full prompt
+built from the tone prompt) and returns the rewritten chunk. Backends raise
+TransientLLMError for failures worth retrying; the dispatcher in
+echoverse.llm retries those with jittered exponential backoff.
+"""
+import random
+import time
+from collections import namedtuple
+
+from .rewrite import ToneRewriter
+
+RewriteRequest = namedtuple("RewriteRequest", ["tone", "text", "prompt"])
+
+DEFAULT_MODEL_ID = "ibm/granite-13b-instruct-v2"
+RETRYABLE_STATUS = frozenset((408, 425, 429, 500, 502, 503, 504))
+
+
+class LLMError(RuntimeError):
+    """A rewrite request failed permanently"""
+
+
+class TransientLLMError(LLMError):
+    """A rewrite request failed in a way that may succeed on retry"""
+
+
+class LLMBackend:
+    """Base class for chunk rewriting backends"""
+
+    # Identifies the model behind the backend in rewrite cache keys
+    cache_namespace = "llm"
+
+    def generate(self, request):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SimulatedBackend(LLMBackend):
+    """Local rule-based stand-in for the Granite model"""
+
+    cache_namespace = "simulated"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency  # Seconds of artificial latency per request, for demos
+        self.rewriter = ToneRewriter()
+
+    def generate(self, request):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.rewriter.rewrite(request.text, request.tone)
+
+
+class WatsonxHTTPBackend(LLMBackend):
+    """watsonx.ai text generation over a pooled HTTP session"""
+
+    def __init__(self, url, token=None, model_id=DEFAULT_MODEL_ID, project_id=None,
+                 pool_size=16, timeout=60, max_new_tokens=1024):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = url
+        self.model_id = model_id
+        self.project_id = project_id
+        self.timeout = timeout
+        self.max_new_tokens = max_new_tokens
+        self._requests = requests
+        self.session = requests.Session()
+        # One keep-alive connection per concurrent request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self.cache_namespace = f"{url}|{model_id}"
+
+    def generate(self, request):
+        payload = {
+            "model_id": self.model_id,
+            "input": request.prompt,
+            "parameters": {"decoding_method": "greedy", "max_new_tokens": self.max_new_tokens},
+        }
+        if self.project_id:
+            payload["project_id"] = self.project_id
+
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        except (self._requests.ConnectionError, self._requests.Timeout) as e:
+            raise TransientLLMError(str(e)) from e
+
+        if response.status_code in RETRYABLE_STATUS:
+            raise TransientLLMError(f"LLM endpoint returned {response.status_code}")
+        if response.status_code != 200:
+            raise LLMError(f"LLM endpoint returned {response.status_code}: {response.text[:200]}")
+        return response.json()["results"][0]["generated_text"].strip()
+
+    def close(self):
+        self.session.close()
+
+
+def call_with_retry(func, request, max_retries=4, base_delay=0.25, max_delay=8.0):
+    """Call func(request), retrying TransientLLMError with full-jitter backoff"""
+    for attempt in range(max_retries + 1):
+        try:
+            return func(request)
+        except TransientLLMError:
+            if attempt == max_retries:
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
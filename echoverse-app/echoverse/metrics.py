@@ -0,0 +1,262 @@
+"""Runtime instrumentation: stage spans, counters and their exports.
+
+span() times one stage of the work (rewrite, queue wait, engine init,
+synthesis, file read, encoding...) into a latency histogram and increment()
+bumps a counter (characters in, audio seconds out, cache hits). The shared
+registry renders the Prometheus text format, served at /metrics by
+get_metrics_server() and by the job service, and every span can also be written as
+a JSON log line. Work done inside process-pool workers is not recorded:
+those processes keep their own registry, which nothing exports.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+RECENT_SAMPLES = 256
+PREFIX = "echoverse_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger("echoverse.metrics")
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count", "recent")
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+
+class Metrics:
+    """Thread-safe registry of counters and per-stage latency histograms"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._stages = {}
+
+    def increment(self, name, value=1, **labels):
+        """Add value to the counter name{labels}"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, stage, seconds, **labels):
+        """Record one duration of a stage"""
+        key = (stage, _label_key(labels))
+        with self._lock:
+            histogram = self._stages.get(key)
+            if histogram is None:
+                histogram = self._stages[key] = _Histogram(self.buckets)
+            index = 0
+            while index < len(self.buckets) and seconds > self.buckets[index]:
+                index += 1
+            histogram.counts[index] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+            histogram.recent.append(seconds)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("span", extra={"event": "span", "stage": stage, "seconds": round(seconds, 6),
+                                       "labels": dict(key[1])})
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Time the enclosed block as one occurrence of stage; failures are also counted"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.increment("stage_errors", stage=stage, error=type(e).__name__)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def stage_summary(self):
+        """Count, mean, p50, p95 and last duration of each stage, from the recent samples"""
+        with self._lock:
+            items = [(stage, labels, histogram.count, histogram.sum, list(histogram.recent))
+                     for (stage, labels), histogram in self._stages.items()]
+        rows = []
+        for stage, labels, count, total, recent in sorted(items):
+            ordered = sorted(recent)
+            rows.append({
+                "stage": stage,
+                "labels": ", ".join(f"{name}={value}" for name, value in labels),
+                "count": count,
+                "mean": total / count,
+                "p50": _percentile(ordered, 0.5),
+                "p95": _percentile(ordered, 0.95),
+                "last": recent[-1],
+            })
+        return rows
+
+    def counters(self):
+        """Counter values keyed by (name, ((label, value), ...))"""
+        with self._lock:
+            return dict(self._counters)
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            stages = sorted((key, list(histogram.counts), histogram.sum, histogram.count)
+                            for key, histogram in self._stages.items())
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{PREFIX}{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+        metric = f"{PREFIX}stage_duration_seconds"
+        if stages:
+            lines.append(f"# HELP {metric} Time spent in each stage of rewriting and synthesis")
+            lines.append(f"# TYPE {metric} histogram")
+        for (stage, labels), counts, total, count in stages:
+            pairs = (("stage", stage),) + labels
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{_format_labels(pairs + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(pairs)} {total}")
+            lines.append(f"{metric}_count{_format_labels(pairs)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per log record, including span fields passed as extra"""
+
+    FIELDS = ("event", "stage", "seconds", "labels")
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+_logging_lock = threading.Lock()
+_logging_configured = False
+
+
+def configure_logging():
+    """Write echoverse logs as JSON lines to stderr when ECHOVERSE_LOG_FORMAT=json"""
+    global _logging_configured
+    if os.environ.get("ECHOVERSE_LOG_FORMAT", "").lower() != "json":
+        return
+    with _logging_lock:
+        if _logging_configured:
+            return
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        package_logger = logging.getLogger("echoverse")
+        package_logger.addHandler(handler)
+        package_logger.setLevel(os.environ.get("ECHOVERSE_LOG_LEVEL", "INFO").upper())
+        package_logger.propagate = False
+        _logging_configured = True
+
+
+def _serve_metrics(metrics, address):
+    """Start a thread serving metrics at /metrics for Prometheus to scrape and return its server"""
+    # Imported here: http.server is a noticeable share of startup time and most processes never serve
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(address, MetricsHandler)
+    server.daemon_threads = True
+    host, port = server.server_address[:2]
+    server.url = f"http://{'localhost' if host in ('0.0.0.0', '127.0.0.1') else host}:{port}/metrics"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+_shared_metrics = Metrics()
+_shared_server = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics():
+    """Process-wide metrics registry"""
+    return _shared_metrics
+
+
+def span(stage, **labels):
+    """Time a block as a stage in the shared registry"""
+    return _shared_metrics.span(stage, **labels)
+
+
+def increment(name, value=1, **labels):
+    """Bump a counter in the shared registry"""
+    _shared_metrics.increment(name, value, **labels)
+
+
+def get_metrics_server():
+    """Process-wide /metrics endpoint, or None unless ECHOVERSE_METRICS_PORT is set.
+
+    ECHOVERSE_METRICS_HOST chooses the bind address (default 127.0.0.1).
+    """
+    global _shared_server
+    port = os.environ.get("ECHOVERSE_METRICS_PORT")
+    if not port:
+        return None
+    with _shared_lock:
+        if _shared_server is None:
+            address = (os.environ.get("ECHOVERSE_METRICS_HOST", "127.0.0.1"), int(port))
+            _shared_server = _serve_metrics(_shared_metrics, address)
+        return _shared_server
@@ -0,0 +1,111 @@
+"""Local HTTP stand-in for the watsonx text generation endpoint.
+
+Accepts the same request shape as WatsonxHTTPBackend sends, rewrites the
+text with the rule-based ToneRewriter and can inject latency and transient
+503 failures, so dispatch throughput and tail latency can be measured
+offline:
+
+    python -m echoverse.mock_llm_server --port 8766 --latency 0.05 --failure-rate 0.05
+    ECHOVERSE_LLM_URL=http://127.0.0.1:8766/ml/v1/text/generation streamlit run echoverse_app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .llm import TONE_PROMPTS
+from .rewrite import ToneRewriter
+
+GENERATION_PATH = "/ml/v1/text/generation"
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """Threaded HTTP server with configurable latency and failure injection"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, latency=0.0, jitter=0.0, failure_rate=0.0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rewriter = ToneRewriter()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{GENERATION_PATH}"
+
+    def generate(self, prompt):
+        """Recover tone and text from a prompt and rewrite it"""
+        for tone, instruction in TONE_PROMPTS.items():
+            if prompt.startswith(instruction):
+                return self.rewriter.rewrite(prompt[len(instruction):].strip(), tone)
+        return prompt
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        if self.path != GENERATION_PATH:
+            self._send(404, {"error": "Not found"})
+            return
+
+        server = self.server
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < server.failure_rate:
+            self._send(503, {"error": "Injected transient failure"})
+            return
+
+        text = server.generate(request.get("input", ""))
+        self._send(200, {"model_id": request.get("model_id"), "results": [
+            {"generated_text": text, "stop_reason": "eos_token"}
+        ]})
+
+
+def start_mock_server(host="127.0.0.1", port=0, **kwargs):
+    """Start a MockLLMServer on a background thread and return it"""
+    server = MockLLMServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m echoverse.mock_llm_server", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.05, help="mean seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.02, help="uniform +/- seconds around the mean")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                           failure_rate=args.failure_rate)
+    print(f"Mock LLM endpoint at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
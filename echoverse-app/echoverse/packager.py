@@ -0,0 +1,186 @@
+"""Chapter-aware audiobook packaging.
+
+ChapterPackager rewrites and synthesizes each detected chapter on its own,
+several at a time, into a working directory with one audio file per chapter
+and a manifest.json of chapter hashes. On a re-run, chapters whose text and
+settings hash is unchanged reuse their existing file. The bundle is a ZIP of
+the chapter files plus an index (index.json, chapters.txt and an FFMETADATA
+file for building an M4B with ffmpeg) whose timestamps come from the
+measured duration of each chapter's audio.
+"""
+import hashlib
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from .audio import audio_duration
+from .cache import normalize_text
+from .chapters import detect_chapters
+from .progress import report_progress
+
+MANIFEST_NAME = "manifest.json"
+
+
+def chapter_key(chapter, tone, voice_config, audio_format, bitrate):
+    """Hash of everything that influences a chapter's audio"""
+    payload = json.dumps({
+        "title": chapter.title,
+        "text": normalize_text(chapter.text),
+        "tone": tone,
+        "voice": voice_config,
+        "format": audio_format,
+        "bitrate": bitrate,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _slug(title):
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')[:40] or "chapter"
+
+
+def format_timestamp(seconds):
+    """HH:MM:SS.mmm"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    return f"{hours:02d}:{minutes:02d}:{millis // 1000:02d}.{millis % 1000:03d}"
+
+
+def _ffmetadata(title, entries):
+    lines = [";FFMETADATA1", f"title={title}"]
+    for entry in entries:
+        lines += ["[CHAPTER]", "TIMEBASE=1/1000", f"START={int(entry['start'] * 1000)}",
+                  f"END={int(entry['end'] * 1000)}", f"title={entry['title']}"]
+    return "\n".join(lines) + "\n"
+
+
+class ChapterPackager:
+    """Synthesizes chapters in parallel into a directory and bundles them as a ZIP"""
+
+    def __init__(self, llm, tts, directory, tone="Neutral", voice="Lisa", audio_format=None, bitrate=None, jobs=2):
+        self.llm = llm
+        self.tts = tts
+        self.directory = directory
+        self.tone = tone
+        self.voice = voice
+        self.audio_format = audio_format or tts.native_format()
+        self.bitrate = bitrate
+        self.jobs = jobs
+        os.makedirs(directory, exist_ok=True)
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST_NAME), encoding="utf-8") as handle:
+                chapters = json.load(handle).get("chapters", [])
+        except (OSError, ValueError):
+            return {}
+        return {entry["sha256"]: entry for entry in chapters
+                if os.path.isfile(os.path.join(self.directory, entry["file"]))}
+
+    def _render(self, chapter, key):
+        """Rewrite and synthesize one chapter, returning its manifest entry"""
+        body = self.llm.rewrite_text(chapter.text, self.tone) if chapter.text else ""
+        # The heading is narrated as-is so tone rewriting cannot mangle it
+        spoken = f"{chapter.title}.\n\n{body}" if body else f"{chapter.title}."
+        audio = self.tts.synthesize(spoken, self.voice, audio_format=self.audio_format, bitrate=self.bitrate)
+        filename = f"{key[:12]}-{_slug(chapter.title)}.{audio['format']}"
+        temp_path = os.path.join(self.directory, f"{filename}.tmp")
+        with open(temp_path, 'wb') as handle:
+            handle.write(audio["data"])
+        os.replace(temp_path, os.path.join(self.directory, filename))
+        return {
+            "sha256": key,
+            "file": filename,
+            "format": audio["format"],
+            "size": audio["size"],
+            "duration": audio_duration(audio["data"], audio["format"]),
+        }
+
+    def synthesize(self, chapters, progress=None):
+        """Render changed chapters in parallel and return (entries, skipped count)"""
+        voice_config = self.tts.voices[self.voice]
+        previous = self._load_manifest()
+        keys = [chapter_key(chapter, self.tone, voice_config, self.audio_format, self.bitrate) for chapter in chapters]
+        entries = [previous.get(key) for key in keys]
+        skipped = sum(entry is not None for entry in entries)
+        report_progress(progress, "chapters", skipped, len(chapters))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {index: executor.submit(self._render, chapters[index], keys[index])
+                       for index, entry in enumerate(entries) if entry is None}
+            done = skipped
+            for index, future in futures.items():
+                entries[index] = future.result()
+                done += 1
+                report_progress(progress, "chapters", done, len(chapters))
+
+        # Identical chapters share a previous manifest entry, so each one gets its own copy
+        start = 0.0
+        for position, (chapter, entry) in enumerate(zip(chapters, entries)):
+            entries[position] = dict(entry, index=chapter.index, title=chapter.title, start=start,
+                                     end=start + entry["duration"])
+            start = entries[position]["end"]
+
+        self._write_manifest(entries, previous.values())
+        return entries, skipped
+
+    def _write_manifest(self, entries, previous=()):
+        """Record the current chapters and delete files of previous entries no chapter uses any more"""
+        manifest = {"tone": self.tone, "voice": self.voice, "format": self.audio_format,
+                    "bitrate": self.bitrate, "chapters": entries}
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(f"{path}.tmp", 'w', encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+        # Only files this packager wrote are removed; the directory may hold anything else
+        current = {entry["file"] for entry in entries}
+        for name in {entry["file"] for entry in previous} - current:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def bundle(self, entries, title, path):
+        """Write the chapter files and their index into a ZIP at path"""
+        index = {
+            "title": title,
+            "voice": self.voice,
+            "tone": self.tone,
+            "duration": entries[-1]["end"] if entries else 0.0,
+            "chapters": [
+                {
+                    "number": position + 1,
+                    "title": entry["title"],
+                    "file": f"{position + 1:03d}-{_slug(entry['title'])}.{entry['format']}",
+                    "start": round(entry["start"], 3),
+                    "duration": round(entry["duration"], 3),
+                }
+                for position, entry in enumerate(entries)
+            ],
+        }
+        chapters_txt = "".join(f"{format_timestamp(entry['start'])} {entry['title']}\n" for entry in entries)
+
+        temp_path = f"{path}.tmp"
+        with zipfile.ZipFile(temp_path, 'w') as bundle:
+            for entry, item in zip(entries, index["chapters"]):
+                # Audio is already compressed (or PCM that barely deflates); store it as-is
+                bundle.write(os.path.join(self.directory, entry["file"]), item["file"], zipfile.ZIP_STORED)
+            bundle.writestr("index.json", json.dumps(index, indent=2), zipfile.ZIP_DEFLATED)
+            bundle.writestr("chapters.txt", chapters_txt, zipfile.ZIP_DEFLATED)
+            bundle.writestr("chapters.ffmetadata", _ffmetadata(title, entries), zipfile.ZIP_DEFLATED)
+        os.replace(temp_path, path)
+        return index
+
+    def package(self, text, title="EchoVerse Audiobook", path=None, progress=None):
+        """Detect chapters, synthesize the changed ones and write the ZIP bundle"""
+        chapters = detect_chapters(text)
+        if not chapters:
+            raise ValueError("Nothing to package")
+        entries, skipped = self.synthesize(chapters, progress)
+        path = path or os.path.join(self.directory, f"{_slug(title)}.zip")
+        index = self.bundle(entries, title, path)
+        return {"path": path, "index": index, "chapters": len(entries), "skipped": skipped,
+                "size": os.path.getsize(path), "duration": index["duration"]}
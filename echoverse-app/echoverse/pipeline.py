@@ -0,0 +1,249 @@
+"""Chunked, parallel synthesis pipeline for book-length texts"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from .audio import merge_mp3, merge_wav, wav_duration
+from .cache import cache_key
+from .chunking import DEFAULT_MAX_CHARS, chunk_text
+from .engine_pool import Pyttsx3EnginePool, get_engine_pool, profile_key
+from .engines import render_gtts, render_pyttsx3, render_pyttsx3_batch
+from .progress import report_progress
+
+ENGINE_FORMATS = {"pyttsx3": "wav", "gtts": "mp3"}
+# Cache keys looked up per index transaction while a stream is being submitted
+LOOKUP_BATCH = 32
+
+# Each pool worker process owns exactly one pyttsx3 driver; drivers are not
+# thread-safe and must never be shared between workers.
+_worker_pool = None
+
+
+def _init_pyttsx3_worker():
+    """Process pool initializer: create this worker's private warm engine pool"""
+    global _worker_pool
+    _worker_pool = Pyttsx3EnginePool(max_engines=1)
+
+
+def _synthesize_pyttsx3_chunk(text, voice_config):
+    """Render one chunk inside a pool worker"""
+    if _worker_pool is None:
+        _init_pyttsx3_worker()
+    with _worker_pool.engine(voice_config) as engine:
+        return render_pyttsx3(engine, text)
+
+
+def _synthesize_gtts_chunk(text, voice_config):
+    """Render one chunk with gTTS (network bound, safe to run in threads)"""
+    return render_gtts(text, voice_config)
+
+
+def _synthesize_pyttsx3_batch(texts, voice_config):
+    """Render texts of one voice inside a pool worker, in a single run of its driver"""
+    if _worker_pool is None:
+        _init_pyttsx3_worker()
+    with _worker_pool.engine(voice_config) as engine:
+        return render_pyttsx3_batch(engine, texts)
+
+
+def _synthesize_gtts_batch(texts, voice_config):
+    """Render texts of one voice with gTTS, one request each"""
+    return [render_gtts(text, voice_config) for text in texts]
+
+
+def _render_batch_inline(engine, texts, voice_config):
+    """Render a batch in the calling thread with the process-wide driver pool"""
+    if engine == "pyttsx3":
+        with get_engine_pool().engine(voice_config) as driver:
+            return render_pyttsx3_batch(driver, texts)
+    return _synthesize_gtts_batch(texts, voice_config)
+
+
+def default_workers():
+    """Number of workers to use when none is configured"""
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+class SynthesisPipeline:
+    """Splits text into bounded chunks and synthesizes them across a worker pool"""
+
+    def __init__(self, engine="pyttsx3", workers=None, max_chars=DEFAULT_MAX_CHARS, cache=None):
+        if engine not in ENGINE_FORMATS:
+            raise ValueError(f"Unsupported TTS engine: {engine}")
+        self.engine = engine
+        self.audio_format = ENGINE_FORMATS[engine]
+        self.workers = workers or default_workers()
+        self.max_chars = max_chars
+        self.cache = cache
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                if self.engine == "pyttsx3":
+                    # Imported here: multiprocessing is a noticeable share of startup time
+                    from concurrent.futures import ProcessPoolExecutor
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, initializer=_init_pyttsx3_worker
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def iter_segments(self, chunks, voice_config):
+        """Yield the audio of each chunk, in input order, as soon as it is ready.
+
+        Chunks are looked up in the cache LOOKUP_BATCH at a time, in order,
+        and each batch's misses are submitted before the next lookup, so the
+        first chunk starts rendering at once and the first segment is
+        available after roughly one chunk's render time regardless of how
+        long the document is. Cached chunks are not sent to the pool.
+        """
+        worker = _synthesize_pyttsx3_chunk if self.engine == "pyttsx3" else _synthesize_gtts_chunk
+        keys = [None] * len(chunks)
+        if self.cache is not None:
+            keys = [cache_key(chunk, voice_config, self.engine, self.audio_format) for chunk in chunks]
+        pending = []
+        yielded = 0
+
+        def take():
+            nonlocal yielded
+            item = pending[yielded]
+            if isinstance(item, Future):
+                item = item.result()
+                if self.cache is not None:
+                    self.cache.put(keys[yielded], item)
+            yielded += 1
+            return item
+
+        def ready():
+            return yielded < len(pending) and not (isinstance(pending[yielded], Future) and not pending[yielded].done())
+
+        try:
+            for start in range(0, len(chunks), LOOKUP_BATCH):
+                batch = chunks[start:start + LOOKUP_BATCH]
+                cached = [None] * len(batch)
+                if self.cache is not None:
+                    cached = self.cache.get_many(keys[start:start + len(batch)])
+                for chunk, data in zip(batch, cached):
+                    pending.append(self._get_executor().submit(worker, chunk, voice_config) if data is None else data)
+                # Hand over what is already done before the next lookup
+                while ready():
+                    yield take()
+            while yielded < len(pending):
+                yield take()
+        finally:
+            # Stop rendering chunks nobody will consume
+            for item in pending:
+                if isinstance(item, Future):
+                    item.cancel()
+
+    def synthesize_chunks(self, chunks, voice_config, progress=None):
+        """Synthesize chunks in parallel and return their audio in input order"""
+        segments = []
+        for data in self.iter_segments(chunks, voice_config):
+            segments.append(data)
+            report_progress(progress, "synthesize", len(segments), len(chunks))
+        return segments
+
+    def synthesize_voices(self, pieces, progress=None, inline=False):
+        """Synthesize (voice_config, text) pieces and return their audio in input order.
+
+        Uncached pieces are grouped by voice and packed into batches of about
+        max_chars, so a worker sets its driver up for a voice once and
+        renders the whole batch in one run; batches of every voice run in
+        parallel. inline renders the batches in this thread instead, which
+        saves the pool round trip for short texts.
+        """
+        keys = [cache_key(text, voice_config, self.engine, self.audio_format) for voice_config, text in pieces]
+        # Dialogue yields many short pieces; one index transaction per batch keeps the cache cheap
+        audio = self.cache.get_many(keys) if self.cache is not None else [None] * len(pieces)
+        groups = {}
+        for index, (voice_config, _) in enumerate(pieces):
+            if audio[index] is None:
+                groups.setdefault(profile_key(voice_config), []).append(index)
+
+        batches = []
+        for indexes in groups.values():
+            batch = []
+            size = 0
+            for index in indexes:
+                if batch and size + len(pieces[index][1]) > self.max_chars:
+                    batches.append(batch)
+                    batch, size = [], 0
+                batch.append(index)
+                size += len(pieces[index][1])
+            batches.append(batch)
+        # Batches holding the start of the document go first
+        batches.sort()
+
+        completed = len(pieces) - sum(len(batch) for batch in batches)
+        if completed:
+            report_progress(progress, "synthesize", completed, len(pieces))
+
+        def finish(batch, results):
+            nonlocal completed
+            for index, data in zip(batch, results):
+                audio[index] = data
+            if self.cache is not None:
+                self.cache.put_many([(keys[index], audio[index]) for index in batch])
+            completed += len(batch)
+            report_progress(progress, "synthesize", completed, len(pieces))
+
+        if inline:
+            for batch in batches:
+                finish(batch, _render_batch_inline(self.engine, [pieces[index][1] for index in batch],
+                                                   pieces[batch[0]][0]))
+            return audio
+
+        worker = _synthesize_pyttsx3_batch if self.engine == "pyttsx3" else _synthesize_gtts_batch
+        futures = {
+            self._get_executor().submit(worker, [pieces[index][1] for index in batch], pieces[batch[0]][0]): batch
+            for batch in batches
+        }
+        try:
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+        return audio
+
+    def merge(self, segments, text):
+        """Merge ordered segments into one result in the pipeline's format"""
+        if self.audio_format == "wav":
+            data = merge_wav(segments)
+            return {"format": "wav", "data": data, "duration": wav_duration(data), "chunks": len(segments)}
+
+        data = merge_mp3(segments)
+        # gTTS does not report duration; estimate from word count as before
+        return {"format": "mp3", "data": data, "duration": len(text.split()) * 0.6, "chunks": len(segments)}
+
+    def stream(self, text, voice_config):
+        """Yield (index, total, chunk_text, audio) tuples as chunks complete, in order"""
+        chunks = chunk_text(text, self.max_chars)
+        if not chunks:
+            raise ValueError("Nothing to synthesize")
+        for index, data in enumerate(self.iter_segments(chunks, voice_config)):
+            yield index, len(chunks), chunks[index], data
+
+    def synthesize(self, text, voice_config, progress=None):
+        """Synthesize a whole document and return the merged audio"""
+        chunks = chunk_text(text, self.max_chars)
+        if not chunks:
+            raise ValueError("Nothing to synthesize")
+        return self.merge(self.synthesize_chunks(chunks, voice_config, progress), text)
+
+    def close(self):
+        """Shut down the worker pool"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
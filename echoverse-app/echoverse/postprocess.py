@@ -0,0 +1,228 @@
+"""Sample-level post-processing of synthesized speech with NumPy.
+
+PostProcessor takes the PCM chunks of one stream in order. For each chunk it:
+
+- trims leading and trailing silence, found by frame energy;
+- brings the speech to a common level under a peak ceiling, so chunks
+  rendered separately match in loudness;
+- joins it to the previous chunk with a pause, or a crossfade when the pause
+  is zero;
+- resamples it to a target rate.
+
+Only the crossfade tail and the resampler's filter history carry over
+between chunks, so memory is bounded by the chunk size, not the length of
+the stream.
+"""
+import numpy as np
+
+from .audio import parse_wav, wav_header
+
+DEFAULT_TARGET_DBFS = -20.0  # RMS level of the voiced frames
+DEFAULT_PEAK_DBFS = -1.0
+DEFAULT_MAX_GAIN_DB = 20.0
+DEFAULT_SILENCE_DBFS = -45.0
+DEFAULT_KEEP = 0.03  # seconds of silence left at each trimmed edge
+DEFAULT_PAUSE = 0.3
+DEFAULT_CROSSFADE = 0.01
+FRAME_SECONDS = 0.01
+RESAMPLE_TAPS = 64
+
+_SCALES = {1: 128.0, 2: 32768.0, 4: 2147483648.0}
+_DTYPES = {1: np.uint8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+def to_float(pcm, sampwidth, nchannels):
+    """PCM bytes to float32 samples in [-1, 1), shaped (frames, channels)"""
+    if sampwidth not in _SCALES:
+        raise ValueError(f"Unsupported sample width: {sampwidth * 8} bits")
+    count = len(pcm) // (sampwidth * nchannels) * nchannels
+    samples = np.frombuffer(pcm, dtype=_DTYPES[sampwidth], count=count).astype(np.float32)
+    if sampwidth == 1:
+        samples -= 128.0  # 8-bit PCM is unsigned
+    samples /= _SCALES[sampwidth]
+    return samples.reshape(-1, nchannels)
+
+
+def to_pcm(samples, sampwidth):
+    """float32 samples to PCM bytes, clipped to the sample range"""
+    scale = _SCALES[sampwidth]
+    scaled = np.clip(np.rint(samples * scale), -scale, scale - 1)
+    if sampwidth == 1:
+        scaled += 128.0
+    return scaled.astype(_DTYPES[sampwidth]).tobytes()
+
+
+def frame_levels(samples, frame):
+    """Mean power in dBFS of each run of frame samples; the last run may be shorter"""
+    if not len(samples):
+        return np.zeros(0, np.float32)
+    power = np.square(samples).mean(axis=1)
+    starts = np.arange(0, len(power), frame)
+    counts = np.diff(np.append(starts, len(power)))
+    return 10 * np.log10(np.add.reduceat(power, starts) / counts + 1e-12)
+
+
+def lowpass_taps(cutoff, taps=RESAMPLE_TAPS):
+    """Hamming-windowed sinc low-pass filter; cutoff in cycles per sample"""
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return (h / h.sum()).astype(np.float32)
+
+
+def _ramp(start, stop, length):
+    return np.linspace(start, stop, length, dtype=np.float32)[:, None]
+
+
+class Resampler:
+    """Streaming rate conversion: a low-pass FIR when downsampling, then linear interpolation"""
+
+    def __init__(self, source_rate, target_rate, nchannels):
+        self.step = source_rate / target_rate
+        self.taps = lowpass_taps(0.45 * target_rate / source_rate) if target_rate < source_rate else None
+        history = 0 if self.taps is None else len(self.taps) - 1
+        self._history = np.zeros((history, nchannels), np.float32)
+        self.latency = history // 2  # frames of filter delay
+        self._delay = self.latency
+        self._buffer = np.zeros((0, nchannels), np.float32)
+        # Positions derive from whole frame counts, so the output does not depend on the block sizes
+        self._emitted = 0
+        self._consumed = 0
+
+    def _filter(self, samples):
+        if self.taps is None:
+            return samples
+        extended = np.concatenate([self._history, samples])
+        self._history = extended[len(extended) - len(self._history):]
+        filtered = np.empty((len(samples), samples.shape[1]), np.float32)
+        for channel in range(samples.shape[1]):
+            filtered[:, channel] = np.convolve(extended[:, channel], self.taps, mode='valid')
+        # Drop the filter's group delay once, at the start of the stream
+        skip = min(self._delay, len(filtered))
+        self._delay -= skip
+        return filtered[skip:]
+
+    def process(self, samples):
+        """Resample the next block of samples; output lags input by at most one frame"""
+        buffer = np.concatenate([self._buffer, self._filter(samples)])
+        end = self._consumed + len(buffer) - 1
+        count = max(0, int(np.ceil(end / self.step)) - self._emitted)
+        positions = (self._emitted + np.arange(count)) * self.step - self._consumed
+        index = np.clip(positions.astype(np.int64), 0, max(len(buffer) - 2, 0))
+        fraction = (positions - index).astype(np.float32)[:, None]
+        output = buffer[index] * (1 - fraction) + buffer[index + 1] * fraction
+
+        self._emitted += count
+        drop = min(max(int(self._emitted * self.step) - self._consumed, 0), len(buffer))
+        self._buffer = buffer[drop:]
+        self._consumed += drop
+        return output
+
+    def flush(self):
+        """Push the filter's delay line and the last frame through"""
+        return self.process(np.zeros((self.latency + 1, self._buffer.shape[1]), np.float32))
+
+
+class PostProcessor:
+    """Normalizes, trims, joins and resamples the PCM chunks of one stream"""
+
+    def __init__(self, params, target_rate=None, sampwidth=2, target_dbfs=DEFAULT_TARGET_DBFS,
+                 peak_dbfs=DEFAULT_PEAK_DBFS, max_gain_db=DEFAULT_MAX_GAIN_DB, silence_dbfs=DEFAULT_SILENCE_DBFS,
+                 trim=True, keep=DEFAULT_KEEP, pause=DEFAULT_PAUSE, crossfade=DEFAULT_CROSSFADE):
+        self.nchannels, self.source_width, self.framerate = params
+        self.target_rate = target_rate or self.framerate
+        self.sampwidth = sampwidth
+        self.target = 10 ** (target_dbfs / 20)
+        self.peak = 10 ** (peak_dbfs / 20)
+        self.max_gain = 10 ** (max_gain_db / 20)
+        self.silence_dbfs = silence_dbfs
+        self.trim = trim
+        self.keep = round(keep * self.framerate)
+        self.pause = pause
+        self.crossfade = round(crossfade * self.framerate)
+        self.frame = max(1, round(FRAME_SECONDS * self.framerate))
+        self._tail = None  # end of the previous chunk, held back for the join
+        self._resampler = None
+        if self.target_rate != self.framerate:
+            self._resampler = Resampler(self.framerate, self.target_rate, self.nchannels)
+
+    @property
+    def output_params(self):
+        """(nchannels, sampwidth, framerate) of the PCM this processor returns"""
+        return self.nchannels, self.sampwidth, self.target_rate
+
+    def process(self, pcm, pause=None):
+        """Take the next chunk's PCM bytes and return the output PCM that is ready.
+
+        pause overrides the silence, in seconds, inserted before this chunk.
+        """
+        samples = to_float(pcm, self.source_width, self.nchannels)
+        levels = frame_levels(samples, self.frame)
+        voiced = np.flatnonzero(levels > self.silence_dbfs)
+        if not len(voiced):
+            return b''
+        if self.trim:
+            start = max(0, voiced[0] * self.frame - self.keep)
+            end = min(len(samples), (voiced[-1] + 1) * self.frame + self.keep)
+            samples = samples[start:end]
+
+        # Speech level from the voiced frames only, so pauses do not drag it down
+        level = np.sqrt(np.mean(10 ** (levels[voiced] / 10)))
+        gain = min(self.target / level, self.max_gain, self.peak / max(float(np.abs(samples).max()), 1e-9))
+        samples *= gain
+        return self._output(self._join(samples, self.pause if pause is None else pause))
+
+    def _join(self, samples, pause):
+        parts = []
+        fade = min(self.crossfade, len(samples) // 2)
+        if self._tail is not None:
+            if pause > 0:
+                # Short fades keep the cut edges from clicking against the pause
+                self._tail *= _ramp(1, 0, len(self._tail))
+                samples[:fade] *= _ramp(0, 1, fade)
+                parts += [self._tail, np.zeros((round(pause * self.framerate), self.nchannels), np.float32)]
+            else:
+                overlap = min(len(self._tail), fade)
+                keep = len(self._tail) - overlap
+                parts.append(self._tail[:keep])
+                if overlap:
+                    blend = _ramp(0, 1, overlap)
+                    parts.append(self._tail[keep:] * (1 - blend) + samples[:overlap] * blend)
+                    samples = samples[overlap:]
+        hold = min(self.crossfade, len(samples))
+        parts.append(samples[:len(samples) - hold])
+        self._tail = samples[len(samples) - hold:]
+        return np.concatenate(parts)
+
+    def _output(self, samples, final=False):
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+            if final:
+                samples = np.concatenate([samples, self._resampler.flush()])
+        return to_pcm(samples, self.sampwidth)
+
+    def flush(self):
+        """Return the output PCM still held back at the end of the stream"""
+        tail = self._tail if self._tail is not None else np.zeros((0, self.nchannels), np.float32)
+        self._tail = None
+        return self._output(tail, final=True)
+
+
+def postprocess_wav(segments, pauses=None, **options):
+    """Post-process WAV byte strings of one stream, in order, into a single WAV file.
+
+    pauses, when given, holds the seconds of silence before each segment
+    (None keeps the processor's pause); options go to PostProcessor.
+    """
+    processor = None
+    payloads = []
+    for index, segment in enumerate(segments):
+        params, pcm = parse_wav(segment)
+        if processor is None:
+            processor = PostProcessor(params, **options)
+        elif params != (processor.nchannels, processor.source_width, processor.framerate):
+            raise ValueError("Cannot post-process WAV segments with different channel, width or rate settings")
+        payloads.append(processor.process(pcm, None if pauses is None else pauses[index]))
+    if processor is None:
+        raise ValueError("No WAV segments to post-process")
+    payloads.append(processor.flush())
+    return wav_header(*processor.output_params, sum(len(payload) for payload in payloads)) + b''.join(payloads)
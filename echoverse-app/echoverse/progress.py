@@ -0,0 +1,18 @@
+"""Progress events emitted by the rewrite and synthesis stages"""
+from collections import namedtuple
+
+
+class ProgressEvent(namedtuple("ProgressEvent", ["stage", "completed", "total"])):
+    """Completion of one unit of real work (a rewritten or synthesized chunk)"""
+
+    __slots__ = ()
+
+    @property
+    def fraction(self):
+        return self.completed / self.total if self.total else 1.0
+
+
+def report_progress(callback, stage, completed, total):
+    """Send a ProgressEvent to callback if one was given"""
+    if callback is not None:
+        callback(ProgressEvent(stage, completed, total))
@@ -0,0 +1,90 @@
+"""Table-driven tone rewriting engine.
+
+Each tone is a ToneRule: a template applied to sentences, an optional word
+list cycled by sentence position, and the punctuation that replaces a plain
+period. A document is segmented once with the shared sentence segmenter and
+rebuilt with list joins, so cost is linear in the input. rewrite_stream
+works over any iterable of paragraphs and holds only one paragraph at a
+time, which keeps memory bounded for very large manuscripts.
+"""
+from collections import namedtuple
+
+from .chunking import split_sentence_parts, split_paragraphs
+
+ToneRule = namedtuple("ToneRule", ["template", "words", "every", "min_length", "terminal"])
+
+TONE_RULES = {
+    "Neutral": ToneRule(
+        template="It is important to note that {body}",
+        words=(),
+        every=1,
+        min_length=10,
+        terminal=".",
+    ),
+    "Suspenseful": ToneRule(
+        template="{Word}, {body}",
+        words=("suddenly", "mysteriously", "unexpectedly", "ominously", "silently"),
+        every=2,
+        min_length=10,
+        terminal="...",
+    ),
+    "Inspiring": ToneRule(
+        template="This {word} demonstrates that {body}",
+        words=("remarkably", "brilliantly", "powerfully", "magnificently", "extraordinarily"),
+        every=1,
+        min_length=10,
+        terminal="!",
+    ),
+}
+
+_CLOSERS = '"\')]'
+
+
+def _affixes(rule):
+    """Pre-split a rule's template into (prefix, suffix) per word position"""
+    words = rule.words or ("",)
+    affixes = []
+    for word in words:
+        filled = rule.template.replace("{word}", word).replace("{Word}", word.capitalize())
+        prefix, _, suffix = filled.partition("{body}")
+        affixes.append((prefix, suffix))
+    return affixes
+
+
+class ToneRewriter:
+    """Rewrites text in a tone using the rules in TONE_RULES"""
+
+    def __init__(self, rules=None):
+        self.rules = TONE_RULES if rules is None else rules
+        self._affixes = {tone: _affixes(rule) for tone, rule in self.rules.items()}
+
+    def supports(self, tone):
+        return tone in self.rules
+
+    def rewrite_paragraph(self, paragraph, tone):
+        """Rewrite one paragraph; sentence positions restart per paragraph"""
+        rule = self.rules[tone]
+        affixes = self._affixes[tone]
+        count = len(affixes)
+        every, min_length, terminal = rule.every, rule.min_length, rule.terminal
+        bodies, endings = split_sentence_parts(paragraph)
+        for index, body in enumerate(bodies):
+            if index % every == 0 and len(body) > min_length:
+                prefix, suffix = affixes[index % count]
+                bodies[index] = prefix + body.lower() + suffix
+        for index, ending in enumerate(endings):
+            punctuation = ending.rstrip(_CLOSERS)
+            if punctuation == "" or punctuation == ".":
+                endings[index] = terminal + ending[len(punctuation):]
+        return ' '.join(map(str.__add__, bodies, endings))
+
+    def rewrite_stream(self, paragraphs, tone):
+        """Yield rewritten paragraphs from an iterable of paragraphs"""
+        for paragraph in paragraphs:
+            rewritten = self.rewrite_paragraph(paragraph, tone)
+            if rewritten:
+                yield rewritten
+
+    def rewrite(self, text, tone):
+        """Rewrite a whole document, keeping paragraph breaks"""
+        return '\n\n'.join(self.rewrite_stream(split_paragraphs(text), tone))
@@ -0,0 +1,141 @@
+"""Memo of rewritten chunks keyed by content hash and tone.
+
+The first tier is a bounded in-process LRU; an optional SQLite file adds a
+second tier that survives restarts and is shared between processes. Only
+chunks whose text changed since the last rewrite miss both tiers, so an
+edit to one paragraph re-sends only that paragraph to the LLM.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+from .metrics import increment
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_DISK_ENTRIES = 200000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rewrites (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+def rewrite_key(text, tone, namespace):
+    """Hash of a chunk, its tone and the backend/prompt namespace"""
+    digest = hashlib.sha256()
+    for part in (namespace, tone, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RewriteCache:
+    """Two-tier (memory LRU, optional disk) cache of rewritten chunks"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None, max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0}
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key, record=True):
+        """Return the cached rewrite for key, or None; record=False leaves stats untouched"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                if record:
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    increment("cache_lookups", cache="rewrite", result="hit")
+                return value
+
+        if self.path:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT value FROM rewrites WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE rewrites SET last_access = ? WHERE key = ?", (time.time(), key))
+            if row is not None:
+                self._remember(key, row[0])
+                if record:
+                    with self._lock:
+                        self.stats["hits"] += 1
+                        self.stats["disk_hits"] += 1
+                    increment("cache_lookups", cache="rewrite", result="hit")
+                return row[0]
+
+        if record:
+            with self._lock:
+                self.stats["misses"] += 1
+            increment("cache_lookups", cache="rewrite", result="miss")
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if not self.path:
+            return
+        # Dispatch threads store chunks concurrently
+        with self._lock:
+            self._puts += 1
+            trim = self._puts % 1000 == 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rewrites (key, value, last_access) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            if trim:
+                # Trim the disk tier to its bound every thousand writes
+                conn.execute(
+                    "DELETE FROM rewrites WHERE key IN (SELECT key FROM rewrites ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            for name in self.stats:
+                self.stats[name] = 0
+        if self.path:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM rewrites")
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_rewrite_cache():
+    """Process-wide rewrite cache; ECHOVERSE_REWRITE_CACHE names an optional SQLite disk tier"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = RewriteCache(path=os.environ.get("ECHOVERSE_REWRITE_CACHE"))
+        return _shared_cache
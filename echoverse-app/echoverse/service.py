@@ -0,0 +1,295 @@
+"""Local job service: an asyncio worker pool over the SQLite job queue with an HTTP API.
+
+Endpoints (JSON unless noted):
+
+    POST   /jobs               submit {"kind": "rewrite"|"synthesize", "text": ..., "tone"|"voice": ...,
+                                "format": ..., "bitrate": ...}; synthesize jobs with
+                                "dialogue": true read speech in other voices, "cast": {speaker: voice},
+                                and "tone" rewrites each voice's part in that tone
+    GET    /jobs/<id>          job status and progress
+    GET    /jobs/<id>/result   rewritten text, or the audio bytes for synthesize jobs
+    DELETE /jobs/<id>          cancel a queued or running job
+    GET    /health             queue depth and worker count
+    GET    /metrics            stage latencies and counters in the Prometheus text format
+
+Submissions are rejected with 429 once max_queued jobs are waiting.
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+
+from . import jobs
+from .audio import MIME_TYPES
+from .jobs import JobStore
+from .metrics import CONTENT_TYPE, get_metrics, span
+
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".cache", "echoverse", "service")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+JOB_KINDS = ("rewrite", "synthesize")
+
+
+class QueueFullError(Exception):
+    """Raised when a submission would exceed the queued job limit"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has been cancelled"""
+
+
+class JobService:
+    """Accepts rewrite/synthesize jobs and runs them on a bounded worker pool"""
+
+    def __init__(self, data_dir=None, workers=2, max_queued=100, llm=None, tts=None):
+        self.data_dir = data_dir or os.environ.get("ECHOVERSE_SERVICE_DIR", DEFAULT_DATA_DIR)
+        self.results_dir = os.path.join(self.data_dir, "results")
+        os.makedirs(self.results_dir, exist_ok=True)
+        self.store = JobStore(os.path.join(self.data_dir, "jobs.sqlite"))
+        self.workers = workers
+        self.max_queued = max_queued
+        self._llm = llm
+        self._tts = tts
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._ready = None
+        self._tasks = []
+        # Both sets are only changed on the event loop, so claiming a job and cancelling it cannot interleave
+        self._running = set()
+        self._cancelled = set()
+        self._server = None
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from .llm import create_llm
+            self._llm = create_llm()
+        return self._llm
+
+    @property
+    def tts(self):
+        if self._tts is None:
+            from .tts import RealTTSEngine
+            # Route every job through the process pool so jobs synthesize in parallel
+            self._tts = RealTTSEngine(inline_max_chars=0)
+        return self._tts
+
+    # Job lifecycle
+
+    def submit(self, kind, params):
+        """Queue a job and wake a worker; raises QueueFullError or ValueError"""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if not params.get("text"):
+            raise ValueError("Job text is required")
+        if self.store.count(jobs.QUEUED) >= self.max_queued:
+            raise QueueFullError(f"Too many queued jobs (limit {self.max_queued})")
+        job_id = self.store.create(kind, params)
+        self._ready.put_nowait(job_id)
+        return job_id
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; running jobs stop at the next chunk"""
+        cancelled = self.store.cancel(job_id)
+        # A cancelled queued job is never claimed, so only running jobs need to be told
+        if cancelled and job_id in self._running:
+            self._cancelled.add(job_id)
+        return cancelled
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.get()
+            job = self.store.claim()
+            if job is None:
+                continue
+            self._running.add(job["id"])
+            try:
+                result = await loop.run_in_executor(self._executor, self._execute, job)
+            except JobCancelled:
+                continue
+            except Exception as e:
+                self.store.fail(job["id"], str(e))
+            else:
+                self.store.complete(job["id"], result)
+            finally:
+                self._running.discard(job["id"])
+                self._cancelled.discard(job["id"])
+
+    def _progress(self, job_id):
+        def update(event):
+            if job_id in self._cancelled:
+                raise JobCancelled(job_id)
+            self.store.update_progress(job_id, event.completed, event.total)
+        return update
+
+    def _execute(self, job):
+        """Run one job in a worker thread and return its JSON result"""
+        get_metrics().observe("queue_wait", time.time() - job["created_at"], queue="service")
+        with span("job", kind=job["kind"]):
+            return self._run(job)
+
+    def _run(self, job):
+        params = job["params"]
+        progress = self._progress(job["id"])
+        if job["kind"] == "rewrite":
+            text = self.llm.rewrite_text(params["text"], params.get("tone", "Neutral"), progress=progress)
+            return {"text": text}
+
+        if params.get("dialogue"):
+            rewrite = partial(self.llm.rewrite_text, tone=params["tone"]) if params.get("tone") else None
+            audio = self.tts.synthesize_dialogue(params["text"], params.get("voice", "Lisa"), cast=params.get("cast"),
+                                                 audio_format=params.get("format"), progress=progress,
+                                                 bitrate=params.get("bitrate"), rewrite=rewrite)
+        else:
+            audio = self.tts.synthesize(params["text"], params.get("voice", "Lisa"),
+                                        audio_format=params.get("format"), progress=progress,
+                                        bitrate=params.get("bitrate"))
+        path = os.path.join(self.results_dir, f"{job['id']}.{audio['format']}")
+        with open(path, 'wb') as handle:
+            handle.write(audio["data"])
+        result = {key: value for key, value in audio.items() if key != "data"}
+        result["path"] = path
+        return result
+
+    # HTTP front end
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start workers and the HTTP listener"""
+        self._ready = asyncio.Queue()
+        for _ in range(self.store.requeue_running() + self.store.count(jobs.QUEUED)):
+            self._ready.put_nowait(None)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        # Cancelling a worker cancels its executor future too, so no queued work is left to drop
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+        if self._tts is not None:
+            self._tts.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length') or 0)
+            if length > MAX_BODY_BYTES:
+                response = _json_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large"})
+            else:
+                body = await reader.readexactly(length) if length else b''
+                response = await self._route(method, target.split('?', 1)[0], body)
+        except Exception as e:
+            response = _json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+        status, content_type, payload = response
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode('latin-1') + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        parts = [part for part in path.split('/') if part]
+
+        if method == "GET" and parts == ["health"]:
+            return _json_response(HTTPStatus.OK, {
+                "queued": self.store.count(jobs.QUEUED),
+                "running": self.store.count(jobs.RUNNING),
+                "workers": self.workers,
+                "max_queued": self.max_queued,
+            })
+
+        if method == "GET" and parts == ["metrics"]:
+            return HTTPStatus.OK, CONTENT_TYPE, get_metrics().render_prometheus().encode("utf-8")
+
+        if method == "POST" and parts == ["jobs"]:
+            try:
+                request = json.loads(body or b'{}')
+                job_id = self.submit(request.pop("kind", None), request)
+            except QueueFullError as e:
+                return _json_response(HTTPStatus.TOO_MANY_REQUESTS, {"error": str(e)})
+            except ValueError as e:
+                return _json_response(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return _json_response(HTTPStatus.ACCEPTED, {"id": job_id, "status": jobs.QUEUED})
+
+        if len(parts) < 2 or parts[0] != "jobs":
+            return _json_response(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+        job = self.store.get(parts[1])
+        if job is None:
+            return _json_response(HTTPStatus.NOT_FOUND, {"error": "Unknown job"})
+
+        if method == "GET" and len(parts) == 2:
+            return _json_response(HTTPStatus.OK, _public_job(job))
+
+        if method == "DELETE" and len(parts) == 2:
+            if not self.cancel(job["id"]):
+                return _json_response(HTTPStatus.CONFLICT, {"error": f"Job already {job['status']}"})
+            return _json_response(HTTPStatus.OK, {"id": job["id"], "status": jobs.CANCELLED})
+
+        if method == "GET" and parts[2:] == ["result"]:
+            if job["status"] != jobs.DONE:
+                return _json_response(HTTPStatus.CONFLICT, {"error": f"Job is {job['status']}"})
+            if job["kind"] == "rewrite":
+                return _json_response(HTTPStatus.OK, job["result"])
+            data = await asyncio.get_running_loop().run_in_executor(None, _read_file, job["result"]["path"])
+            return HTTPStatus.OK, MIME_TYPES.get(job['result']['format'], "application/octet-stream"), data
+
+        return _json_response(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed"})
+
+
+def _read_file(path):
+    with open(path, 'rb') as handle:
+        return handle.read()
+
+
+def _json_response(status, payload):
+    return status, "application/json", json.dumps(payload).encode("utf-8")
+
+
+def _public_job(job):
+    """Job record as returned by the API (no server-side file paths)"""
+    public = {key: job[key] for key in ("id", "kind", "status", "completed", "total",
+                                         "created_at", "started_at", "finished_at", "error")}
+    if job["result"] is not None:
+        public["result"] = {key: value for key, value in job["result"].items()
+                            if key not in ("path", "text")}
+    return public
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+    """Run a JobService until interrupted"""
+    service = JobService(**kwargs)
+    server = await service.start(host, port)
+    print(f"EchoVerse job service listening on http://{host}:{port} "
+          f"({service.workers} workers, max {service.max_queued} queued)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
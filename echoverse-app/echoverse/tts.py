@@ -0,0 +1,329 @@
+"""Text-to-speech front end that selects a backend and assembles audio results"""
+import importlib.util
+import os
+import threading
+
+from .audio import audio_duration, merge_mp3, merge_wav, mp3_silence, parse_wav, wav_duration, wav_silence
+from .cache import SynthesisCache, cache_key
+from .chunking import DEFAULT_MAX_CHARS, chunk_text
+from .dialogue import split_dialogue
+from .encoding import AudioEncoder, EncodingError
+from .engine_pool import get_engine_pool
+from .engines import render_gtts, render_pyttsx3
+from .metrics import increment, span
+from .pipeline import ENGINE_FORMATS, SynthesisPipeline
+from .progress import report_progress
+
+# Detect TTS libraries without importing them; engines import them on first use
+PYTTSX3_AVAILABLE = importlib.util.find_spec("pyttsx3") is not None
+GTTS_AVAILABLE = importlib.util.find_spec("gtts") is not None
+
+# Silence between voices in dialogue, in seconds
+DEFAULT_PAUSE = 0.35
+DEFAULT_PARAGRAPH_PAUSE = 0.7
+
+
+class TTSError(RuntimeError):
+    """Raised when speech could not be synthesized"""
+
+
+def postprocess_options():
+    """PostProcessor options from the environment, or None while the stage is off.
+    
+    ECHOVERSE_POSTPROCESS=1 turns it on, ECHOVERSE_SAMPLE_RATE resamples the
+    output and ECHOVERSE_PAUSE sets the seconds of silence between chunks.
+    """
+    if os.environ.get("ECHOVERSE_POSTPROCESS", "0").lower() in ("0", "false", "off", "no"):
+        return None
+    options = {}
+    if os.environ.get("ECHOVERSE_SAMPLE_RATE"):
+        options["target_rate"] = int(os.environ["ECHOVERSE_SAMPLE_RATE"])
+    if os.environ.get("ECHOVERSE_PAUSE"):
+        options["pause"] = float(os.environ["ECHOVERSE_PAUSE"])
+    return options
+
+
+class RealTTSEngine:
+    """Real Text-to-Speech engine using multiple TTS backends"""
+    
+    def __init__(self, max_chars=DEFAULT_MAX_CHARS, workers=None, cache=None, inline_max_chars=None,
+                 postprocess=None):
+        self.voices = {
+            "Lisa": {"gender": "female", "accent": "American", "rate": 180, "voice_id": 0},
+            "Michael": {"gender": "male", "accent": "American", "rate": 170, "voice_id": 1},
+            "Allison": {"gender": "female", "accent": "British", "rate": 175, "voice_id": 2}
+        }
+        self.max_chars = max_chars  # Texts longer than this go through the chunked pipeline
+        self.workers = workers
+        # Texts up to this length are rendered in-process instead of in the pool
+        self.inline_max_chars = max_chars if inline_max_chars is None else inline_max_chars
+        # PostProcessor options for WAV output (see echoverse.postprocess); None leaves the audio as rendered
+        self.postprocess = postprocess_options() if postprocess is None else postprocess
+        with span("init", component="tts"):
+            self.cache = cache if cache is not None else SynthesisCache()
+            self.available_engines = self._check_available_engines()
+        self._pipelines = {}
+        self._pipelines_lock = threading.Lock()
+        self.encoder = AudioEncoder(workers)
+    
+    def _check_available_engines(self):
+        """Check which TTS engines are available"""
+        engines = []
+        if PYTTSX3_AVAILABLE:
+            engines.append("pyttsx3")
+        if GTTS_AVAILABLE:
+            engines.append("gtts")
+        return engines
+    
+    def warm_up(self):
+        """Prepare pooled pyttsx3 drivers for every voice profile ahead of the first request"""
+        if "pyttsx3" in self.available_engines:
+            get_engine_pool().warm(self.voices.values())
+    
+    def _select_engine(self):
+        """Pick the best available engine, raising TTSError if there is none"""
+        if not self.available_engines:
+            raise TTSError("No TTS engines available! Please install pyttsx3 or gtts.")
+        
+        # Use the best available engine
+        if "pyttsx3" in self.available_engines:
+            return "pyttsx3"
+        elif "gtts" in self.available_engines:
+            return "gtts"
+        raise TTSError("No compatible TTS engine found!")
+    
+    def native_format(self):
+        """Format the selected engine renders before any encoding"""
+        return ENGINE_FORMATS[self._select_engine()]
+    
+    def synthesize(self, text, voice="Lisa", audio_format=None, progress=None, bitrate=None):
+        """Generate speech using available TTS engines.
+        
+        audio_format picks the output encoding ("wav", "mp3" or "ogg"); by
+        default the engine's own format is returned without transcoding.
+        """
+        engine = self._select_engine()
+        with span("synthesize", engine=engine):
+            result = self._synthesize(text, voice, engine, audio_format, progress, bitrate)
+        increment("chars_in", len(text), stage="synthesize")
+        increment("audio_seconds_out", result["duration"], engine=engine)
+        return result
+    
+    def _synthesize(self, text, voice, engine, audio_format, progress, bitrate):
+        # Book-length input is split into chunks and rendered in parallel
+        if len(text) > self.inline_max_chars:
+            return self._synthesize_chunked(text, voice, engine, audio_format, bitrate, progress)
+        
+        # Short texts are cached as a single entry
+        native_format = ENGINE_FORMATS[engine]
+        key = cache_key(text, self.voices[voice], engine, native_format)
+        cached = self.cache.get(key)
+        if cached is not None:
+            report_progress(progress, "synthesize", 1, 1)
+            # Measured like a fresh render, so a hit reports the same duration as the miss did
+            duration = wav_duration(cached) if native_format == "wav" else len(text.split()) * 0.6
+            result = self._build_result(text, voice, engine, native_format, cached, duration)
+        else:
+            if engine == "pyttsx3":
+                result = self._synthesize_pyttsx3(text, voice)
+            else:
+                result = self._synthesize_gtts(text, voice)
+            self.cache.put(key, result["data"])
+            report_progress(progress, "synthesize", 1, 1)
+        
+        if self.postprocess is not None and native_format == "wav":
+            audio_data = self._postprocess([result["data"]], native_format)[0]
+            result = self._build_result(text, voice, engine, native_format, audio_data, wav_duration(audio_data))
+        
+        if audio_format and audio_format != native_format:
+            return self._encode(text, voice, engine, native_format, [result["data"]], audio_format, bitrate, progress)
+        return result
+    
+    def synthesize_dialogue(self, text, narrator="Lisa", cast=None, audio_format=None, progress=None, bitrate=None,
+                            pause=DEFAULT_PAUSE, paragraph_pause=DEFAULT_PARAGRAPH_PAUSE, rewrite=None):
+        """Narrate text with quoted speech and tagged speaker lines in the speakers' voices.
+        
+        cast maps speaker names to voices; other speakers are given the voices
+        besides the narrator's in turn. A change of voice is separated by
+        pause seconds of silence, or paragraph_pause at a paragraph break.
+        rewrite, a function of one text, is applied to each segment after the
+        speakers are found, so tone rewriting cannot lose the speaker tags.
+        """
+        engine = self._select_engine()
+        with span("synthesize_dialogue", engine=engine):
+            result = self._synthesize_dialogue(text, narrator, cast, engine, audio_format, progress, bitrate,
+                                               pause, paragraph_pause, rewrite)
+        increment("chars_in", len(text), stage="synthesize_dialogue")
+        increment("audio_seconds_out", result["duration"], engine=engine)
+        return result
+    
+    def _synthesize_dialogue(self, text, narrator, cast, engine, audio_format, progress, bitrate, pause,
+                             paragraph_pause, rewrite):
+        segments = split_dialogue(text, narrator, list(self.voices), cast)
+        if not segments:
+            raise TTSError("Nothing to synthesize")
+        if rewrite is not None:
+            segments = [segment._replace(text=rewrite(segment.text)) for segment in segments]
+        # Long segments are chunked like single-voice text; owners maps each piece to its segment
+        pieces = []
+        owners = []
+        for index, segment in enumerate(segments):
+            for chunk in chunk_text(segment.text, self.max_chars):
+                pieces.append((self.voices[segment.voice], chunk))
+                owners.append(index)
+        
+        pipeline = self._pipeline(engine)
+        try:
+            audio = pipeline.synthesize_voices(pieces, progress, inline=len(text) <= self.inline_max_chars)
+        except Exception as e:
+            raise TTSError(f"{engine} TTS Error: {str(e)}") from e
+        
+        # Interleave the voices back in document order with silence at each change
+        native_format = pipeline.audio_format
+        gaps = [None] * len(audio)
+        for position in range(1, len(audio)):
+            owner = owners[position]
+            if owner != owners[position - 1]:
+                gaps[position] = paragraph_pause if segments[owner].new_paragraph else pause
+        if self.postprocess is not None and native_format == "wav":
+            # The post-processor trims each piece and inserts the gaps itself
+            parts = self._postprocess(audio, native_format, gaps)
+        else:
+            silences = {}
+            parts = []
+            for data, gap in zip(audio, gaps):
+                if gap:
+                    if gap not in silences:
+                        silences[gap] = (wav_silence(parse_wav(audio[0])[0], gap) if native_format == "wav"
+                                         else mp3_silence(audio[0], gap))
+                    parts.append(silences[gap])
+                parts.append(data)
+        audio_data = merge_wav(parts) if native_format == "wav" else merge_mp3(parts)
+        
+        if audio_format and audio_format != native_format:
+            result = self._encode(text, narrator, engine, native_format, [audio_data], audio_format, bitrate, progress)
+        else:
+            result = self._build_result(text, narrator, engine, native_format, audio_data,
+                                        audio_duration(audio_data, native_format))
+        result.update({"voices": sorted({segment.voice for segment in segments}), "segments": len(segments)})
+        return result
+    
+    def synthesize_stream(self, text, voice="Lisa"):
+        """Yield per-chunk audio results in document order as soon as each is ready"""
+        engine = self._select_engine()
+        pipeline = self._pipeline(engine)
+        
+        for index, total, chunk, audio_data in pipeline.stream(text, self.voices[voice]):
+            result = self._build_result(chunk, voice, engine, pipeline.audio_format, audio_data, len(chunk.split()) * 0.6)
+            result.update({"index": index, "total": total})
+            yield result
+    
+    def combine_stream(self, text, voice, chunk_results, audio_format=None, bitrate=None):
+        """Merge streamed chunk results into a single downloadable result"""
+        if not chunk_results:
+            return None
+        native_format = chunk_results[0]["format"]
+        segments = self._postprocess([chunk["data"] for chunk in chunk_results], native_format)
+        if audio_format and audio_format != native_format:
+            return self._encode(text, voice, chunk_results[0]["engine"], native_format, segments, audio_format, bitrate)
+        if native_format == "wav":
+            audio_data = merge_wav(segments)
+            duration = wav_duration(audio_data)
+        else:
+            audio_data = merge_mp3(segments)
+            duration = len(text.split()) * 0.6
+        return self._build_result(text, voice, chunk_results[0]["engine"], chunk_results[0]["format"], audio_data, duration)
+    
+    def _pipeline(self, engine):
+        """Lazily create the chunk pipeline for an engine; its worker pool stays warm"""
+        with self._pipelines_lock:
+            if engine not in self._pipelines:
+                self._pipelines[engine] = SynthesisPipeline(
+                    engine, workers=self.workers, max_chars=self.max_chars, cache=self.cache
+                )
+            return self._pipelines[engine]
+    
+    def close(self):
+        """Shut down any worker pools started by this engine"""
+        with self._pipelines_lock:
+            for pipeline in self._pipelines.values():
+                pipeline.close()
+            self._pipelines.clear()
+        self.encoder.close()
+    
+    def _postprocess(self, segments, native_format, pauses=None):
+        """Run WAV chunks through the post-processing stage into one WAV, when it is enabled"""
+        if self.postprocess is None or native_format != "wav":
+            return segments
+        from .postprocess import postprocess_wav
+        return [postprocess_wav(segments, pauses, **self.postprocess)]
+    
+    def _build_result(self, text, voice, engine, audio_format, audio_data, duration):
+        """Assemble the audio result dictionary shared by all backends"""
+        return {
+            "format": audio_format,
+            "duration": duration,
+            "voice": voice,
+            "size": len(audio_data),
+            "data": audio_data,
+            "text_preview": text[:50] + "..." if len(text) > 50 else text,
+            "engine": engine
+        }
+    
+    def _encode(self, text, voice, engine, native_format, segments, audio_format, bitrate=None, progress=None):
+        """Encode rendered chunks to audio_format and assemble the result"""
+        if native_format == "wav":
+            duration = sum(wav_duration(segment) for segment in segments)
+        else:
+            duration = len(text.split()) * 0.6
+        try:
+            audio_data = self.encoder.encode(segments, native_format, audio_format, bitrate, progress)
+        except EncodingError as e:
+            raise TTSError(str(e)) from e
+        return self._build_result(text, voice, engine, audio_format, audio_data, duration)
+    
+    def _synthesize_chunked(self, text, voice, engine, audio_format=None, bitrate=None, progress=None):
+        """Generate speech for long texts through the parallel chunk pipeline"""
+        pipeline = self._pipeline(engine)
+        try:
+            chunks = chunk_text(text, self.max_chars)
+            if not chunks:
+                raise ValueError("Nothing to synthesize")
+            segments = self._postprocess(pipeline.synthesize_chunks(chunks, self.voices[voice], progress),
+                                         pipeline.audio_format)
+            if not audio_format or audio_format == pipeline.audio_format:
+                result = pipeline.merge(segments, text)
+                return self._build_result(text, voice, engine, result["format"], result["data"], result["duration"])
+            
+        except Exception as e:
+            raise TTSError(f"{engine} TTS Error: {str(e)}") from e
+        
+        # Compressed output is encoded chunk by chunk and joined without re-encoding
+        return self._encode(text, voice, engine, pipeline.audio_format, segments, audio_format, bitrate, progress)
+    
+    def _synthesize_pyttsx3(self, text, voice):
+        """Generate speech using pyttsx3 (offline TTS)"""
+        try:
+            # Warm drivers come from the shared pool, already set up for this voice
+            with get_engine_pool().engine(self.voices[voice]) as engine:
+                audio_data = render_pyttsx3(engine, text)
+            
+            return self._build_result(text, voice, "pyttsx3", "wav", audio_data, wav_duration(audio_data))
+            
+        except Exception as e:
+            raise TTSError(f"pyttsx3 TTS Error: {str(e)}") from e
+    
+    def _synthesize_gtts(self, text, voice):
+        """Generate speech using Google Text-to-Speech (online)"""
+        try:
+            # Language is chosen from the voice accent
+            audio_data = render_gtts(text, self.voices[voice])
+            
+            # Calculate duration
+            word_count = len(text.split())
+            duration = word_count * 0.6
+            
+            return self._build_result(text, voice, "gtts", "mp3", audio_data, duration)
+            
+        except Exception as e:
+            raise TTSError(f"gTTS Error: {str(e)} - Make sure you have internet connection!") from e
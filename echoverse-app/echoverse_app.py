@@ -1,243 +1,63 @@
 import streamlit as st
 import os
 import time
-import base64
-from io import BytesIO
-import tempfile
-import re
 from datetime import datetime
-import wave
-import struct
-import math
+import uuid
+from functools import partial
 
-# Try to import TTS libraries
-try:
-    import pyttsx3
-    PYTTSX3_AVAILABLE = True
-except ImportError:
-    PYTTSX3_AVAILABLE = False
+from echoverse.artifacts import estimate_size, get_artifact_server, get_artifact_store
+from echoverse.audio import MIME_TYPES
+from echoverse.chunking import DEFAULT_PAGE_CHARS, page_bounds
+from echoverse.client import JobClient
+from echoverse.dialogue import parse_cast
+from echoverse.encoding import BITRATES, DEFAULT_BITRATE, OUTPUT_FORMATS, encoder_available
+from echoverse.ingest import SUPPORTED_EXTENSIONS, read_document
+from echoverse.llm import create_llm
+from echoverse.metrics import configure_logging, get_metrics, get_metrics_server, span
+from echoverse.packager import ChapterPackager, format_timestamp
+from echoverse.tts import RealTTSEngine
 
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
+# Fragments rerun only their own part of the page; older Streamlit reruns the whole script
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
 
-try:
-    import pygame
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
 
-# Simulated IBM Watson services (replace with actual IBM Watson API calls)
-class SimulatedWatsonxLLM:
-    """Simulates IBM Watsonx Granite LLM for tone-adaptive text rewriting"""
-    
-    def __init__(self):
-        self.tone_prompts = {
-            "Neutral": "Rewrite the following text in a clear, balanced, and informative tone. Maintain all factual information while making it easy to understand:",
-            "Suspenseful": "Rewrite the following text to create tension, mystery, and intrigue. Use dramatic language and pacing while preserving the original meaning:",
-            "Inspiring": "Rewrite the following text in an uplifting, motivational tone that energizes and encourages the reader. Maintain the core message while making it inspiring:"
-        }
-    
-    def rewrite_text(self, original_text, tone):
-        """Simulate tone-adaptive text rewriting using prompt chaining"""
-        time.sleep(2)  # Simulate API processing time
-        
-        # Enhanced rewriting based on tone
-        if tone == "Neutral":
-            return self._neutral_rewrite(original_text)
-        elif tone == "Suspenseful":
-            return self._suspenseful_rewrite(original_text)
-        elif tone == "Inspiring":
-            return self._inspiring_rewrite(original_text)
-        else:
-            return original_text
-    
-    def _neutral_rewrite(self, text):
-        """Convert text to neutral, informative tone"""
-        # Simple simulation - in practice, this would use the LLM
-        sentences = text.split('.')
-        rewritten = []
-        for sentence in sentences:
-            if sentence.strip():
-                # Add clarity markers
-                sentence = sentence.strip()
-                if not sentence.endswith(('.', '!', '?')):
-                    sentence += '.'
-                rewritten.append(f"It is important to note that {sentence.lower()}" if len(sentence) > 10 else sentence)
-        return ' '.join(rewritten)
-    
-    def _suspenseful_rewrite(self, text):
-        """Convert text to suspenseful tone"""
-        sentences = text.split('.')
-        rewritten = []
-        suspense_words = ["suddenly", "mysteriously", "unexpectedly", "ominously", "silently"]
-        
-        for i, sentence in enumerate(sentences):
-            if sentence.strip():
-                sentence = sentence.strip()
-                if i % 2 == 0 and len(sentence) > 10:
-                    suspense_word = suspense_words[i % len(suspense_words)]
-                    sentence = f"{suspense_word.capitalize()}, {sentence.lower()}"
-                sentence += "..." if not sentence.endswith(('.', '!', '?')) else ""
-                rewritten.append(sentence)
-        return ' '.join(rewritten)
-    
-    def _inspiring_rewrite(self, text):
-        """Convert text to inspiring tone"""
-        sentences = text.split('.')
-        rewritten = []
-        inspiring_phrases = ["remarkably", "brilliantly", "powerfully", "magnificently", "extraordinarily"]
-        
-        for i, sentence in enumerate(sentences):
-            if sentence.strip():
-                sentence = sentence.strip()
-                if len(sentence) > 10:
-                    inspiring_word = inspiring_phrases[i % len(inspiring_phrases)]
-                    sentence = f"This {inspiring_word} demonstrates that {sentence.lower()}"
-                sentence += "!" if not sentence.endswith(('.', '!', '?')) else ""
-                rewritten.append(sentence)
-        return ' '.join(rewritten)
+# Every interaction reruns the script; engines, pools and caches are built once per process
+@st.cache_resource(show_spinner=False)
+def load_llm():
+    """Shared LLM client"""
+    return create_llm()
 
 
-class RealTTSEngine:
-    """Real Text-to-Speech engine using multiple TTS backends"""
-    
-    def __init__(self):
-        self.voices = {
-            "Lisa": {"gender": "female", "accent": "American", "rate": 180, "voice_id": 0},
-            "Michael": {"gender": "male", "accent": "American", "rate": 170, "voice_id": 1},
-            "Allison": {"gender": "female", "accent": "British", "rate": 175, "voice_id": 2}
-        }
-        self.available_engines = self._check_available_engines()
-    
-    def _check_available_engines(self):
-        """Check which TTS engines are available"""
-        engines = []
-        if PYTTSX3_AVAILABLE:
-            engines.append("pyttsx3")
-        if GTTS_AVAILABLE:
-            engines.append("gtts")
-        return engines
-    
-    def synthesize(self, text, voice="Lisa", audio_format="wav"):
-        """Generate speech using available TTS engines"""
-        if not self.available_engines:
-            st.error("No TTS engines available! Please install pyttsx3 or gtts.")
-            return None
-        
-        # Use the best available engine
-        if "pyttsx3" in self.available_engines:
-            return self._synthesize_pyttsx3(text, voice)
-        elif "gtts" in self.available_engines:
-            return self._synthesize_gtts(text, voice)
-        else:
-            st.error("No compatible TTS engine found!")
-            return None
-    
-    def _synthesize_pyttsx3(self, text, voice):
-        """Generate speech using pyttsx3 (offline TTS)"""
-        try:
-            engine = pyttsx3.init()
-            
-            # Configure voice settings
-            voice_config = self.voices[voice]
-            engine.setProperty('rate', voice_config['rate'])
-            
-            # Try to set voice based on gender and preferences
-            voices = engine.getProperty('voices')
-            if voices:
-                # Select voice based on gender preference
-                if voice_config['gender'] == 'male':
-                    male_voices = [v for v in voices if 'male' in v.name.lower() or 'david' in v.name.lower() or 'mark' in v.name.lower()]
-                    if male_voices:
-                        engine.setProperty('voice', male_voices[0].id)
-                else:
-                    female_voices = [v for v in voices if 'female' in v.name.lower() or 'zira' in v.name.lower() or 'hazel' in v.name.lower()]
-                    if female_voices:
-                        engine.setProperty('voice', female_voices[0].id)
-            
-            # Generate audio to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_filename = temp_file.name
-            
-            engine.save_to_file(text, temp_filename)
-            engine.runAndWait()
-            
-            # Read the generated audio file
-            with open(temp_filename, 'rb') as audio_file:
-                audio_data = audio_file.read()
-            
-            # Clean up temporary file
-            os.unlink(temp_filename)
-            
-            # Calculate duration
-            word_count = len(text.split())
-            duration = word_count * 0.6
-            
-            return {
-                "format": "wav",
-                "duration": duration,
-                "voice": voice,
-                "size": len(audio_data),
-                "data": audio_data,
-                "text_preview": text[:50] + "..." if len(text) > 50 else text,
-                "engine": "pyttsx3"
-            }
-            
-        except Exception as e:
-            st.error(f"pyttsx3 TTS Error: {str(e)}")
-            return None
-    
-    def _synthesize_gtts(self, text, voice):
-        """Generate speech using Google Text-to-Speech (online)"""
-        try:
-            # Configure language based on voice accent
-            voice_config = self.voices[voice]
-            lang = 'en-uk' if voice_config['accent'] == 'British' else 'en-us'
-            
-            # Create gTTS object
-            tts = gTTS(text=text, lang=lang, slow=False)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                temp_filename = temp_file.name
-            
-            tts.save(temp_filename)
-            
-            # Read the generated audio file
-            with open(temp_filename, 'rb') as audio_file:
-                audio_data = audio_file.read()
-            
-            # Clean up temporary file
-            os.unlink(temp_filename)
-            
-            # Calculate duration
-            word_count = len(text.split())
-            duration = word_count * 0.6
-            
-            return {
-                "format": "mp3",
-                "duration": duration,
-                "voice": voice,
-                "size": len(audio_data),
-                "data": audio_data,
-                "text_preview": text[:50] + "..." if len(text) > 50 else text,
-                "engine": "gtts"
-            }
-            
-        except Exception as e:
-            st.error(f"gTTS Error: {str(e)} - Make sure you have internet connection!")
-            return None
+@st.cache_resource(show_spinner=False)
+def load_tts():
+    """Shared TTS engine; its worker pools persist across reruns and sessions"""
+    return RealTTSEngine()
+
+
+@st.cache_resource(show_spinner=False)
+def load_job_client(service_url):
+    """Shared client for the job service"""
+    return JobClient(service_url)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def text_layout(text):
+    """Character count, word count and page offsets of a text, computed once per text"""
+    return {"chars": len(text), "words": len(text.split()), "pages": page_bounds(text)}
 
 
 class EchoVerseApp:
     """Main EchoVerse application class"""
     
     def __init__(self):
-        self.llm = SimulatedWatsonxLLM()
-        self.tts = RealTTSEngine()  # Use real TTS engine
+        self.llm = load_llm()  # Simulated Watsonx unless ECHOVERSE_LLM_URL is set
+        self.tts = load_tts()  # Use real TTS engine
+        # With a job service configured the UI only submits and polls jobs
+        service_url = os.environ.get("ECHOVERSE_SERVICE_URL")
+        self.jobs = load_job_client(service_url) if service_url else None
+        # Finished audio lives on disk; session state only holds a handle to it
+        self.artifacts = get_artifact_store()
+        self.artifact_server = get_artifact_server()
         self.setup_session_state()
     
     def setup_session_state(self):
@@ -254,6 +74,26 @@ class EchoVerseApp:
             st.session_state.audio_data = None
         if 'processing' not in st.session_state:
             st.session_state.processing = False
+        if 'stream_audio' not in st.session_state:
+            st.session_state.stream_audio = True
+        if 'dialogue_mode' not in st.session_state:
+            st.session_state.dialogue_mode = False
+        if 'cast_spec' not in st.session_state:
+            st.session_state.cast_spec = ""
+        if 'audio_metrics' not in st.session_state:
+            st.session_state.audio_metrics = {}
+        if 'output_format' not in st.session_state:
+            st.session_state.output_format = None
+        if 'bitrate' not in st.session_state:
+            st.session_state.bitrate = DEFAULT_BITRATE
+        if 'uploaded_file_id' not in st.session_state:
+            st.session_state.uploaded_file_id = None
+        if 'bundle' not in st.session_state:
+            st.session_state.bundle = None
+        if 'session_id' not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
+        if 'last_run_time' not in st.session_state:
+            st.session_state.last_run_time = None
     
     def run(self):
         """Main application interface"""
@@ -269,6 +109,9 @@ class EchoVerseApp:
         st.subheader("AI-Powered Audiobook Creation Tool")
         st.markdown("Transform your text into expressive, downloadable audio content with customizable tone and voice.")
         
+        # Streamed audio chunks are played here while the rest is synthesizing
+        self.live_output = st.container()
+        
         # Sidebar for controls
         with st.sidebar:
             st.header("⚙️ Controls")
@@ -279,6 +122,27 @@ class EchoVerseApp:
             else:
                 st.warning("⚠️ No TTS engines detected. Install pyttsx3 or gtts for real voices.")
             
+            cache_stats = self.tts.cache.stats()
+            st.caption(
+                f"🗄️ Audio cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['entries']} entries ({cache_stats['bytes'] / 1e6:.1f} MB)"
+            )
+            rewrite_stats = self.llm.cache.stats
+            st.caption(
+                f"🧠 Rewrite cache: {self.llm.cache.hit_rate():.0%} hit rate "
+                f"({rewrite_stats['hits']} hits, {rewrite_stats['misses']} misses)"
+            )
+            session_bytes = sum(estimate_size(value) for value in st.session_state.to_dict().values())
+            artifact_count, artifact_bytes = self.artifacts.session_usage(st.session_state.session_id)
+            st.caption(
+                f"💾 Session memory: {session_bytes / 1e3:.1f} KB in RAM, "
+                f"{artifact_bytes / 1e6:.1f} MB of audio on disk ({artifact_count} files)"
+            )
+            if st.session_state.last_run_time is not None:
+                st.caption(f"⏱️ Last rerun: {st.session_state.last_run_time * 1000:.0f} ms on the server")
+            if os.environ.get("ECHOVERSE_ADMIN", "0").lower() not in ("0", "false", "off", "no"):
+                self.display_stage_latencies()
+            
             # Tone selection
             st.subheader("Select Tone")
             tone = st.selectbox(
@@ -286,6 +150,12 @@ class EchoVerseApp:
                 ["Neutral", "Suspenseful", "Inspiring"],
                 index=["Neutral", "Suspenseful", "Inspiring"].index(st.session_state.selected_tone)
             )
+            if tone != st.session_state.selected_tone and st.session_state.rewritten_text and self.jobs is None:
+                # Switching back to an already processed tone is served straight from the cache
+                cached = self.llm.cached_rewrite(st.session_state.original_text, tone)
+                if cached is not None:
+                    st.session_state.rewritten_text = cached
+                    st.session_state.audio_data = None
             st.session_state.selected_tone = tone
             
             # Voice selection
@@ -301,6 +171,51 @@ class EchoVerseApp:
             voice_info = self.tts.voices[voice]
             st.info(f"**{voice}**: {voice_info['gender'].title()} voice with {voice_info['accent']} accent")
             
+            # Dialogue in the other voices
+            st.session_state.dialogue_mode = st.checkbox(
+                "🎭 Read dialogue in other voices",
+                value=st.session_state.dialogue_mode,
+                help="Quoted speech and tagged speaker lines (\"MARA: ...\") are read by the other voices"
+            )
+            if st.session_state.dialogue_mode:
+                st.session_state.cast_spec = st.text_input(
+                    "Cast speakers",
+                    value=st.session_state.cast_spec,
+                    placeholder="Mara=Allison, Elias=Michael",
+                    help="Speakers not listed take turns with the voices other than the narrator's"
+                )
+            
+            # Streaming playback
+            st.session_state.stream_audio = st.checkbox(
+                "Stream audio while generating",
+                value=st.session_state.stream_audio,
+                disabled=self.jobs is not None or st.session_state.dialogue_mode,
+                help="Play the first part of the audiobook while the rest is still being synthesized"
+            )
+            if self.jobs is not None:
+                st.caption(f"🛰️ Jobs run on {self.jobs.base_url}")
+            
+            # Output encoding
+            st.subheader("Output Format")
+            formats = self.output_formats()
+            if st.session_state.output_format not in formats:
+                st.session_state.output_format = "mp3" if "mp3" in formats else formats[0]
+            st.session_state.output_format = st.selectbox(
+                "Choose the audio format:",
+                formats,
+                index=formats.index(st.session_state.output_format),
+                format_func=str.upper
+            )
+            st.session_state.bitrate = st.select_slider(
+                "Bitrate",
+                options=BITRATES,
+                value=st.session_state.bitrate,
+                disabled=st.session_state.output_format == "wav",
+                help="Compressed formats only; lower bitrates give smaller files"
+            )
+            if len(formats) == 1:
+                st.caption("Install ffmpeg to export MP3 or OGG")
+            
             st.markdown("---")
             
             # Processing buttons
@@ -318,11 +233,22 @@ class EchoVerseApp:
                         self.generate_audio()
                     else:
                         st.error("Please rewrite text first!")
+            
+            if st.button(
+                "📚 Build Chapter Bundle",
+                disabled=st.session_state.processing or self.jobs is not None,
+                help="Detect chapters and package one audio file per chapter with a timestamped index"
+            ):
+                if st.session_state.original_text:
+                    self.package_chapters()
+                else:
+                    st.error("Please enter text first!")
         
         # Main content area
         self.display_text_input()
         self.display_text_comparison()
         self.display_audio_output()
+        self.display_chapter_bundle()
         
         # Footer
         st.markdown("---")
@@ -336,37 +262,51 @@ class EchoVerseApp:
         input_method = st.radio("Choose input method:", ["Paste Text", "Upload File"])
         
         if input_method == "Paste Text":
+            # A book-sized text is not echoed back into the editor on every rerun
+            too_long = len(st.session_state.original_text) > DEFAULT_PAGE_CHARS
+            shown_text = "" if too_long else st.session_state.original_text
             text = st.text_area(
                 "Enter your text:",
-                value=st.session_state.original_text,
+                value=shown_text,
                 height=200,
-                placeholder="Paste your text here to convert into an audiobook..."
+                placeholder=(
+                    "The loaded text is too long to edit here; paste new text to replace it..." if too_long
+                    else "Paste your text here to convert into an audiobook..."
+                )
             )
-            if text != st.session_state.original_text:
+            if text != shown_text:
                 st.session_state.original_text = text
                 st.session_state.rewritten_text = ""  # Clear rewritten text when original changes
                 st.session_state.audio_data = None
         
         else:
-            uploaded_file = st.file_uploader("Upload a text file:", type=['txt'])
-            if uploaded_file is not None:
+            uploaded_file = st.file_uploader(
+                "Upload a manuscript:",
+                type=[extension.lstrip('.') for extension in SUPPORTED_EXTENSIONS],
+                help="Plain text in any common encoding, Markdown, Word (.docx) or EPUB"
+            )
+            # Ingest each upload once; reruns keep the text and any rewrite of it
+            file_id = getattr(uploaded_file, 'file_id', None) or (uploaded_file and uploaded_file.name)
+            if uploaded_file is not None and file_id != st.session_state.uploaded_file_id:
                 try:
-                    text = uploaded_file.read().decode('utf-8')
+                    # Decoded and normalized block by block straight from the upload buffer
+                    text = read_document(uploaded_file.name, uploaded_file)
                     st.session_state.original_text = text
                     st.session_state.rewritten_text = ""
                     st.session_state.audio_data = None
+                    st.session_state.uploaded_file_id = file_id
                     st.success(f"File uploaded successfully! ({len(text)} characters)")
                 except Exception as e:
                     st.error(f"Error reading file: {str(e)}")
         
         # Display character count
         if st.session_state.original_text:
-            char_count = len(st.session_state.original_text)
-            word_count = len(st.session_state.original_text.split())
-            st.info(f"📊 Text Statistics: {char_count} characters, {word_count} words")
+            layout = text_layout(st.session_state.original_text)
+            st.info(f"📊 Text Statistics: {layout['chars']} characters, {layout['words']} words")
     
+    @fragment
     def display_text_comparison(self):
-        """Display side-by-side text comparison"""
+        """Display side-by-side text comparison, one page of each text at a time"""
         if st.session_state.original_text or st.session_state.rewritten_text:
             st.header("📖 Text Comparison")
             
@@ -375,35 +315,70 @@ class EchoVerseApp:
             with col1:
                 st.subheader("Original Text")
                 if st.session_state.original_text:
-                    st.text_area(
-                        "Original:",
-                        value=st.session_state.original_text,
-                        height=300,
-                        disabled=True,
-                        key="original_display"
-                    )
+                    self.display_text_page("Original:", st.session_state.original_text, "original_page")
                 else:
                     st.info("No original text available")
             
             with col2:
                 st.subheader(f"Rewritten Text ({st.session_state.selected_tone} Tone)")
                 if st.session_state.rewritten_text:
-                    st.text_area(
-                        f"{st.session_state.selected_tone}:",
-                        value=st.session_state.rewritten_text,
-                        height=300,
-                        disabled=True,
-                        key="rewritten_display"
+                    self.display_text_page(
+                        f"{st.session_state.selected_tone}:", st.session_state.rewritten_text, "rewritten_page"
                     )
                 else:
                     st.info(f"Click 'Rewrite Text' to see the {st.session_state.selected_tone.lower()} version")
     
+    def display_text_page(self, label, text, page_key):
+        """Show one page of a long text so a rerun sends a page, not the whole book"""
+        bounds = text_layout(text)["pages"]
+        page = 1
+        if len(bounds) > 1:
+            # The text may have shrunk since the page was chosen
+            if st.session_state.get(page_key, 1) > len(bounds):
+                st.session_state[page_key] = len(bounds)
+            page = st.number_input(f"Page (of {len(bounds)})", min_value=1, max_value=len(bounds), key=page_key)
+        start, end = bounds[page - 1]
+        st.text_area(label, value=text[start:end].strip(), height=300, disabled=True)
+    
+    def display_stage_latencies(self):
+        """Admin panel: per-stage latencies and counters recorded in this server process"""
+        metrics = get_metrics()
+        with st.expander("📈 Stage latencies"):
+            rows = metrics.stage_summary()
+            if rows:
+                st.dataframe(
+                    [
+                        {
+                            "Stage": row['stage'],
+                            "Labels": row['labels'],
+                            "Count": row['count'],
+                            "p50 ms": round(row['p50'] * 1000, 1),
+                            "p95 ms": round(row['p95'] * 1000, 1),
+                            "Last ms": round(row['last'] * 1000, 1)
+                        }
+                        for row in rows
+                    ],
+                    hide_index=True
+                )
+            else:
+                st.caption("No stages recorded yet")
+            for (name, labels), value in sorted(metrics.counters().items()):
+                label_text = ", ".join(f"{key}={item}" for key, item in labels)
+                st.caption(f"{name}{f' ({label_text})' if label_text else ''}: {value:g}")
+            server = get_metrics_server()
+            if server:
+                st.caption(f"Prometheus endpoint: {server.url}")
+    
     def display_audio_output(self):
         """Display audio output section"""
         if st.session_state.audio_data:
             st.header("🎧 Audio Output")
             
             audio_info = st.session_state.audio_data
+            if not self.artifacts.exists(audio_info):
+                st.session_state.audio_data = None
+                st.warning("This audio has expired. Generate it again to listen or download.")
+                return
             
             # Audio information
             col1, col2, col3 = st.columns(3)
@@ -414,28 +389,97 @@ class EchoVerseApp:
             with col3:
                 st.metric("Format", audio_info['format'].upper())
             
+            metrics = st.session_state.audio_metrics
+            if metrics:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Time to first audio", f"{metrics['time_to_first_audio']:.2f}s")
+                with col2:
+                    st.metric("Total synthesis time", f"{metrics['total_time']:.2f}s")
+            
             # Audio player with real audio
             st.subheader("🎵 Audio Player")
             
-            # Display audio player
-            st.audio(audio_info['data'], format='audio/wav')
+            # Display audio player; the range server streams it from disk,
+            # otherwise Streamlit serves the file from its path
+            audio_source = self.artifact_server.url(audio_info) if self.artifact_server else self.artifacts.path(audio_info)
+            audio_format = audio_info['format']
+            st.audio(audio_source, format=MIME_TYPES[audio_format])
             
             # Show text preview
             st.text(f"Content: {audio_info['text_preview']}")
             
             # Download button with real audio
             st.subheader("💾 Download")
-            download_filename = f"echoverse_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
+            download_filename = f"echoverse_audio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{audio_format}"
             
-            st.download_button(
-                label="📥 Download Audio (WAV)",
-                data=audio_info['data'],
-                file_name=download_filename,
-                mime="audio/wav",
-                help="Download the generated audiobook as a WAV file"
+            self.display_download(
+                f"📥 Download Audio ({audio_format.upper()})",
+                audio_info,
+                download_filename,
+                help=f"Download the generated audiobook as a {audio_format.upper()} file"
             )
             
-            st.success(f"✅ Audio file size: {len(audio_info['data'])} bytes")
+            st.success(f"✅ Audio file size: {audio_info['size']} bytes")
+    
+    def display_chapter_bundle(self):
+        """Display the chapter index and download of the last chapter bundle"""
+        bundle = st.session_state.bundle
+        if not bundle:
+            return
+        if not self.artifacts.exists(bundle):
+            st.session_state.bundle = None
+            return
+        
+        st.header("📚 Chapter Bundle")
+        st.caption(
+            f"{bundle['chapters']} chapters, {format_timestamp(bundle['duration'])} in total; "
+            f"{bundle['skipped']} unchanged chapters were reused"
+        )
+        st.dataframe(
+            [
+                {
+                    "#": chapter['number'],
+                    "Chapter": chapter['title'],
+                    "Start": format_timestamp(chapter['start']),
+                    "Duration": f"{chapter['duration']:.1f}s",
+                    "File": chapter['file']
+                }
+                for chapter in bundle['index']['chapters']
+            ],
+            hide_index=True
+        )
+        
+        download_filename = f"echoverse_chapters_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        self.display_download("📥 Download Chapter Bundle (ZIP)", bundle, download_filename)
+    
+    def display_download(self, label, handle, file_name, help=None):
+        """Download of an artifact: a range server link, or the file read once the user asks for it"""
+        if self.artifact_server:
+            st.link_button(label, self.artifact_server.url(handle, file_name), help=help)
+        elif st.button(label, key=f"download_{handle['artifact']}", help=help):
+            # Read for this run only, so reruns never copy the whole file
+            st.download_button(
+                label=f"💾 Save {file_name}",
+                data=self.artifacts.read(handle),
+                file_name=file_name,
+                mime=MIME_TYPES[handle['format']]
+            )
+    
+    def output_formats(self):
+        """Formats the user can pick: all of them when audio can be encoded, else the engine's own"""
+        if self.jobs is not None or encoder_available():
+            return list(OUTPUT_FORMATS)
+        try:
+            return [self.tts.native_format()]
+        except Exception:
+            return ["wav"]
+    
+    def _progress_callback(self, progress_bar):
+        """Drive a Streamlit progress bar from pipeline progress events"""
+        def update(event):
+            progress_bar.progress(event.fraction, text=f"{event.completed}/{event.total} chunks")
+        return update
     
     def rewrite_text(self):
         """Rewrite text with selected tone"""
@@ -449,17 +493,15 @@ class EchoVerseApp:
         with st.spinner(f"Rewriting text in {st.session_state.selected_tone} tone..."):
             progress_bar = st.progress(0)
             
-            # Simulate progress
-            for i in range(100):
-                time.sleep(0.02)  # Small delay for demonstration
-                progress_bar.progress(i + 1)
-            
-            # Call LLM for rewriting
+            # Call LLM for rewriting; the bar advances as chunks are rewritten
+            rewrite = self.jobs.rewrite if self.jobs else self.llm.rewrite_text
             try:
-                rewritten = self.llm.rewrite_text(
-                    st.session_state.original_text, 
-                    st.session_state.selected_tone
-                )
+                with span("ui_rewrite", tone=st.session_state.selected_tone):
+                    rewritten = rewrite(
+                        st.session_state.original_text, 
+                        st.session_state.selected_tone,
+                        progress=self._progress_callback(progress_bar)
+                    )
                 st.session_state.rewritten_text = rewritten
                 st.session_state.audio_data = None  # Clear audio when text changes
                 st.success(f"Text successfully rewritten in {st.session_state.selected_tone} tone!")
@@ -476,24 +518,48 @@ class EchoVerseApp:
             st.error("No rewritten text available!")
             return
         
+        if st.session_state.stream_audio and self.jobs is None and not st.session_state.dialogue_mode:
+            self.generate_audio_streaming()
+            return
+        
+        # Call TTS for audio generation; the bar advances as chunks are synthesized
+        synthesize = self.jobs.synthesize if self.jobs else self.tts.synthesize
+        text = st.session_state.rewritten_text
+        if st.session_state.dialogue_mode:
+            try:
+                cast = parse_cast(st.session_state.cast_spec, list(self.tts.voices))
+            except ValueError as e:
+                st.error(str(e))
+                return
+            # Speakers are found in the original text and each voice's part is rewritten
+            # on its own, since rewriting the whole text loses the speaker tags
+            tone = st.session_state.selected_tone
+            if self.jobs:
+                synthesize = partial(self.jobs.synthesize_dialogue, cast=cast, tone=tone)
+            else:
+                synthesize = partial(self.tts.synthesize_dialogue, cast=cast,
+                                     rewrite=partial(self.llm.rewrite_text, tone=tone))
+            text = st.session_state.original_text
+        
         st.session_state.processing = True
         
         # Progress indicator
         with st.spinner(f"Generating audio with {st.session_state.selected_voice} voice..."):
             progress_bar = st.progress(0)
             
-            # Simulate progress
-            for i in range(100):
-                time.sleep(0.03)  # Small delay for demonstration
-                progress_bar.progress(i + 1)
-            
-            # Call TTS for audio generation
             try:
-                audio_data = self.tts.synthesize(
-                    st.session_state.rewritten_text,
-                    st.session_state.selected_voice
-                )
-                st.session_state.audio_data = audio_data
+                start = time.perf_counter()
+                with span("ui_generate", voice=st.session_state.selected_voice):
+                    audio_data = synthesize(
+                        text,
+                        st.session_state.selected_voice,
+                        audio_format=st.session_state.output_format,
+                        progress=self._progress_callback(progress_bar),
+                        bitrate=st.session_state.bitrate
+                    )
+                elapsed = time.perf_counter() - start
+                st.session_state.audio_data = self.artifacts.put(audio_data, st.session_state.session_id)
+                st.session_state.audio_metrics = {"time_to_first_audio": elapsed, "total_time": elapsed}
                 st.success(f"Audio successfully generated with {st.session_state.selected_voice} voice!")
                 
             except Exception as e:
@@ -501,12 +567,91 @@ class EchoVerseApp:
         
         st.session_state.processing = False
         st.rerun()
+    
+    def package_chapters(self):
+        """Synthesize the original text chapter by chapter into a ZIP bundle"""
+        st.session_state.processing = True
+        
+        with st.spinner("Synthesizing chapters..."):
+            progress_bar = st.progress(0)
+            packager = ChapterPackager(
+                self.llm,
+                self.tts,
+                self.artifacts.workspace(st.session_state.session_id),
+                tone=st.session_state.selected_tone,
+                voice=st.session_state.selected_voice,
+                audio_format=st.session_state.output_format,
+                bitrate=st.session_state.bitrate
+            )
+            try:
+                with span("ui_package"):
+                    result = packager.package(
+                        st.session_state.original_text,
+                        progress=self._progress_callback(progress_bar)
+                    )
+                st.session_state.bundle = self.artifacts.put_file(
+                    result.pop("path"), dict(result, format="zip"), st.session_state.session_id
+                )
+                st.success(f"Packaged {result['chapters']} chapters ({result['skipped']} reused)")
+                
+            except Exception as e:
+                st.error(f"Error packaging chapters: {str(e)}")
+        
+        st.session_state.processing = False
+        st.rerun()
+    
+    def generate_audio_streaming(self):
+        """Generate audio chunk by chunk, playing each one as soon as it is ready"""
+        text = st.session_state.rewritten_text
+        voice = st.session_state.selected_voice
+        st.session_state.processing = True
+        
+        with self.live_output:
+            st.subheader(f"🔊 Now narrating with {voice}")
+            status = st.empty()
+            progress_bar = st.progress(0)
+            chunk_results = []
+            start = time.perf_counter()
+            time_to_first_audio = None
+            try:
+                for chunk in self.tts.synthesize_stream(text, voice):
+                    if time_to_first_audio is None:
+                        time_to_first_audio = time.perf_counter() - start
+                        get_metrics().observe("ui_first_audio", time_to_first_audio, voice=voice)
+                    chunk_results.append(chunk)
+                    status.info(f"Synthesized part {chunk['index'] + 1} of {chunk['total']}")
+                    progress_bar.progress((chunk['index'] + 1) / chunk['total'])
+                    st.audio(chunk['data'], format=f"audio/{chunk['format']}")
+                
+                if chunk_results:
+                    combined = self.tts.combine_stream(
+                        text, voice, chunk_results, st.session_state.output_format, st.session_state.bitrate
+                    )
+                    st.session_state.audio_data = self.artifacts.put(combined, st.session_state.session_id)
+                    st.session_state.audio_metrics = {
+                        "time_to_first_audio": time_to_first_audio,
+                        "total_time": time.perf_counter() - start
+                    }
+                    status.success(f"Audio successfully generated with {voice} voice!")
+                
+            except Exception as e:
+                st.error(f"Error generating audio: {str(e)}")
+        
+        # No rerun here: it would interrupt playback of the streamed parts
+        st.session_state.processing = False
+
 
 
 def main():
     """Main function to run the EchoVerse application"""
+    start = time.perf_counter()
+    configure_logging()
+    get_metrics_server()
     app = EchoVerseApp()
     app.run()
+    # Shown in the sidebar on the next interaction
+    st.session_state.last_run_time = time.perf_counter() - start
+    get_metrics().observe("ui_rerun", st.session_state.last_run_time)
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/echoverse/echoverse-app",
     packages=find_packages(),
+    py_modules=["echoverse_app"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -31,7 +32,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "echoverse=echoverse_app:main",
+            "echoverse=echoverse.cli:main",
         ],
     },
 )
\ No newline at end of file
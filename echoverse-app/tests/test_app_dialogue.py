@@ -0,0 +1,44 @@
+"""The Streamlit app end to end: rewrite, then read dialogue in several voices"""
+import os
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from echoverse import tts  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+SCRIPT = (
+    "The storm reached the lighthouse at dusk.\n\n"
+    "MARA: Get down from the gallery before the glass goes.\n"
+    "ELIAS: Not until the lamp is lit for the boats.\n\n"
+    '"Then be quick about it," Mara said.'
+)
+
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label.startswith(label))
+
+
+def test_rewritten_text_keeps_its_speakers(tmp_path, monkeypatch):
+    # The stand-in engines from the benchmarks, found however early echoverse.tts was imported
+    monkeypatch.syspath_prepend(os.path.join(ROOT, "benchmarks", "fake_tts"))
+    monkeypatch.setattr(tts, "PYTTSX3_AVAILABLE", True)
+    monkeypatch.setattr(tts, "GTTS_AVAILABLE", True)
+    monkeypatch.setenv("ECHOVERSE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("ECHOVERSE_ARTIFACT_DIR", str(tmp_path / "artifacts"))
+
+    at = AppTest.from_file(os.path.join(ROOT, "echoverse_app.py"), default_timeout=60)
+    at.run()
+    at.session_state.original_text = SCRIPT
+    _widget(at.sidebar.checkbox, "🎭").check().run()
+    _widget(at.sidebar.button, "🔄").click().run()
+    assert at.session_state.rewritten_text
+
+    _widget(at.sidebar.button, "🎵").click().run()
+    assert not at.exception and not at.error
+    audio = at.session_state.audio_data
+    assert audio["voices"] == ["Allison", "Lisa", "Michael"]
+    assert audio["segments"] == 5
@@ -0,0 +1,97 @@
+"""Artifact store: garbage collection and HTTP range requests"""
+import http.client
+import threading
+import time
+
+import pytest
+
+from echoverse.artifacts import ArtifactNotFound, ArtifactServer, ArtifactStore
+
+AUDIO = bytes(range(100))
+
+
+def put(store, data=AUDIO, session="s"):
+    return store.put({"format": "wav", "data": data, "size": len(data)}, session)
+
+
+def test_collect_removes_idle_artifacts(tmp_path):
+    store = ArtifactStore(str(tmp_path), ttl=60, max_bytes=10_000)
+    handle = put(store)
+    assert store.read(handle) == AUDIO
+    assert store.collect() == 0
+
+    assert store.collect(now=time.time() + 61) == 1
+    assert not store.exists(handle)
+    assert list(tmp_path.glob("*.wav")) == []
+    with pytest.raises(ArtifactNotFound):
+        store.read(handle)
+
+
+def test_collect_keeps_total_size_under_the_limit(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr("echoverse.artifacts.time.time", lambda: next(clock))
+    store = ArtifactStore(str(tmp_path), ttl=10 ** 6, max_bytes=250)
+    first, second = put(store), put(store)
+    store.lookup(first["artifact"])  # Recently played, so the other one is older
+
+    put(store)  # 300 bytes: over the limit until the least recently used one goes
+    assert store.exists(first) and not store.exists(second)
+    assert store.stats()["bytes"] == 200
+    assert store.session_usage("s") == (2, 200)
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    server = ArtifactServer(store, ("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_whole_file_without_range(server):
+    handle = put(server.store)
+    response, body = fetch(server, f"/artifacts/{handle['artifact']}?download=book%20one.wav")
+    assert response.status == 200 and body == AUDIO
+    assert response.getheader("Accept-Ranges") == "bytes"
+    assert response.getheader("Content-Type") == "audio/wav"
+    assert response.getheader("Content-Disposition") == "attachment; filename*=UTF-8''book%20one.wav"
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-9", 0, 9),
+    ("bytes=90-", 90, 99),
+    ("bytes=-5", 95, 99),
+    ("bytes=95-500", 95, 99),
+])
+def test_range_requests(server, header, start, end):
+    handle = put(server.store)
+    response, body = fetch(server, f"/artifacts/{handle['artifact']}", {"Range": header})
+    assert response.status == 206
+    assert response.getheader("Content-Range") == f"bytes {start}-{end}/100"
+    assert response.getheader("Content-Length") == str(end - start + 1)
+    assert body == AUDIO[start:end + 1]
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=9-3"])
+def test_unsatisfiable_range(server, header):
+    handle = put(server.store)
+    response, body = fetch(server, f"/artifacts/{handle['artifact']}", {"Range": header})
+    assert response.status == 416 and body == b""
+    assert response.getheader("Content-Range") == "bytes */100"
+
+
+def test_unknown_artifacts_are_not_found(server):
+    assert fetch(server, "/artifacts/missing")[0].status == 404
+    assert fetch(server, "/elsewhere")[0].status == 404
@@ -0,0 +1,83 @@
+"""Batch conversion: output naming and resume"""
+import json
+import os
+
+from echoverse.audio import wav_header
+from echoverse.batch import BatchConverter, output_stems
+
+
+class EchoLLM:
+    def rewrite_text(self, text, tone):
+        return text
+
+
+class SilentTTS:
+    voices = {"Lisa": {}}
+
+    def synthesize(self, text, voice, audio_format=None, bitrate=None):
+        data = wav_header(1, 2, 8000, 1600) + bytes(1600)
+        return {"engine": "test", "format": "wav", "data": data, "size": len(data), "duration": 0.1}
+
+    def close(self):
+        pass
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding="utf-8") as handle:
+        handle.write(text)
+    return str(path)
+
+
+def test_output_stems_keep_directories_of_clashing_names(tmp_path):
+    sources = [str(tmp_path / "a" / "ch1.txt"), str(tmp_path / "b" / "ch1.txt"), str(tmp_path / "a" / "ch2.txt")]
+    stems = output_stems(sources)
+    assert stems[sources[0]] == os.path.join("a", "ch1")
+    assert stems[sources[1]] == os.path.join("b", "ch1")
+    assert stems[sources[2]] == "ch2"
+
+
+def test_output_stems_keep_extensions_apart(tmp_path):
+    sources = [str(tmp_path / "ch1.txt"), str(tmp_path / "ch1.md")]
+    assert sorted(output_stems(sources).values()) == ["ch1-md", "ch1-txt"]
+
+
+def test_same_named_inputs_do_not_overwrite_each_other(tmp_path):
+    first = _write(tmp_path / "in" / "a" / "ch1.txt", "The first book.")
+    second = _write(tmp_path / "in" / "b" / "ch1.txt", "The second book.")
+    output_dir = str(tmp_path / "out")
+
+    stats = BatchConverter(output_dir, llm=EchoLLM(), tts=SilentTTS()).run([first, second], log=lambda line: None)
+    assert stats["converted"] == 2
+    for name, source in (("a", first), ("b", second)):
+        with open(os.path.join(output_dir, name, "ch1.json"), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        assert manifest["source"] == os.path.abspath(source)
+        assert os.path.isfile(os.path.join(output_dir, name, manifest["audio_file"]))
+
+    stats = BatchConverter(output_dir, llm=EchoLLM(), tts=SilentTTS()).run([first, second], log=lambda line: None)
+    assert (stats["converted"], stats["skipped"]) == (0, 2)
+
+
+def test_chapter_outputs_stay_out_of_nested_stems(tmp_path):
+    # a.txt packages its chapters while a/ch1.txt writes its outputs below out/a/
+    nested = _write(tmp_path / "in" / "a" / "ch1.txt", "Chapter 1\nThe nested book.")
+    other = _write(tmp_path / "in" / "b" / "ch1.txt", "Chapter 1\nThe other book.")
+    outer = _write(tmp_path / "in" / "a.txt", "Chapter 1\nThe outer book.\n\nChapter 2\nMore of it.")
+    output_dir = str(tmp_path / "out")
+    stems = output_stems([nested, other, outer])
+    assert stems[outer] == "a" and stems[nested] == os.path.join("a", "ch1")
+
+    converter = BatchConverter(output_dir, llm=EchoLLM(), tts=SilentTTS(), audio_format="wav", chapters=True)
+    for source in (nested, other, outer):
+        converter.convert_file(source, stems[source])
+    assert os.path.isfile(os.path.join(output_dir, "a", "ch1.json"))
+    assert os.path.isfile(os.path.join(output_dir, "a", "ch1.zip"))
+    assert len(os.listdir(os.path.join(output_dir, "a.chapters"))) == 3  # two chapters and the manifest
+
+    # A changed chapter replaces only its own file
+    _write(outer, "Chapter 1\nThe outer book.\n\nChapter 2\nMore of it, revised.")
+    manifest, skipped = converter.convert_file(outer, stems[outer])
+    assert not skipped and manifest["chapters_reused"] == 1
+    assert len(os.listdir(os.path.join(output_dir, "a.chapters"))) == 3
+    assert os.path.isfile(os.path.join(output_dir, "a", "ch1.zip"))
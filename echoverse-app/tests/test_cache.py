@@ -0,0 +1,64 @@
+"""Synthesis cache: keys, LRU eviction and concurrent access"""
+import threading
+
+from echoverse.cache import SynthesisCache, cache_key
+
+VOICE = {"gender": "female", "rate": 180}
+
+
+def test_key_ignores_formatting_but_not_voice_or_format():
+    key = cache_key("Hello  there.\n", VOICE, "pyttsx3", "wav")
+    assert key == cache_key("Hello there.", VOICE, "pyttsx3", "wav")
+    assert key != cache_key("Hello there.", dict(VOICE, rate=170), "pyttsx3", "wav")
+    assert key != cache_key("Hello there.", VOICE, "pyttsx3", "mp3")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr("echoverse.cache.time.time", lambda: next(clock))
+    cache = SynthesisCache(str(tmp_path), max_bytes=250)
+    cache.put("aa01", b"1" * 100)
+    cache.put("bb02", b"2" * 100)
+    assert cache.get("aa01") == b"1" * 100  # now the most recently used
+
+    cache.put("cc03", b"3" * 100)
+    assert cache.get_many(["aa01", "bb02", "cc03"]) == [b"1" * 100, None, b"3" * 100]
+    assert not (tmp_path / "bb" / "bb02").exists()
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 200, 1)
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+
+
+def test_entry_larger_than_the_cache_is_not_kept(tmp_path):
+    cache = SynthesisCache(str(tmp_path), max_bytes=50)
+    cache.put("aa01", b"x" * 100)
+    assert cache.get("aa01") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_concurrent_puts_and_gets(tmp_path):
+    cache = SynthesisCache(str(tmp_path), max_bytes=10 ** 6)
+    keys = [f"{index:02x}key" for index in range(16)]
+    errors = []
+
+    def work(offset):
+        try:
+            for round_ in range(5):
+                # Threads write the same keys at once; readers see a whole entry or none
+                items = [(key, key.encode() * 50) for key in keys[offset % 4::2]]
+                cache.put_many(items)
+                for key, data in zip(keys, cache.get_many(keys)):
+                    assert data is None or data == key.encode() * 50
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.get_many(keys) == [key.encode() * 50 for key in keys]
+    assert cache.stats()["entries"] == len(keys)
+    assert list(tmp_path.rglob("*.tmp")) == []
@@ -0,0 +1,46 @@
+"""Chapter heading detection"""
+import pytest
+
+from echoverse.chapters import detect_chapters, heading_title
+
+
+@pytest.mark.parametrize("line, title", [
+    ("Chapter 1", "Chapter 1"),
+    ("CHAPTER IV.", "CHAPTER IV"),
+    ("Chapter 3: The Storm", "Chapter 3: The Storm"),
+    ("Chapter 1 The Beginning", "Chapter 1 The Beginning"),
+    ("Part two - the return", "Part two - the return"),
+    ("Act I, Scene 2", "Act I, Scene 2"),
+    ("Prologue", "Prologue"),
+    ("## Two ##", "Two"),
+])
+def test_heading_lines(line, title):
+    assert heading_title(line) == title
+
+
+@pytest.mark.parametrize("line", [
+    "Part one of the plan was simple.",
+    "Part two, however, went wrong.",
+    "Book two was better than the first.",
+    "Book one: the plan was simple.",
+    "Act 3 opens with a storm.",
+    "Act I. The curtain rises.",
+    "Chapter and verse",
+])
+def test_prose_is_not_a_heading(line):
+    assert heading_title(line) is None
+
+
+def test_heading_followed_by_text_on_the_next_line():
+    text = "Chapter 1\nIt was a dark night.\n\nThe rain fell.\n\n# One\nText"
+    chapters = detect_chapters(text)
+    assert [(chapter.title, chapter.text) for chapter in chapters] == [
+        ("Chapter 1", "It was a dark night.\n\nThe rain fell."),
+        ("One", "Text"),
+    ]
+
+
+def test_prose_opening_with_part_stays_in_its_chapter():
+    chapters = detect_chapters("Chapter 1\n\nPart one of the plan was simple.\nPart two was not.")
+    assert len(chapters) == 1
+    assert chapters[0].text == "Part one of the plan was simple.\nPart two was not."
@@ -0,0 +1,25 @@
+"""Sentence segmentation around abbreviations, initials and decimals"""
+from echoverse.chunking import split_sentence_parts, split_sentences
+
+
+def test_abbreviations_and_initials_do_not_end_sentences():
+    assert split_sentences("Mr. Smith met Dr. Jones. They talked.") == ["Mr. Smith met Dr. Jones.", "They talked."]
+    assert split_sentences("J. R. Tolkien wrote it, e.g. this one. Fine.") == [
+        "J. R. Tolkien wrote it, e.g. this one.", "Fine."]
+    assert split_sentences("The U.S. is large. Really?") == ["The U.S. is large.", "Really?"]
+
+
+def test_decimals_and_plain_periods():
+    assert split_sentences("Prices rose 3.5 percent. In 2020. Then fell.") == [
+        "Prices rose 3.5 percent.", "In 2020.", "Then fell."]
+    assert split_sentences("It began. It was last. He ran.") == ["It began.", "It was last.", "He ran."]
+
+
+def test_abbreviation_followed_by_another_terminator():
+    assert split_sentence_parts("Bring tea, milk etc.. Then go.") == (
+        ["Bring tea, milk etc.", "Then go"], [".", "."])
+
+
+def test_quotes_and_mixed_terminators():
+    assert split_sentence_parts('"Run!" she said. "Now." Okay?! Yes') == (
+        ['"Run', 'she said', '"Now', 'Okay', 'Yes'], ['!"', '.', '."', '?!', ''])
@@ -0,0 +1,78 @@
+"""Output encoding: parallel chunk encodes and format round trips"""
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+import pytest
+
+from echoverse import encoding
+from echoverse.audio import MIME_TYPES, merge_wav, parse_wav, wav_duration, wav_header
+from echoverse.encoding import AudioEncoder, EncodingError, encoder_available
+
+FRAMERATE = 22050
+
+
+def tone_wav(seconds):
+    frames = int(seconds * FRAMERATE)
+    pcm = bytes((index * 7) % 256 for index in range(frames * 2))
+    return wav_header(1, 2, FRAMERATE, len(pcm)) + pcm
+
+
+def test_chunks_encode_concurrently(monkeypatch):
+    # Encoding is an ffmpeg child process per chunk; a child that just waits stands in for it
+    intervals = []
+
+    def encode_segment(data, source_format, audio_format, bitrate):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import time; time.sleep(0.5)"], check=True)
+        intervals.append((start, time.perf_counter()))
+        return data
+
+    monkeypatch.setattr(encoding, "encoder_available", lambda: True)
+    monkeypatch.setattr(encoding, "encode_segment", encode_segment)
+    encoder = AudioEncoder(workers=4)
+    try:
+        events = []
+        assert encoder.encode([b"a", b"b", b"c", b"d"], "wav", "mp3", progress=events.append) == b"abcd"
+    finally:
+        encoder.close()
+
+    # Every encode was still running when the last one started: the threads overlap
+    assert len(intervals) == 4
+    assert max(start for start, _ in intervals) < min(end for _, end in intervals)
+    assert [event.completed for event in events] == [1, 2, 3, 4]
+
+
+def test_same_format_is_joined_without_encoding():
+    chunks = [tone_wav(0.5), tone_wav(1.0)]
+    joined = AudioEncoder(workers=1).encode(chunks, "wav", "wav")
+    assert joined == merge_wav(chunks)
+    assert wav_duration(joined) == pytest.approx(1.5)
+    assert parse_wav(joined)[0] == (1, 2, FRAMERATE)
+
+
+def test_unsupported_format_is_rejected():
+    with pytest.raises(EncodingError):
+        AudioEncoder(workers=1).encode([tone_wav(0.1)], "wav", "flac")
+
+
+def test_mime_types():
+    assert {fmt: MIME_TYPES[fmt] for fmt in encoding.OUTPUT_FORMATS} == {
+        "wav": "audio/wav", "mp3": "audio/mpeg", "ogg": "audio/ogg"}
+
+
+@pytest.mark.skipif(not encoder_available(), reason="needs pydub and ffmpeg")
+@pytest.mark.parametrize("audio_format", encoding.OUTPUT_FORMATS)
+def test_round_trip(audio_format):
+    from pydub import AudioSegment
+
+    encoder = AudioEncoder(workers=2)
+    try:
+        data = encoder.encode([tone_wav(1.0), tone_wav(0.5)], "wav", audio_format, bitrate="64k")
+    finally:
+        encoder.close()
+    decoded = AudioSegment.from_file(BytesIO(data), format=audio_format)
+    # Lossy codecs pad each chunk by a few frames
+    assert decoded.duration_seconds == pytest.approx(1.5, abs=0.15)
+    assert decoded.channels == 1
@@ -0,0 +1,113 @@
+"""pyttsx3 engine pool: exclusive checkout, profile reuse and recycling"""
+import threading
+import time
+
+import pytest
+
+from echoverse.engine_pool import Pyttsx3EnginePool
+
+LISA = {"gender": "female", "rate": 180}
+MICHAEL = {"gender": "male", "rate": 170}
+
+
+class FakeVoice:
+    def __init__(self, voice_id, name):
+        self.id = voice_id
+        self.name = name
+
+
+class FakeDriver:
+    """Stand-in pyttsx3 driver that notices being used by two threads at once"""
+
+    def __init__(self):
+        self.properties = {"voices": [FakeVoice("m", "english male"), FakeVoice("f", "english female")]}
+        self.voice_scans = 0
+        self.users = 0
+        self.overlaps = 0
+        self.broken = False
+        self.stopped = False
+
+    def getProperty(self, name):
+        if self.broken:
+            raise RuntimeError("driver died")
+        if name == "voices":
+            self.voice_scans += 1
+        return self.properties.get(name)
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def render(self):
+        self.users += 1
+        if self.users > 1:
+            self.overlaps += 1
+        time.sleep(0.002)
+        self.users -= 1
+
+    def stop(self):
+        self.stopped = True
+
+
+def test_drivers_are_never_shared_between_threads():
+    drivers = []
+    pool = Pyttsx3EnginePool(max_engines=2, factory=lambda: drivers.append(FakeDriver()) or drivers[-1])
+
+    def work(voice):
+        for _ in range(20):
+            with pool.engine(voice, timeout=5) as driver:
+                assert driver.properties["rate"] == voice["rate"]
+                driver.render()
+
+    threads = [threading.Thread(target=work, args=(voice,)) for voice in (LISA, MICHAEL) * 3]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(drivers) == 2 and pool.stats["created"] == 2
+    assert sum(driver.overlaps for driver in drivers) == 0
+    assert pool.stats["checkouts"] == 120
+    # Each profile's system voice is looked up once for the whole pool
+    assert sum(driver.voice_scans for driver in drivers) == 2
+
+
+def test_prepared_profile_is_preferred():
+    pool = Pyttsx3EnginePool(max_engines=2, factory=FakeDriver)
+    lisa, michael = pool.checkout(LISA), pool.checkout(MICHAEL)
+    pool.checkin(lisa)
+    pool.checkin(michael)
+    assert pool.checkout(LISA) is lisa
+    assert lisa.driver.properties["voice"] == "f" and michael.driver.properties["voice"] == "m"
+
+
+def test_drivers_are_recycled_after_max_jobs_or_failure():
+    pool = Pyttsx3EnginePool(max_engines=1, max_jobs=3, factory=FakeDriver)
+    first = pool.checkout(LISA)
+    for _ in range(2):
+        pool.checkin(first)
+        assert pool.checkout(LISA) is first
+    pool.checkin(first)
+    assert first.driver.stopped and pool.stats["recycled"] == 1
+
+    # A render that raises returns its driver as unhealthy
+    with pytest.raises(ValueError):
+        with pool.engine(LISA) as driver:
+            failed = driver
+            raise ValueError("render failed")
+    assert failed is not first.driver
+    assert failed.stopped and pool.stats["recycled"] == 2
+
+    third = pool.checkout(LISA)
+    third.driver.broken = True
+    pool.checkin(third)
+    assert pool.stats["recycled"] == 3 and pool.checkout(LISA) is not third
+
+
+def test_checkout_waits_for_a_free_driver():
+    pool = Pyttsx3EnginePool(max_engines=1, factory=FakeDriver)
+    held = pool.checkout(LISA)
+    with pytest.raises(TimeoutError):
+        pool.checkout(LISA, timeout=0.01)
+
+    threading.Timer(0.05, pool.checkin, args=(held,)).start()
+    assert pool.checkout(LISA, timeout=5) is held
@@ -0,0 +1,27 @@
+"""Startup: heavy dependencies stay out of the import of the entry points"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# Loaded on first use only (see benchmarks/bench_import.py for the timings)
+DEFERRED = ("multiprocessing", "http.server", "numpy", "pydub", "gtts", "pyttsx3", "requests")
+
+
+def imported_modules(module):
+    """Names of every module a cold import of module loads, from python -X importtime"""
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                             capture_output=True, text=True, cwd=ROOT, check=True)
+    return {fields[2].strip() for fields in (line.split("|") for line in process.stderr.splitlines())
+            if len(fields) == 3}
+
+
+@pytest.mark.parametrize("module", ["echoverse.cli", "echoverse.tts", "echoverse.llm", "echoverse.batch"])
+def test_heavy_modules_are_deferred(module):
+    modules = imported_modules(module)
+    assert module in modules
+    eager = sorted(name for name in modules if name.split(".")[0] in DEFERRED or name in DEFERRED)
+    assert eager == []
@@ -0,0 +1,17 @@
+"""Manuscript ingestion"""
+import io
+
+from echoverse.ingest import SectionStart, iter_text_paragraphs, read_document
+
+
+def test_multi_line_paragraph_keeps_its_line_breaks():
+    stream = io.BytesIO(b"LISA:  Hello   there.\r\nMICHAEL:\tHi.\n\n\nNext  paragraph\n")
+    assert list(iter_text_paragraphs(stream)) == ["LISA: Hello there.\nMICHAEL: Hi.", "Next paragraph"]
+
+
+def test_section_breaks_survive_reading():
+    stream = io.BytesIO(b"One\ntwo\n\n\n\n\nThree\n")
+    paragraphs = list(iter_text_paragraphs(stream))
+    assert isinstance(paragraphs[1], SectionStart)
+    stream.seek(0)
+    assert read_document("book.txt", stream) == "One\ntwo\n\n\n\nThree"
@@ -0,0 +1,87 @@
+"""LLM dispatch: retries and ordered concurrent requests"""
+import threading
+import time
+
+import pytest
+
+from echoverse import llm_backends
+from echoverse.llm import WatsonxLLM
+from echoverse.llm_backends import LLMBackend, LLMError, TransientLLMError, call_with_retry
+from echoverse.rewrite_cache import RewriteCache
+
+
+class UpperBackend(LLMBackend):
+    """Upper-cases each chunk, finishing later chunks first, and records the requests it saw"""
+
+    def __init__(self, namespace="upper", delay=0.0):
+        self.cache_namespace = namespace
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, request):
+        with self._lock:
+            self.requests.append(request.text)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            position = len(self.requests)
+        time.sleep(self.delay / position)
+        with self._lock:
+            self.in_flight -= 1
+        return request.text.upper()
+
+
+def paragraphs(count):
+    return [f"Paragraph {index} of the lighthouse story." for index in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_backends.random, "uniform", lambda low, high: 0.0)
+
+
+def test_transient_errors_are_retried():
+    attempts = []
+
+    def flaky(request):
+        attempts.append(request)
+        if len(attempts) < 3:
+            raise TransientLLMError("503")
+        return "done"
+
+    assert call_with_retry(flaky, "request", max_retries=4) == "done"
+    assert len(attempts) == 3
+
+
+def test_retries_give_up_and_permanent_errors_are_not_retried():
+    attempts = []
+
+    def down(request):
+        attempts.append(request)
+        raise TransientLLMError("503")
+
+    with pytest.raises(TransientLLMError):
+        call_with_retry(down, "request", max_retries=2)
+    assert len(attempts) == 3
+
+    def rejected(request):
+        attempts.append(request)
+        raise LLMError("400")
+
+    attempts.clear()
+    with pytest.raises(LLMError):
+        call_with_retry(rejected, "request", max_retries=2)
+    assert len(attempts) == 1
+
+
+def test_concurrent_dispatch_keeps_chunk_order():
+    backend = UpperBackend(delay=0.05)
+    llm = WatsonxLLM(backend, concurrency=4, max_chars=60, cache=RewriteCache())
+    text = "\n\n".join(paragraphs(8))
+    llm.tone_prompts = {"Loud": "Shout:"}
+
+    assert llm.rewrite_text(text, "Loud") == text.upper()
+    assert len(backend.requests) == 8
+    assert 1 < backend.peak <= 4
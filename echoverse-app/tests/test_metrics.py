@@ -0,0 +1,84 @@
+"""Prometheus text rendering and the /metrics endpoint"""
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from echoverse.metrics import CONTENT_TYPE, Metrics, _serve_metrics
+
+
+def samples(text):
+    """Sample lines of an exposition, keyed by metric name with labels"""
+    rendered = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            rendered[name] = float(value)
+    return rendered
+
+
+def test_counters_are_totals_declared_once():
+    metrics = Metrics()
+    metrics.increment("cache_hits", tier="memory")
+    metrics.increment("cache_hits", 2, tier="memory")
+    metrics.increment("cache_hits", tier="disk")
+    text = metrics.render_prometheus()
+    assert text.count("# TYPE echoverse_cache_hits_total counter") == 1
+    assert samples(text) == {
+        'echoverse_cache_hits_total{tier="disk"}': 1,
+        'echoverse_cache_hits_total{tier="memory"}': 3,
+    }
+    assert text.endswith("\n")
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.increment("errors", error='say "hi"\\now\nthen')
+    line = metrics.render_prometheus().splitlines()[-1]
+    assert line == 'echoverse_errors_total{error="say \\"hi\\"\\\\now\\nthen"} 1'
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        metrics.observe("synthesis", seconds, engine="gtts")
+    text = metrics.render_prometheus()
+    assert "# TYPE echoverse_stage_duration_seconds histogram" in text
+    rendered = samples(text)
+    labels = 'stage="synthesis",engine="gtts"'
+    # An observation on a bound falls in that bucket
+    assert rendered[f'echoverse_stage_duration_seconds_bucket{{{labels},le="0.1"}}'] == 2
+    assert rendered[f'echoverse_stage_duration_seconds_bucket{{{labels},le="1.0"}}'] == 3
+    assert rendered[f'echoverse_stage_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 4
+    assert rendered[f'echoverse_stage_duration_seconds_count{{{labels}}}'] == 4
+    assert rendered[f'echoverse_stage_duration_seconds_sum{{{labels}}}'] == pytest.approx(3.65)
+
+
+def test_span_failures_are_counted():
+    metrics = Metrics()
+    with pytest.raises(KeyError):
+        with metrics.span("rewrite"):
+            raise KeyError("missing")
+    rendered = samples(metrics.render_prometheus())
+    assert rendered['echoverse_stage_errors_total{error="KeyError",stage="rewrite"}'] == 1
+    assert rendered['echoverse_stage_duration_seconds_count{stage="rewrite"}'] == 1
+
+
+def test_empty_registry_renders_no_histogram():
+    assert Metrics().render_prometheus() == "\n"
+
+
+def test_server_exposes_metrics():
+    metrics = Metrics()
+    metrics.increment("jobs")
+    server = _serve_metrics(metrics, ("127.0.0.1", 0))
+    try:
+        with urlopen(server.url, timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert response.read().decode("utf-8") == metrics.render_prometheus()
+        with pytest.raises(HTTPError) as error:
+            urlopen(server.url.replace("/metrics", "/other"), timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,40 @@
+"""Chapter packaging: manifest entries and reuse"""
+from echoverse.audio import wav_header
+from echoverse.chapters import Chapter
+from echoverse.packager import ChapterPackager
+
+
+class EchoLLM:
+    def rewrite_text(self, text, tone):
+        return text
+
+
+class SilentTTS:
+    voices = {"Lisa": {}}
+
+    def synthesize(self, text, voice, audio_format=None, bitrate=None):
+        data = wav_header(1, 2, 8000, 1600) + bytes(1600)
+        return {"engine": "test", "format": "wav", "data": data, "size": len(data), "duration": 0.1}
+
+
+def test_identical_chapters_get_their_own_timestamps(tmp_path):
+    chapters = [Chapter(0, "Interlude", "Rain."), Chapter(1, "Interlude", "Rain.")]
+    packager = ChapterPackager(EchoLLM(), SilentTTS(), str(tmp_path), audio_format="wav")
+
+    for run in range(2):
+        entries, skipped = packager.synthesize(chapters)
+        assert skipped == (0 if run == 0 else 2)
+        assert [entry["index"] for entry in entries] == [0, 1]
+        assert entries[0]["start"] == 0.0
+        assert entries[1]["start"] == entries[0]["end"] > 0.0
+
+
+def test_only_replaced_chapter_files_are_deleted(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me")
+    packager = ChapterPackager(EchoLLM(), SilentTTS(), str(tmp_path), audio_format="wav")
+    first, _ = packager.synthesize([Chapter(0, "One", "Rain."), Chapter(1, "Two", "Snow.")])
+    second, _ = packager.synthesize([Chapter(0, "One", "Rain."), Chapter(1, "Two", "Hail.")])
+
+    assert first[0]["file"] == second[0]["file"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        ["manifest.json", "notes.txt", second[0]["file"], second[1]["file"]])
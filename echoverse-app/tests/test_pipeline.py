@@ -0,0 +1,79 @@
+"""Synthesis pipeline: ordered streaming, caching and cancellation with fake workers"""
+import threading
+
+import pytest
+
+from echoverse import pipeline
+from echoverse.cache import SynthesisCache
+from echoverse.pipeline import SynthesisPipeline
+
+VOICE = {"gender": "female", "rate": 180}
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Chunks rendered by the fake gTTS worker, in the order they were rendered"""
+    rendered = []
+
+    def render(text, voice_config):
+        rendered.append(text)
+        return text.encode()
+
+    monkeypatch.setattr(pipeline, "_synthesize_gtts_chunk", render)
+    return rendered
+
+
+def test_segments_come_out_in_order_when_chunks_finish_in_reverse(monkeypatch):
+    chunks = [f"chunk {index}" for index in range(6)]
+    finished = {chunk: threading.Event() for chunk in chunks}
+    order = []
+
+    def render(text, voice_config):
+        # Each chunk waits for the one after it, so the last finishes first
+        index = chunks.index(text)
+        if index + 1 < len(chunks):
+            assert finished[chunks[index + 1]].wait(5)
+        order.append(text)
+        finished[text].set()
+        return text.encode()
+
+    monkeypatch.setattr(pipeline, "_synthesize_gtts_chunk", render)
+    with SynthesisPipeline("gtts", workers=len(chunks)) as synthesis:
+        segments = list(synthesis.iter_segments(chunks, VOICE))
+    assert order == chunks[::-1]
+    assert segments == [chunk.encode() for chunk in chunks]
+
+
+def test_abandoned_stream_cancels_chunks_not_yet_started(monkeypatch):
+    chunks = [f"chunk {index}" for index in range(10)]
+    release = threading.Event()
+    busy = threading.Event()
+    started = []
+
+    def render(text, voice_config):
+        started.append(text)
+        if text != chunks[0]:
+            busy.set()
+            release.wait(5)
+        return text.encode()
+
+    monkeypatch.setattr(pipeline, "_synthesize_gtts_chunk", render)
+    with SynthesisPipeline("gtts", workers=1) as synthesis:
+        segments = synthesis.iter_segments(chunks, VOICE)
+        assert next(segments) == b"chunk 0"
+        assert busy.wait(5)
+        segments.close()
+        release.set()
+    # The one worker is busy with the second chunk when the stream is dropped; the rest never start
+    assert started == chunks[:2]
+
+
+def test_cached_chunks_skip_the_pool(tmp_path, calls, monkeypatch):
+    monkeypatch.setattr(pipeline, "LOOKUP_BATCH", 2)
+    cache = SynthesisCache(str(tmp_path))
+    chunks = [f"chunk {index}" for index in range(5)]
+    with SynthesisPipeline("gtts", workers=2, cache=cache) as synthesis:
+        assert list(synthesis.iter_segments(chunks[:3], VOICE)) == [chunk.encode() for chunk in chunks[:3]]
+        calls.clear()
+        assert list(synthesis.iter_segments(chunks, VOICE)) == [chunk.encode() for chunk in chunks]
+    assert sorted(calls) == chunks[3:]
@@ -0,0 +1,104 @@
+"""Sample-level post-processing: trimming, levelling, joining and resampling"""
+import numpy as np
+import pytest
+
+from echoverse.audio import parse_wav, wav_duration, wav_header
+from echoverse.postprocess import PostProcessor, Resampler, postprocess_wav, to_float, to_pcm
+
+RATE = 16000
+
+
+def tone(seconds, amplitude, rate=RATE, frequency=440.0):
+    t = np.arange(round(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)[:, None]
+
+
+def silence(seconds, rate=RATE):
+    return np.zeros((round(seconds * rate), 1), np.float32)
+
+
+def wav(*parts, rate=RATE):
+    pcm = to_pcm(np.concatenate(parts), 2)
+    return wav_header(1, 2, rate, len(pcm)) + pcm
+
+
+def rms_dbfs(samples):
+    return 20 * np.log10(np.sqrt(np.mean(np.square(samples))))
+
+
+def run(processor, chunks):
+    return b''.join([processor.process(chunk) for chunk in chunks] + [processor.flush()])
+
+
+def test_silence_is_trimmed_to_keep():
+    output = postprocess_wav([wav(silence(0.5), tone(1.0, 0.3), silence(0.5))], keep=0.03)
+    # 1 s of speech plus 30 ms kept at each edge, to the 10 ms frame
+    assert wav_duration(output) == pytest.approx(1.06, abs=0.011)
+
+
+def test_silent_chunk_is_dropped():
+    output = postprocess_wav([wav(tone(0.5, 0.3)), wav(silence(0.5)), wav(tone(0.5, 0.3))], pause=0.2)
+    assert wav_duration(output) == pytest.approx(1.2, abs=0.07)
+
+
+def test_speech_is_brought_to_target_level():
+    params, pcm = parse_wav(postprocess_wav([wav(tone(1.0, 0.05))], target_dbfs=-20.0))
+    assert rms_dbfs(to_float(pcm, 2, 1)) == pytest.approx(-20.0, abs=0.2)
+
+
+def test_gain_is_capped():
+    # -63 dBFS speech would need 43 dB to reach the target
+    params, pcm = parse_wav(postprocess_wav([wav(tone(1.0, 0.001))], target_dbfs=-20.0, max_gain_db=20.0,
+                                            silence_dbfs=-80.0))
+    assert rms_dbfs(to_float(pcm, 2, 1)) == pytest.approx(rms_dbfs(tone(1.0, 0.001)) + 20.0, abs=0.2)
+
+
+def test_peak_ceiling_limits_gain():
+    # A single click would be pushed past full scale by the level gain
+    speech = tone(1.0, 0.01)
+    speech[RATE // 2] = 0.5
+    params, pcm = parse_wav(postprocess_wav([wav(speech)], target_dbfs=-10.0, peak_dbfs=-6.0))
+    assert np.abs(to_float(pcm, 2, 1)).max() == pytest.approx(10 ** (-6.0 / 20), abs=1e-3)
+
+
+@pytest.mark.parametrize("pause", [0.0, 0.25])
+def test_joins_insert_the_pause(pause):
+    output = postprocess_wav([wav(tone(0.5, 0.3)), wav(tone(0.5, 0.3))], trim=False, pause=pause, crossfade=0.01)
+    # A crossfade overlaps the chunks by its length instead of inserting a pause
+    expected = 1.0 + pause if pause else 0.99
+    assert wav_duration(output) == pytest.approx(expected, abs=1 / RATE)
+
+
+def test_output_does_not_depend_on_chunk_size():
+    speech = tone(0.6, 0.3)
+    whole = Resampler(RATE, 11025, 1)
+    expected = np.concatenate([whole.process(speech), whole.flush()])
+    for size in (1, 37, 500, 4000):
+        resampler = Resampler(RATE, 11025, 1)
+        blocks = [resampler.process(speech[start:start + size]) for start in range(0, len(speech), size)]
+        np.testing.assert_allclose(np.concatenate(blocks + [resampler.flush()]), expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("target_rate", [8000, 11025, 22050, 24000])
+def test_resampled_length(target_rate):
+    resampler = Resampler(RATE, target_rate, 1)
+    speech = tone(1.0, 0.3)
+    output = np.concatenate([resampler.process(speech[:RATE // 3]), resampler.process(speech[RATE // 3:]),
+                             resampler.flush()])
+    assert len(output) == pytest.approx(target_rate, abs=1)
+
+
+def test_resampling_keeps_the_tone():
+    resampler = Resampler(RATE, 8000, 1)
+    output = np.concatenate([resampler.process(tone(1.0, 0.3)), resampler.flush()])[:, 0]
+    spectrum = np.abs(np.fft.rfft(output))
+    assert np.argmax(spectrum) * 8000 / len(output) == pytest.approx(440.0, abs=2.0)
+    # Filter delay is removed, so the tone starts at the first frame
+    assert abs(output[1]) > 0.01
+
+
+def test_processor_resamples_to_target_rate():
+    processor = PostProcessor((1, 2, RATE), target_rate=22050, trim=False)
+    output = run(processor, [to_pcm(tone(0.5, 0.3), 2), to_pcm(tone(0.5, 0.3), 2)])
+    assert processor.output_params == (1, 2, 22050)
+    assert len(output) // 2 == pytest.approx((1.0 + processor.pause) * 22050, abs=2)
@@ -0,0 +1,57 @@
+"""Progress events from rewriting and synthesis"""
+from echoverse import pipeline
+from echoverse.cache import SynthesisCache
+from echoverse.llm import WatsonxLLM
+from echoverse.llm_backends import SimulatedBackend
+from echoverse.pipeline import SynthesisPipeline
+from echoverse.progress import ProgressEvent, report_progress
+from echoverse.rewrite_cache import RewriteCache
+
+VOICE = {"gender": "female", "rate": 180}
+
+
+def fake_gtts(monkeypatch):
+    monkeypatch.setattr(pipeline, "_synthesize_gtts_chunk", lambda text, voice_config: text.encode())
+    monkeypatch.setattr(pipeline, "_synthesize_gtts_batch",
+                        lambda texts, voice_config: [text.encode() for text in texts])
+
+
+def steps(events):
+    return [(event.stage, event.completed, event.total) for event in events]
+
+
+def test_report_progress():
+    events = []
+    report_progress(events.append, "encode", 1, 4)
+    report_progress(None, "encode", 2, 4)
+    assert events == [ProgressEvent("encode", 1, 4)]
+    assert events[0].fraction == 0.25 and ProgressEvent("encode", 0, 0).fraction == 1.0
+
+
+def test_chunk_synthesis_reports_each_chunk(monkeypatch):
+    fake_gtts(monkeypatch)
+    events = []
+    with SynthesisPipeline("gtts", workers=3) as synthesis:
+        synthesis.synthesize_chunks([f"chunk {index}" for index in range(4)], VOICE, progress=events.append)
+    assert steps(events) == [("synthesize", completed, 4) for completed in range(1, 5)]
+
+
+def test_cached_pieces_are_reported_up_front(tmp_path, monkeypatch):
+    fake_gtts(monkeypatch)
+    cache = SynthesisCache(str(tmp_path))
+    pieces = [(VOICE, f"piece {index}") for index in range(4)]
+    with SynthesisPipeline("gtts", workers=2, max_chars=5, cache=cache) as synthesis:
+        synthesis.synthesize_voices(pieces[:2], inline=True)
+        events = []
+        synthesis.synthesize_voices(pieces, progress=events.append, inline=True)
+    assert steps(events) == [("synthesize", 2, 4), ("synthesize", 3, 4), ("synthesize", 4, 4)]
+
+
+def test_rewrite_reports_cached_chunks_then_each_request():
+    llm = WatsonxLLM(SimulatedBackend(), concurrency=2, max_chars=60, cache=RewriteCache())
+    paragraphs = [f"Paragraph number {index} of the story goes here." for index in range(5)]
+    llm.rewrite_text("\n\n".join(paragraphs[:2]), "Neutral")
+
+    events = []
+    llm.rewrite_text("\n\n".join(paragraphs), "Neutral", progress=events.append)
+    assert steps(events) == [("rewrite", completed, 5) for completed in range(2, 6)]
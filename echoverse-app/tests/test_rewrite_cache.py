@@ -0,0 +1,81 @@
+"""Rewrite cache: namespaces, incremental re-rewrites and the disk tier"""
+import threading
+from contextlib import closing
+
+from echoverse.llm import WatsonxLLM
+from echoverse.llm_backends import LLMBackend
+from echoverse.rewrite_cache import RewriteCache
+
+
+class UpperBackend(LLMBackend):
+    """Upper-cases each chunk and records the requests it saw"""
+
+    def __init__(self, namespace="upper"):
+        self.cache_namespace = namespace
+        self.requests = []
+
+    def generate(self, request):
+        self.requests.append(request.text)
+        return request.text.upper()
+
+
+def paragraphs(count):
+    return [f"Paragraph {index} of the lighthouse story." for index in range(count)]
+
+
+def test_only_edited_paragraphs_are_rewritten_again():
+    backend = UpperBackend()
+    llm = WatsonxLLM(backend, concurrency=2, max_chars=60, cache=RewriteCache())
+    llm.tone_prompts = {"Loud": "Shout:"}
+    original = paragraphs(6)
+    llm.rewrite_text("\n\n".join(original), "Loud")
+
+    edited = list(original)
+    edited[2] = "An entirely new second paragraph."
+    backend.requests.clear()
+    assert llm.rewrite_text("\n\n".join(edited), "Loud") == "\n\n".join(edited).upper()
+    assert backend.requests == [edited[2]]
+    assert llm.cached_rewrite("\n\n".join(edited), "Loud") == "\n\n".join(edited).upper()
+
+
+def test_cache_is_shared_within_a_namespace_only(tmp_path):
+    cache = RewriteCache(path=str(tmp_path / "rewrites.sqlite"))
+    text = "\n\n".join(paragraphs(3))
+    first = WatsonxLLM(UpperBackend("model-a"), max_chars=60, cache=cache)
+    first.tone_prompts = {"Loud": "Shout:"}
+    first.rewrite_text(text, "Loud")
+
+    # Same model behind another client, even in a new process: served from the disk tier
+    same = WatsonxLLM(UpperBackend("model-a"), max_chars=60, cache=RewriteCache(path=cache.path))
+    same.tone_prompts = {"Loud": "Shout:"}
+    assert same.rewrite_text(text, "Loud") == text.upper()
+    assert same.backend.requests == [] and same.cache.stats["disk_hits"] == 3
+
+    other = WatsonxLLM(UpperBackend("model-b"), max_chars=60, cache=cache)
+    other.tone_prompts = {"Loud": "Shout:"}
+    other.rewrite_text(text, "Loud")
+    assert len(other.backend.requests) == 3
+
+    # A changed prompt is a different namespace too
+    first.tone_prompts = {"Loud": "Shout louder:"}
+    first.backend.requests.clear()
+    first.rewrite_text(text, "Loud")
+    assert len(first.backend.requests) == 3
+
+
+def test_disk_tier_is_trimmed_under_concurrent_puts(tmp_path):
+    cache = RewriteCache(max_entries=10, path=str(tmp_path / "rewrites.sqlite"), max_disk_entries=50)
+
+    def work(offset):
+        for index in range(250):
+            cache.put(f"{offset}-{index}", "value")
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache._puts == 1000
+    with closing(cache._connect()) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM rewrites").fetchone()[0] <= 50 + 3
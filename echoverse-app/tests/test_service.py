@@ -0,0 +1,151 @@
+"""Job service: backpressure, cancellation and HTTP status codes"""
+import asyncio
+import json
+import threading
+
+from echoverse import jobs
+from echoverse.progress import report_progress
+from echoverse.service import JobService
+
+
+class GatedTTS:
+    """Synthesizes once released, reporting progress meanwhile so cancellation can land"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def synthesize(self, text, voice, audio_format=None, progress=None, bitrate=None):
+        self.started.set()
+        while not self.release.wait(0.01):
+            report_progress(progress, "synthesize", 0, 1)
+        return {"engine": "test", "format": "wav", "data": b"RIFF", "size": 4, "duration": 0.0}
+
+    def close(self):
+        pass
+
+
+async def request(port, method, path, payload=None):
+    """(status, decoded JSON body) of one HTTP request to the service"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content) if content else None
+
+
+async def wait_for(event):
+    assert await asyncio.get_running_loop().run_in_executor(None, event.wait, 5)
+
+
+async def wait_for_status(port, job_id, status):
+    for _ in range(500):
+        _, job = await request(port, "GET", f"/jobs/{job_id}")
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never became {status}")
+
+
+def run_service(tmp_path, scenario, max_queued=1):
+    """Run scenario(service, port, tts) against a one-worker service on a free port"""
+    tts = GatedTTS()
+    service = JobService(str(tmp_path), workers=1, max_queued=max_queued, tts=tts)
+
+    async def main():
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            await scenario(service, port, tts)
+        finally:
+            tts.release.set()
+            await service.stop()
+
+    asyncio.run(main())
+
+
+def test_full_queue_is_rejected_with_429(tmp_path):
+    async def scenario(service, port, tts):
+        status, running = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "one"})
+        assert status == 202
+        await wait_for(tts.started)
+        status, queued = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "two"})
+        assert status == 202
+        status, body = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "three"})
+        assert status == 429 and "limit 1" in body["error"]
+
+        tts.release.set()
+        await wait_for_status(port, running["id"], jobs.DONE)
+        await wait_for_status(port, queued["id"], jobs.DONE)
+        status, health = await request(port, "GET", "/health")
+        assert status == 200 and health["queued"] == 0 and health["running"] == 0
+
+    run_service(tmp_path, scenario)
+
+
+def test_cancel_queued_job(tmp_path):
+    async def scenario(service, port, tts):
+        _, running = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "one"})
+        await wait_for(tts.started)
+        _, queued = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "two"})
+
+        status, body = await request(port, "DELETE", f"/jobs/{queued['id']}")
+        assert status == 200 and body["status"] == jobs.CANCELLED
+        # Only running jobs are tracked for cancellation
+        assert queued["id"] not in service._cancelled
+        status, _ = await request(port, "DELETE", f"/jobs/{queued['id']}")
+        assert status == 409
+
+        tts.release.set()
+        await wait_for_status(port, running["id"], jobs.DONE)
+        _, job = await request(port, "GET", f"/jobs/{queued['id']}")
+        assert job["status"] == jobs.CANCELLED and job["started_at"] is None
+        status, _ = await request(port, "GET", f"/jobs/{queued['id']}/result")
+        assert status == 409
+
+    run_service(tmp_path, scenario)
+
+
+def test_cancel_running_job(tmp_path):
+    async def scenario(service, port, tts):
+        _, running = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "one"})
+        await wait_for(tts.started)
+
+        status, _ = await request(port, "DELETE", f"/jobs/{running['id']}")
+        assert status == 200
+        for _ in range(500):
+            if not service._running:
+                break
+            await asyncio.sleep(0.01)
+        assert service._running == set() and service._cancelled == set()
+        _, job = await request(port, "GET", f"/jobs/{running['id']}")
+        assert job["status"] == jobs.CANCELLED and "result" not in job
+
+        # The worker is free for the next job
+        tts.started.clear()
+        tts.release.set()
+        _, follow_up = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "two"})
+        await wait_for_status(port, follow_up["id"], jobs.DONE)
+
+    run_service(tmp_path, scenario)
+
+
+def test_error_statuses(tmp_path):
+    async def scenario(service, port, tts):
+        assert (await request(port, "GET", "/jobs/missing"))[0] == 404
+        assert (await request(port, "GET", "/nowhere"))[0] == 404
+        assert (await request(port, "POST", "/jobs", {"kind": "translate", "text": "one"}))[0] == 400
+        assert (await request(port, "POST", "/jobs", {"kind": "synthesize"}))[0] == 400
+
+        _, job = await request(port, "POST", "/jobs", {"kind": "synthesize", "text": "one"})
+        await wait_for(tts.started)
+        assert (await request(port, "GET", f"/jobs/{job['id']}/result"))[0] == 409
+        assert (await request(port, "PUT", f"/jobs/{job['id']}"))[0] == 405
+        tts.release.set()
+        await wait_for_status(port, job["id"], jobs.DONE)
+        assert (await request(port, "DELETE", f"/jobs/{job['id']}"))[0] == 409
+
+    run_service(tmp_path, scenario)
@@ -0,0 +1,45 @@
+"""Single-entry synthesis through the synthesis cache"""
+from contextlib import contextmanager
+
+import pytest
+
+from echoverse import tts
+from echoverse.audio import wav_header
+from echoverse.cache import SynthesisCache
+from echoverse.tts import RealTTSEngine
+
+# Half a second of 8 kHz 16-bit mono, far from the word-count estimate
+WAV = wav_header(1, 2, 8000, 8000) + bytes(8000)
+
+
+class FakePool:
+    @contextmanager
+    def engine(self, voice_config):
+        yield object()
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    renders = []
+
+    def render(driver, text):
+        renders.append(text)
+        return WAV
+
+    monkeypatch.setattr(tts, "render_pyttsx3", render)
+    monkeypatch.setattr(tts, "get_engine_pool", FakePool)
+    monkeypatch.delenv("ECHOVERSE_POSTPROCESS", raising=False)
+    engine = RealTTSEngine(cache=SynthesisCache(str(tmp_path)))
+    engine.available_engines = ["pyttsx3"]
+    engine.renders = renders
+    yield engine
+    engine.close()
+
+
+def test_cache_hit_reports_measured_duration(engine):
+    text = "one two three four five six seven eight nine ten"
+    miss = engine.synthesize(text)
+    hit = engine.synthesize(text)
+    assert engine.renders == [text]
+    assert hit["data"] == miss["data"] == WAV
+    assert hit["duration"] == miss["duration"] == pytest.approx(0.5)